@@ -43,6 +43,8 @@ create table Event
     Address varchar(255) not null,
     Capacity int not null,
     Embedding text,
+    EmbeddingHash char(64),
+    EmbeddingModel varchar(100),
     Image_path varchar(255),
     Latitude DECIMAL(9,6) NOT NULL,
     Longitude DECIMAL(9,6) NOT NULL
@@ -1,5 +1,16 @@
 # app.py
 import os
+
+# eventlet/gevent have to patch the standard library before anything else imports it,
+# so SOCKETIO_ASYNC_MODE is read from the real environment (not .env) here
+_async_mode = (os.getenv("SOCKETIO_ASYNC_MODE") or "threading").strip().lower()
+if _async_mode == "eventlet":
+    import eventlet
+    eventlet.monkey_patch()
+elif _async_mode == "gevent":
+    from gevent import monkey
+    monkey.patch_all()
+
 from flask import Flask, jsonify, redirect, url_for, request, current_app
 from flask_cors import CORS
 import jwt
@@ -19,6 +30,9 @@ from leaderboard.routes import bp as leaderboard_bp
 from chatbot.routes import bp as chatbot_bp
 from landing.routes import bp as landing_bp
 from chatbot.socket_chat import socketio
+from chatbot.connector import close_chatbot_connector
+from chatbot.embedding_index import get_event_index
+from data_access import DataAccess
 
 
 def create_app():
@@ -75,7 +89,11 @@ def create_app():
 
 
 if __name__ == "__main__":
+    import atexit
+
     app = create_app()
+    # close pooled LLM connections on shutdown
+    atexit.register(close_chatbot_connector)
 
     # IMPORTANT: init socketio on the app
     # Get allowed origins from environment or use defaults
@@ -83,7 +101,30 @@ if __name__ == "__main__":
     socketio.init_app(
         app,
         cors_allowed_origins=socketio_origins,
+        async_mode=_async_mode,
     )
 
+    # Databases created before the embedding hash/model columns need them added
+    try:
+        DataAccess().ensure_embedding_columns()
+    except Exception as e:
+        print(f"Could not check Event embedding columns: {e}")
+
+    # Load event embeddings into the in-memory semantic search index up front,
+    # so the first chatbot search doesn't pay for it. Falls back to lazy loading.
+    try:
+        dao = DataAccess()
+        get_event_index().ensure_loaded(dao.get_event_embedding_rows, metadata_loader=dao.get_event_index_metadata)
+        print(f"Loaded {len(get_event_index())} event embeddings into search index")
+    except Exception as e:
+        print(f"Could not preload embedding index: {e}")
+
     # IMPORTANT: run with socketio, not app.run
-    socketio.run(app, host="0.0.0.0", port=5001, debug=False, allow_unsafe_werkzeug=True)
+    # eventlet/gevent serve with their own WSGI server; only threading mode falls back to Werkzeug
+    socketio.run(
+        app,
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 5001)),
+        debug=False,
+        allow_unsafe_werkzeug=_async_mode == "threading",
+    )
@@ -1,6 +1,6 @@
-import bcrypt       
 import re
 from data_access import DataAccess
+from .password_hasher import get_password_hasher
 
 """ Middle layer between routes and data access """
 class Connector():
@@ -37,8 +37,8 @@ class Connector():
             print("CONNECTOR: Weak password")
             return False, "Password must be at least 8 characters and include an uppercase letter, a number, and a special character."
 
-        # Hash password and insert
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+        # Hash password (on the hashing worker pool) and insert
+        hashed_password = get_password_hasher().hash_password(password)
         da.create_user(email, hashed_password, FirstName, LastName)
 
         return True, "User created successfully"
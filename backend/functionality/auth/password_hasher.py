@@ -0,0 +1,207 @@
+"""
+Password Hasher
+Runs bcrypt hashing and verification on a bounded pool of worker processes,
+so a burst of logins or sign-ups (about 250 ms of CPU each) no longer ties
+up the request threads and the GIL-bound work of every other endpoint.
+
+- At most max_workers hashes run at once, one per process
+- At most max_pending more wait for a worker; beyond that, calls fail fast
+  with PasswordHasherBusyError (the routes answer 503) instead of queueing
+  logins behind each other
+- stats() reports in-flight and queued work, rejections and queue wait
+
+Configured with PASSWORD_HASH_WORKERS (default: CPU count; 0 hashes inline
+on the calling thread, as the unit tests do), PASSWORD_HASH_PENDING and
+PASSWORD_HASH_TIMEOUT.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Optional, Union
+
+import bcrypt
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when the hashing workers and their queue are full, or a hash timed out in the queue."""
+
+
+def _encode(value: Union[str, bytes]) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
+# Worker functions: module level so they can be pickled to the worker processes.
+# Each returns its own run time so the caller can tell queue wait from hashing.
+def _hash_password(password: bytes, rounds: int):
+    started = time.perf_counter()
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+    return hashed, time.perf_counter() - started
+
+
+def _check_password(password: bytes, hashed: bytes):
+    started = time.perf_counter()
+    matches = bcrypt.checkpw(password, hashed)
+    return matches, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """bcrypt on a bounded process pool with admission control"""
+
+    def __init__(self, max_workers=None, max_pending=None, rounds=12, timeout=30.0, inline=False):
+        """
+        Args:
+            max_workers (int, optional): Worker processes (defaults to the CPU count)
+            max_pending (int, optional): Calls allowed to wait for a worker (defaults to 4 per worker)
+            rounds (int): bcrypt cost factor for new hashes
+            timeout (float): Seconds a call waits for its result before giving up
+            inline (bool): Hash on the calling thread instead of in worker processes
+        """
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+        self.max_pending = max(0, int(self.max_workers * 4 if max_pending is None else max_pending))
+        self.rounds = int(rounds)
+        self.timeout = float(timeout)
+        self.inline = bool(inline)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._queue_wait_total = 0.0
+        self._hash_time_total = 0.0
+
+    def hash_password(self, password: Union[str, bytes]) -> bytes:
+        """
+        Hash a password with a new salt.
+
+        Returns:
+            bytes: bcrypt hash
+
+        Raises:
+            PasswordHasherBusyError: Too many hashes in flight, or the result took longer than timeout
+        """
+        return self._run(_hash_password, _encode(password), self.rounds)
+
+    def check_password(self, password: Union[str, bytes], hashed: Union[str, bytes]) -> bool:
+        """
+        Check a password against a stored bcrypt hash.
+
+        Raises:
+            PasswordHasherBusyError: Too many hashes in flight, or the result took longer than timeout
+        """
+        return self._run(_check_password, _encode(password), _encode(hashed))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process can copy locks held by other threads
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn"))
+            return self._executor
+
+    def _release(self, started, worker_seconds=None):
+        with self._lock:
+            self._in_flight -= 1
+            if worker_seconds is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self._hash_time_total += worker_seconds
+                self._queue_wait_total += max(0.0, time.perf_counter() - started - worker_seconds)
+
+    def _run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusyError("Password hashing is at capacity")
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        started = time.perf_counter()
+
+        if self.inline:
+            try:
+                result, worker_seconds = fn(*args)
+            except Exception:
+                self._release(started)
+                raise
+            self._release(started, worker_seconds)
+            return result
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            self._release(started)
+            self._reset_executor()
+            raise
+
+        def finished(done):
+            error = done.exception() if not done.cancelled() else True
+            self._release(started, None if error else done.result()[1])
+            if isinstance(error, BrokenProcessPool):
+                self._reset_executor()
+
+        # the slot is freed when the work finishes, even if the caller gave up waiting
+        future.add_done_callback(finished)
+        try:
+            return future.result(timeout=self.timeout)[0]
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise PasswordHasherBusyError("Password hashing timed out") from None
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            print("PASSWORD HASHER: worker pool broke, starting a new one")
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            done = self.completed
+            return {
+                "mode": "inline" if self.inline else "processes",
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.max_workers),
+                "peak_in_flight": self.peak_in_flight,
+                "completed": done,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "avg_queue_wait_ms": round(self._queue_wait_total / done * 1000, 2) if done else 0.0,
+                "avg_hash_ms": round(self._hash_time_total / done * 1000, 2) if done else 0.0,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_password_hasher: Optional[PasswordHasher] = None
+_password_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Process-wide password hasher configured from PASSWORD_HASH_* settings."""
+    global _password_hasher
+    if _password_hasher is None:
+        with _password_hasher_lock:
+            if _password_hasher is None:
+                workers = os.getenv("PASSWORD_HASH_WORKERS")
+                pending = os.getenv("PASSWORD_HASH_PENDING")
+                _password_hasher = PasswordHasher(
+                    max_workers=int(workers) if workers else None,
+                    max_pending=int(pending) if pending else None,
+                    timeout=float(os.getenv("PASSWORD_HASH_TIMEOUT", 30)),
+                    inline=workers is not None and workers.strip() == "0",
+                )
+    return _password_hasher
@@ -1,15 +1,18 @@
 import datetime
+import os
 from datetime import UTC
 from functools import wraps
 
 import jwt
 from flask import Blueprint, render_template, request, flash, jsonify, current_app, redirect, url_for, g
 from .connector import Connector
+from .password_hasher import PasswordHasherBusyError, get_password_hasher
 
 bp = Blueprint("auth", __name__, url_prefix="")
 
 TOKEN_COOKIE_NAME = "access_token"
 COOKIE_MAX_AGE = 3600  # 1 hour
+BUSY_RETRY_AFTER = "2"  # seconds, sent when password hashing is at capacity
 
 """Token Handling"""
 def token_required(f):
@@ -33,6 +36,21 @@ def token_required(f):
     return decorated
 
 
+def ops_required(f):
+    """
+    Restrict a route to operators: users whose email is listed in OPS_USER_EMAILS
+    (comma separated). Use below @token_required, which sets g.current_user.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        operators = {email.strip().lower() for email in os.getenv("OPS_USER_EMAILS", "").split(",") if email.strip()}
+        user = g.get("current_user") or {}
+        if (user.get("sub") or "").lower() not in operators:
+            return jsonify({"error": "Forbidden"}), 403
+        return f(*args, **kwargs)
+    return decorated
+
+
 def _get_token_from_request():
     auth = request.headers.get("Authorization", "")
     if auth.startswith("Bearer "):
@@ -63,6 +81,18 @@ def me():
     })
 
 
+"""Stats Route - password hashing pool load"""
+@bp.route("/api/auth/stats", methods=["GET"])
+@token_required
+@ops_required
+def stats():
+    """
+    GET /api/auth/stats (operators only, see OPS_USER_EMAILS)
+    Returns: {"password_hasher": {...}} in-flight, queued and rejected bcrypt work
+    """
+    return jsonify({"password_hasher": get_password_hasher().stats()}), 200
+
+
 """Home Route"""
 @bp.route('/home')
 @token_required
@@ -86,7 +116,10 @@ def register():
     last_name = data.get("last_name")
 
     ca = Connector()
-    success, message = ca.add_user(email, password, first_name, last_name)
+    try:
+        success, message = ca.add_user(email, password, first_name, last_name)
+    except PasswordHasherBusyError:
+        return _busy_response("register.html", "Register")
     if not success:
         # JSON returns 400; form re-renders with error
         if request.is_json:
@@ -136,7 +169,10 @@ def login():
         return jsonify({"error": "Email and password are required"}), 400
 
     ca = Connector()
-    user = ca.verify_user_by_password(email, password)
+    try:
+        user = ca.verify_user_by_password(email, password)
+    except PasswordHasherBusyError:
+        return _busy_response()
     if not user:
         return jsonify({"error": "Invalid credentials"}), 401
 
@@ -170,6 +206,17 @@ def login():
     )
     return resp
 
+def _busy_response(template=None, title=None):
+    """503 with Retry-After when the password hashing pool turns a request away."""
+    message = "The server is busy, please try again in a moment."
+    if template is None or request.is_json:
+        resp = jsonify({"error": message})
+    else:
+        resp = current_app.make_response(render_template(template, title=title, error=message))
+    resp.status_code = 503
+    resp.headers["Retry-After"] = BUSY_RETRY_AFTER
+    return resp
+
 @bp.route("/logout")
 @token_required
 def logout():
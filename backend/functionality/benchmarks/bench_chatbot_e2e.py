@@ -0,0 +1,214 @@
+"""
+End-to-end chatbot benchmark against the local stub LLM server.
+
+Starts benchmarks.stub_llm_server (or uses --base-url), points the real
+ChatbotConnector at it through OPENAI_BASE_URL and drives:
+- POST /api/chatbot/chat with a Bearer token (latency = time to the full JSON reply)
+- the chatbot_message Socket.IO event (time to first token and to the done payload)
+
+Every LLM and embedding call goes over HTTP through the pooled client. The
+DAO is a stub, so no MySQL is needed. By default the local intent router,
+answer templates and tool cache are switched off so every turn makes both
+model calls; --router, --templates and --cache turn them back on.
+
+Usage:
+    python3 -m benchmarks.bench_chatbot_e2e
+    python3 -m benchmarks.bench_chatbot_e2e --requests 500 --concurrency 50 --latency 0.3
+    python3 -m benchmarks.bench_chatbot_e2e --base-url http://127.0.0.1:8765/v1 --mode socket
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from flask import Flask
+
+import chatbot.connector as connector_module
+import chatbot.socket_chat as socket_chat
+from chatbot.chat_workers import ChatWorkerPool
+from chatbot.connector import ChatbotConnector
+from chatbot.conversation_store import InMemoryConversationStore
+from chatbot.routes import bp as chatbot_bp
+from chatbot.tool_cache import ToolResultCache
+from benchmarks.bench_socket_chat import StubDAO
+from benchmarks.stub_llm_server import StubLLM, StubLLMServer
+
+SECRET = "bench-secret"
+MESSAGES = [
+    "what are my upcoming events?",
+    "show my badges",
+    "which teams am I in?",
+    "find me a beach volunteering event",
+    "what is OneSky?",
+]
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000 if samples else 0.0
+
+
+def make_token(email):
+    payload = {"sub": email, "first_name": "Bench", "exp": datetime.now(timezone.utc) + timedelta(hours=1)}
+    return jwt.encode(payload, SECRET, algorithm="HS256")
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = SECRET
+    app.register_blueprint(chatbot_bp)
+    socket_chat.socketio.init_app(app, async_mode="threading")
+    return app
+
+
+def run_http(app, args):
+    """Closed loop: --concurrency users each sending requests back to back."""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    remaining = [args.requests]
+
+    def user(index):
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {make_token(f'http{index}@bench.local')}"}
+        turn = 0
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            message = MESSAGES[(index + turn) % len(MESSAGES)]
+            turn += 1
+            started = time.perf_counter()
+            response = client.post("/api/chatbot/chat", json={"message": message}, headers=headers)
+            elapsed = time.perf_counter() - started
+            with lock:
+                (latencies if response.status_code == 200 else errors).append(elapsed)
+
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started
+
+
+def run_socket(app, args):
+    """Open loop burst: --requests clients each send one message at the same moment."""
+    clients = [socket_chat.socketio.test_client(app) for _ in range(args.requests)]
+    results = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(clients) + 1)
+
+    def user(index, client):
+        barrier.wait()
+        sent = time.perf_counter()
+        client.emit("chatbot_message", {
+            "message": MESSAGES[index % len(MESSAGES)],
+            "user_email": f"socket{index}@bench.local",
+        })
+        first_token = None
+        outcome = "timeout"
+        while time.perf_counter() - sent < args.timeout and outcome == "timeout":
+            for event in client.get_received():
+                if event["name"] != "chatbot_response":
+                    continue
+                payload = event["args"][0]
+                # "partial" payloads carry cards, not text
+                if first_token is None and payload.get("response") and not payload.get("partial"):
+                    first_token = time.perf_counter() - sent
+                if payload.get("done"):
+                    outcome = "busy" if payload.get("busy") else "ok"
+                    break
+            time.sleep(0.002)
+        with lock:
+            results.append((outcome, first_token, time.perf_counter() - sent))
+
+    threads = [threading.Thread(target=user, args=(i, c)) for i, c in enumerate(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        client.disconnect()
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["http", "socket", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent HTTP users")
+    parser.add_argument("--base-url", help="use an already running stub (or real) endpoint")
+    parser.add_argument("--latency", type=float, default=0.2, help="stub time to first byte (s)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="stub delay between chunks (s)")
+    parser.add_argument("--workers", type=int, default=32, help="socket chat workers")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--router", action="store_true", help="keep the local intent router on")
+    parser.add_argument("--templates", action="store_true", help="keep answer templates on")
+    parser.add_argument("--cache", action="store_true", help="keep the tool result cache on")
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        server = StubLLMServer(StubLLM(latency=args.latency, token_delay=args.token_delay)).start()
+        base_url = server.base_url
+    os.environ["OPENAI_BASE_URL"] = base_url
+
+    connector = ChatbotConnector(memory=InMemoryConversationStore())
+    connector.dao = StubDAO(query_delay=0.005)
+    if not args.router:
+        connector.intent_router = None
+    if not args.templates:
+        connector.use_answer_templates = False
+    if not args.cache:
+        connector.tool_cache = ToolResultCache(ttl_seconds=0)
+    connector_module._shared_connector = connector
+    pool = ChatWorkerPool(max_workers=args.workers, per_user_limit=2, max_pending=max(256, args.requests))
+    socket_chat.get_chat_worker_pool = lambda: pool
+
+    app = make_app()
+    print(f"LLM endpoint: {base_url}")
+
+    if args.mode in ("http", "both"):
+        latencies, errors, elapsed = run_http(app, args)
+        print(f"\nHTTP /api/chatbot/chat: {len(latencies)} ok, {len(errors)} failed in {elapsed:.2f}s "
+              f"({len(latencies) / elapsed:.1f} req/s, concurrency {args.concurrency})")
+        print(f"  latency      p50 {percentile_ms(latencies, 50):8.1f} ms   "
+              f"p95 {percentile_ms(latencies, 95):8.1f} ms   p99 {percentile_ms(latencies, 99):8.1f} ms")
+
+    if args.mode in ("socket", "both"):
+        results, elapsed = run_socket(app, args)
+        ok = [r for r in results if r[0] == "ok"]
+        first = [r[1] for r in ok if r[1] is not None]
+        total = [r[2] for r in ok]
+        print(f"\nSocket chatbot_message: {len(ok)} ok, {sum(r[0] == 'busy' for r in results)} busy, "
+              f"{sum(r[0] == 'timeout' for r in results)} timed out in {elapsed:.2f}s ({len(ok) / elapsed:.1f} chats/s)")
+        for label, samples in (("first token", first), ("done", total)):
+            print(f"  {label:<12} p50 {percentile_ms(samples, 50):8.1f} ms   "
+                  f"p95 {percentile_ms(samples, 95):8.1f} ms   p99 {percentile_ms(samples, 99):8.1f} ms")
+        print(f"  worker pool: {pool.stats()}")
+
+    print(f"\nLLM HTTP pool: {connector.pool_stats()}")
+    if server is not None:
+        print(f"Stub requests: {server.stub.stats()}")
+        server.stop()
+    pool.shutdown()
+    connector.close()
+
+
+if __name__ == "__main__":
+    main()
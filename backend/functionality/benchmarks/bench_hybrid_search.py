@@ -0,0 +1,108 @@
+"""
+Offline benchmark for the full event search pipeline.
+
+Generates a synthetic event catalogue, embeds it with the local hashed n-gram
+provider (no network), builds the EventEmbeddingIndex and runs hybrid
+keyword + vector queries, reporting embedding throughput, query latency
+percentiles and how often the top result matches the query's topic.
+
+Usage:
+    python3 -m benchmarks.bench_hybrid_search
+    python3 -m benchmarks.bench_hybrid_search --events 50000 --dim 256 --queries 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot.embedding_index import EventEmbeddingIndex
+from chatbot.embedding_providers import HashingEmbeddingProvider
+
+TOPICS = [
+    ("beach cleanup", "Environment", "Collect litter and plastic along the seafront"),
+    ("food bank", "Hunger", "Sort donations and pack food parcels"),
+    ("tree planting", "Environment", "Plant saplings in the local park"),
+    ("coding club", "Education", "Teach children to build simple games"),
+    ("animal shelter", "Animals", "Walk dogs and clean kennels"),
+    ("charity run", "Health", "Marshal runners and hand out water"),
+    ("elderly companionship", "Community", "Visit care homes and chat with residents"),
+    ("homeless kitchen", "Hunger", "Cook and serve hot meals"),
+]
+CITIES = ["London", "Manchester", "Leeds", "Brighton", "Bristol", "Glasgow"]
+
+
+def make_catalogue(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for event_id in range(n):
+        topic = int(rng.integers(len(TOPICS)))
+        title, cause, about = TOPICS[topic]
+        day = np.datetime64("2099-01-01") + int(rng.integers(0, 365))
+        rows.append({
+            "ID": event_id,
+            "Title": f"{title.title()} #{event_id}",
+            "About": about,
+            "CauseName": cause,
+            "Date": str(day),
+            "StartTime": "10:00:00",
+            "LocationCity": CITIES[int(rng.integers(len(CITIES)))],
+            "topic": topic,
+        })
+    return rows
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline hybrid event search benchmark")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    provider = HashingEmbeddingProvider(dim=args.dim)
+    rows = make_catalogue(args.events)
+
+    started = time.perf_counter()
+    embeddings = provider.embed_array([f"{r['Title']} {r['About']} {r['CauseName']}" for r in rows])
+    embed_seconds = time.perf_counter() - started
+    for row, embedding in zip(rows, embeddings):
+        row["embedding"] = embedding
+
+    started = time.perf_counter()
+    index = EventEmbeddingIndex()
+    index.load(rows)
+    load_seconds = time.perf_counter() - started
+
+    rng = np.random.default_rng(1)
+    latencies, correct = [], 0
+    for _ in range(args.queries):
+        topic = int(rng.integers(len(TOPICS)))
+        text = TOPICS[topic][0]
+        location = CITIES[int(rng.integers(len(CITIES)))] if rng.random() < 0.5 else None
+        started = time.perf_counter()
+        query_embedding = provider.embed([text])[0]
+        results = index.hybrid_search(text, query_embedding, location=location, limit=args.k, similarity_threshold=0.1)
+        latencies.append(time.perf_counter() - started)
+        if results and rows[results[0]["ID"]]["topic"] == topic:
+            correct += 1
+
+    print(f"events: {args.events}  dim: {args.dim}  provider: {provider.model}")
+    print(f"embedding throughput: {args.events / embed_seconds:,.0f} texts/s")
+    print(f"index load: {load_seconds:.2f}s")
+    print(f"queries: {args.queries}  QPS: {args.queries / sum(latencies):,.1f}")
+    print(f"latency p50: {percentile_ms(latencies, 50):.2f} ms  p95: {percentile_ms(latencies, 95):.2f} ms  "
+          f"p99: {percentile_ms(latencies, 99):.2f} ms")
+    print(f"top-1 topic match: {correct / args.queries:.3f}")
+
+
+if __name__ == "__main__":
+    main()
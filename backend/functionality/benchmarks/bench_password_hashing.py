@@ -0,0 +1,151 @@
+"""
+Login burst benchmark for the bcrypt worker pool.
+
+Drives POST /login with --logins concurrent clients while --readers clients
+call a cheap authenticated endpoint (GET /api/me), and reports login
+throughput next to the readers' latency. Runs once with bcrypt inline on
+the request threads (the old behaviour) and then with 1, 2, 4 ... up to
+--max-workers hashing processes, so login throughput should grow with the
+cores given to the pool while /api/me keeps its latency.
+
+User lookups are served from memory, so no MySQL is needed; every login
+still checks a real bcrypt hash (cost --rounds).
+
+Usage:
+    python3 -m benchmarks.bench_password_hashing
+    python3 -m benchmarks.bench_password_hashing --seconds 10 --logins 32 --readers 8 --max-workers 8
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import bcrypt
+import jwt
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+import auth.password_hasher as password_hasher_module
+from auth.password_hasher import PasswordHasher
+from auth.routes import bp as auth_bp
+from badges.connector import BadgeConnector
+from data_access import DataAccess
+
+SECRET = "bench-secret"
+PASSWORD = "BenchPassword123!"  # NOSONAR: benchmark-only password constant
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000 if samples else 0.0
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = SECRET
+    app.register_blueprint(auth_bp)
+    return app
+
+
+def run_burst(app, args):
+    """--logins clients log in back to back while --readers clients poll /api/me."""
+    stop = threading.Event()
+    lock = threading.Lock()
+    logins, login_latency, busy, reader_latency = [0], [], [0], []
+    token = jwt.encode(
+        {"sub": "reader@sky.uk", "first_name": "Bench", "exp": datetime.now(timezone.utc) + timedelta(hours=1)},
+        SECRET,
+        algorithm="HS256",
+    )
+
+    def login_client(index):
+        client = app.test_client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = client.post("/login", json={"email": f"user{index}@sky.uk", "password": PASSWORD})
+            elapsed = time.perf_counter() - started
+            with lock:
+                if response.status_code == 200:
+                    logins[0] += 1
+                    login_latency.append(elapsed)
+                elif response.status_code == 503:
+                    busy[0] += 1
+            if response.status_code == 503:
+                time.sleep(0.1)  # a real client would honour Retry-After
+
+    def reader():
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get("/api/me", headers=headers)
+            with lock:
+                reader_latency.append(time.perf_counter() - started)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=login_client, args=(i,)) for i in range(args.logins)]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return logins[0] / elapsed, login_latency, busy[0], reader_latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--logins", type=int, default=16, help="concurrent login clients")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent /api/me clients")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost of the stored hash")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-pending", type=int, default=None, help="queue per pool (default 4 per worker)")
+    args = parser.parse_args()
+
+    stored = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(args.rounds))
+
+    def user_by_email(self, email):
+        return {"ID": 1, "Email": email, "Password": stored, "FirstName": "Bench", "LastName": "User"}
+
+    configs = [("inline", PasswordHasher(max_workers=args.logins, max_pending=0, inline=True))]
+    workers = 1
+    while workers <= args.max_workers:
+        configs.append((f"{workers} process{'es' if workers > 1 else ''}",
+                        PasswordHasher(max_workers=workers, max_pending=args.max_pending)))
+        workers *= 2
+
+    print(f"{args.logins} login clients, {args.readers} /api/me clients, {args.seconds:.0f}s per run, "
+          f"bcrypt cost {args.rounds}, {os.cpu_count()} CPUs")
+    print(f"{'hashing':<14}{'logins/s':>10}{'login p50':>11}{'login p95':>11}{'503s':>7}"
+          f"{'me p50':>9}{'me p95':>9}{'me p99':>9}{'avg queue ms':>14}")
+    app = make_app()
+    with patch.object(DataAccess, "get_user_by_email", user_by_email), \
+            patch.object(DataAccess, "get_user_id_by_email", lambda self, email: None), \
+            patch.object(BadgeConnector, "check_and_award_event_badges", lambda self, user_id: None):
+        for label, hasher in configs:
+            password_hasher_module._password_hasher = hasher
+            if not hasher.inline:
+                # start the worker processes before timing
+                for _ in range(hasher.max_workers):
+                    hasher.check_password("warm-up", stored)
+            throughput, login_latency, busy, reader_latency = run_burst(app, args)
+            stats = hasher.stats()
+            hasher.shutdown()
+            print(f"{label:<14}{throughput:>10.1f}{percentile_ms(login_latency, 50):>9.0f}ms"
+                  f"{percentile_ms(login_latency, 95):>9.0f}ms{busy:>7}"
+                  f"{percentile_ms(reader_latency, 50):>7.1f}ms{percentile_ms(reader_latency, 95):>7.1f}ms"
+                  f"{percentile_ms(reader_latency, 99):>7.1f}ms{stats['avg_queue_wait_ms']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
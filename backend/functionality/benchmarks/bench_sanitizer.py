@@ -0,0 +1,72 @@
+"""
+Micro-benchmark for the chatbot's prompt-injection sanitizer.
+
+Compares the single-pass sanitizer (one combined regex and a str.translate
+table) with the original loop (one regex search per forbidden pattern and
+one str.replace per special character) on short questions and long pasted
+messages.
+
+Usage:
+    python3 -m benchmarks.bench_sanitizer
+    python3 -m benchmarks.bench_sanitizer --repeat 2000
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+from unittest.mock import patch
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from chatbot.connector import ChatbotConnector, _FORBIDDEN_PATTERNS, _SPECIAL_CHARS
+
+SHORT = "What volunteering events are on near London this weekend?"
+PASTED = (
+    "Hi! I'm organising our team's volunteering day (Sat 14th / Sun 15th) -- we'd like "
+    "something outdoors: beach cleanup, tree planting, that kind of thing... \"ideally\" "
+    "within 30 miles of Leeds; about 12 people.   Any ideas?\n\n"
+)
+
+
+def legacy_sanitise(message):
+    trimmed = message.strip()
+    for pattern in _FORBIDDEN_PATTERNS:
+        if pattern.search(trimmed):
+            raise ValueError("rejected")
+    sanitised = trimmed
+    for char in _SPECIAL_CHARS:
+        sanitised = sanitised.replace(char, "")
+    return re.sub(r"\s{2,}", " ", sanitised).strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    with patch("chatbot.connector.EmbeddingHelper"), patch("chatbot.connector.DataAccess"):
+        connector = ChatbotConnector()
+    sanitise = connector._sanitise_user_message
+
+    cases = [
+        ("short question", SHORT),
+        ("2 KB paste", PASTED * 8),
+        ("20 KB paste", PASTED * 80),
+        ("200 KB paste", PASTED * 800),
+    ]
+    print(f"{'message':<16}{'chars':>9}{'legacy us':>13}{'single-pass us':>17}{'speedup':>10}")
+    for label, message in cases:
+        assert sanitise(message) == legacy_sanitise(message)
+        number = max(1, args.repeat // max(1, len(message) // 2000))
+        legacy = min(timeit.repeat(lambda: legacy_sanitise(message), number=number, repeat=5)) / number
+        single = min(timeit.repeat(lambda: sanitise(message), number=number, repeat=5)) / number
+        print(f"{label:<16}{len(message):>9}{legacy * 1e6:>13.1f}{single * 1e6:>17.1f}{legacy / single:>9.1f}x")
+
+    connector.close()
+
+
+if __name__ == "__main__":
+    main()
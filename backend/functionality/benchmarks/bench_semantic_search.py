@@ -0,0 +1,118 @@
+"""
+Benchmark for semantic event search.
+
+Builds an EventEmbeddingIndex over synthetic, clustered embeddings and compares
+the IVF approximate index and the int8/binary quantized modes against the exact
+brute-force baseline, reporting recall@k, queries per second and the resident
+size of the structure scanned per query.
+
+Usage:
+    python3 -m benchmarks.bench_semantic_search
+    python3 -m benchmarks.bench_semantic_search --events 200000 --dim 384 --probes 1,4,8,16
+    python3 -m benchmarks.bench_semantic_search --dim 1536 --rerank-factors 5,10,20
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot.ann_index import IVFIndex
+from chatbot.embedding_index import EventEmbeddingIndex
+
+
+def make_clustered_embeddings(n, dim, n_topics=200, noise=1.0, seed=0):
+    """Synthetic embeddings: points scattered around random 'topic' directions."""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim)).astype(np.float32)
+    labels = rng.integers(0, n_topics, size=n)
+    vectors = topics[labels] + noise * rng.normal(size=(n, dim)).astype(np.float32)
+    return vectors.astype(np.float32)
+
+
+def make_queries(vectors, n_queries, noise=0.5, seed=1):
+    """Queries are perturbed copies of random catalog vectors."""
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.integers(0, vectors.shape[0], size=n_queries)]
+    return picks + noise * rng.normal(size=picks.shape).astype(np.float32)
+
+
+def build_index(vectors, **index_kwargs):
+    rows = [
+        {"ID": i, "Date": "2099-01-01", "StartTime": "10:00:00", "LocationCity": "London", "embedding": vec}
+        for i, vec in enumerate(vectors)
+    ]
+    index = EventEmbeddingIndex(ann_min_size=1, **index_kwargs)
+    index.load(rows)
+    return index
+
+
+def run_queries(index, queries, k, **search_kwargs):
+    """Return (list of result-id lists, queries per second)."""
+    results = []
+    started = time.perf_counter()
+    for query in queries:
+        hits = index.search(query, limit=k, similarity_threshold=-1.0, start_date="2000-01-01", **search_kwargs)
+        results.append([hit["ID"] for hit in hits])
+    elapsed = time.perf_counter() - started
+    return results, len(queries) / elapsed if elapsed else float("inf")
+
+
+def recall_at_k(approx, exact):
+    total = sum(len(set(a) & set(e)) for a, e in zip(approx, exact))
+    return total / max(1, sum(len(e) for e in exact))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exact vs ANN semantic search")
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default sqrt(events))")
+    parser.add_argument("--probes", default="1,2,4,8,16,32")
+    parser.add_argument("--rerank-factors", default="10,50", help="Shortlist multiples for quantized modes")
+    args = parser.parse_args()
+
+    print(f"Generating {args.events} x {args.dim} embeddings...")
+    vectors = make_clustered_embeddings(args.events, args.dim)
+    queries = make_queries(vectors, args.queries)
+
+    started = time.perf_counter()
+    exact_index = build_index(vectors)
+    print(f"Exact index built in {time.perf_counter() - started:.1f}s")
+    exact_results, exact_qps = run_queries(exact_index, queries, args.k)
+
+    started = time.perf_counter()
+    ivf_index = build_index(vectors, ann=IVFIndex(n_lists=args.lists))
+    n_lists = ivf_index.ann.centroids.shape[0]
+    print(f"IVF index built in {time.perf_counter() - started:.1f}s ({n_lists} lists)")
+
+    print()
+    float_mb = exact_index.memory_usage()["full_precision"] / 1e6
+    header = f"{'mode':<22}{'recall@' + str(args.k):>12}{'QPS':>12}{'speedup':>10}{'scan MB':>10}{'shrink':>8}"
+    print(header)
+    print(f"{'exact':<22}{1.0:>12.3f}{exact_qps:>12.1f}{1.0:>10.2f}{float_mb:>10.1f}{1.0:>8.1f}")
+
+    def report(label, index, scan_mb, **search_kwargs):
+        approx_results, qps = run_queries(index, queries, args.k, **search_kwargs)
+        recall = recall_at_k(approx_results, exact_results)
+        print(f"{label:<22}{recall:>12.3f}{qps:>12.1f}{qps / exact_qps:>10.2f}{scan_mb:>10.1f}{float_mb / scan_mb:>8.1f}")
+
+    for n_probe in [int(p) for p in args.probes.split(",") if p]:
+        report(f"ivf probe={n_probe}", ivf_index, float_mb, n_probe=n_probe)
+
+    for mode in ("int8", "binary"):
+        quantized = build_index(vectors, quantization=mode, min_rerank=0)
+        scan_mb = quantized.memory_usage()["codes"] / 1e6
+        for factor in [int(f) for f in args.rerank_factors.split(",") if f]:
+            quantized.rerank_factor = factor
+            report(f"{mode} rerank x{factor}", quantized, scan_mb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Load test for the Socket.IO chatbot.
+
+Connects hundreds of Socket.IO test clients to the real chatbot_message
+handler and sends one message from each at the same time. The connector is
+the real ChatbotConnector, with a stub LLM (fixed latency, a scripted tool
+call, then a reply streamed in chunks) and a stub DAO, so nothing touches the
+network or MySQL.
+
+Reports how long the handler held the socket, time to first streamed piece,
+full reply latency percentiles, throughput, busy rejections and the chat
+worker pool statistics.
+
+Usage:
+    python3 -m benchmarks.bench_socket_chat
+    python3 -m benchmarks.bench_socket_chat --clients 500 --workers 32 --latency 0.2
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from flask import Flask
+
+import chatbot.socket_chat as socket_chat
+from chatbot.chat_workers import ChatWorkerPool
+from chatbot.connector import ChatbotConnector
+from chatbot.conversation_store import InMemoryConversationStore
+from chatbot.tool_cache import ToolResultCache
+
+REPLY = "Your next event is the beach cleanup on Saturday morning. Bring gloves and water, and enjoy it!"
+
+
+class StubCompletions:
+    """chat.completions with fixed latency: a tool call first, then a streamed reply"""
+
+    def __init__(self, latency, chunk_delay, chunk_chars=8):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.chunk_chars = chunk_chars
+
+    def create(self, model, messages, tools=None, tool_choice=None, stream=False, **kwargs):
+        time.sleep(self.latency)
+        if stream:
+            return self._stream()
+        call = SimpleNamespace(
+            id="call_1",
+            type="function",
+            function=SimpleNamespace(name="get_my_upcoming_events", arguments='{"limit": 3}'),
+        )
+        message = SimpleNamespace(role="assistant", content=None, tool_calls=[call])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def _stream(self):
+        for start in range(0, len(REPLY), self.chunk_chars):
+            time.sleep(self.chunk_delay)
+            delta = SimpleNamespace(content=REPLY[start:start + self.chunk_chars])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class StubDAO:
+    """The DataAccess reads the chatbot tools make, with a fixed query time"""
+
+    def __init__(self, query_delay):
+        self.query_delay = query_delay
+
+    def _query(self, rows):
+        time.sleep(self.query_delay)
+        return rows
+
+    @staticmethod
+    def _events(limit):
+        return [
+            {
+                "ID": i,
+                "Title": f"Beach Cleanup #{i}",
+                "Date": "2099-06-0%d" % (i % 9 + 1),
+                "StartTime": "10:00:00",
+                "EndTime": "12:00:00",
+                "LocationCity": "Brighton",
+                "CauseName": "Environment",
+                "About": "Collect litter along the seafront",
+            }
+            for i in range(limit)
+        ]
+
+    @staticmethod
+    def _teams(count):
+        return [{"TeamID": i, "Name": f"Team {i}", "Description": "Weekend volunteers", "Department": "Tech"}
+                for i in range(count)]
+
+    @staticmethod
+    def _badges(count):
+        return [{"BadgeID": i, "Name": f"Badge {i}", "Description": "Awarded for volunteering"}
+                for i in range(count)]
+
+    def get_user_id_by_email(self, email):
+        return abs(hash(email)) % 100000 + 1
+
+    def get_user_by_email(self, email):
+        return {"FirstName": "Bench"}
+
+    def get_registered_event_ids(self, email):
+        return self._query(set())
+
+    def get_upcoming_events(self, user_id, limit=5):
+        return self._query(self._events(limit))
+
+    def get_completed_events(self, user_id, limit=5):
+        return self._query(self._events(limit))
+
+    def search_events_hybrid(self, limit=5, **kwargs):
+        return self._query(self._events(limit))
+
+    def get_filtered_events(self, limit=5, **kwargs):
+        return self._query(self._events(limit))
+
+    def get_all_joined_teams(self, email):
+        return self._query(self._teams(2))
+
+    def get_all_teams(self):
+        return self._query(self._teams(6))
+
+    def get_team_events(self, email):
+        return self._query(self._events(2))
+
+    def get_user_badges(self, user_id):
+        return self._query(self._badges(2))
+
+    def get_badges(self, user_id):
+        return self._badges(2)
+
+    def get_all_badges(self):
+        return self._query(self._badges(5))
+
+    def get_total_hours(self, user_id):
+        return self._query(12.5)
+
+    def get_completed_events_count(self, user_id):
+        return 4
+
+    def get_upcoming_events_count(self, user_id):
+        return 2
+
+
+def make_connector(args):
+    connector = ChatbotConnector(memory=InMemoryConversationStore())
+    connector.openai_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=StubCompletions(args.latency, args.chunk_delay))
+    )
+    connector.dao = StubDAO(args.query_delay)
+    # exercise both model calls and the DAO on every turn
+    connector.intent_router = None
+    connector.use_answer_templates = False
+    connector.tool_cache = ToolResultCache(ttl_seconds=0)
+    return connector
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000 if samples else 0.0
+
+
+def run_client(client, email, start_barrier, results, timeout):
+    start_barrier.wait()
+    sent = time.perf_counter()
+    client.emit("chatbot_message", {"message": "what are my upcoming events?", "user_email": email})
+    handler_done = time.perf_counter()
+
+    first_piece = None
+    outcome = "timeout"
+    deadline = sent + timeout
+    while time.perf_counter() < deadline:
+        for event in client.get_received():
+            if event["name"] != "chatbot_response":
+                continue
+            payload = event["args"][0]
+            if first_piece is None and payload.get("response"):
+                first_piece = time.perf_counter()
+            if payload.get("done"):
+                outcome = "busy" if payload.get("busy") else "ok"
+                break
+        if outcome != "timeout":
+            break
+        time.sleep(0.002)
+    finished = time.perf_counter()
+    results.append({
+        "outcome": outcome,
+        "handler": handler_done - sent,
+        "first_piece": (first_piece - sent) if first_piece else None,
+        "total": finished - sent,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("CHATBOT_CHAT_WORKERS", 16)))
+    parser.add_argument("--pending", type=int, default=int(os.getenv("CHATBOT_CHAT_PENDING", 256)))
+    parser.add_argument("--latency", type=float, default=0.15, help="stub LLM latency per call (s)")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="delay between streamed chunks (s)")
+    parser.add_argument("--query-delay", type=float, default=0.01, help="stub DAO query time (s)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    connector = make_connector(args)
+    pool = ChatWorkerPool(max_workers=args.workers, per_user_limit=2, max_pending=args.pending)
+    socket_chat.get_chatbot_connector = lambda: connector
+    socket_chat.get_chat_worker_pool = lambda: pool
+
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "bench"
+    socket_chat.socketio.init_app(app, async_mode="threading")
+    clients = [socket_chat.socketio.test_client(app) for _ in range(args.clients)]
+
+    print(f"Clients: {args.clients}  workers: {args.workers}  pending: {args.pending}  "
+          f"LLM latency: {args.latency * 1000:.0f} ms/call")
+
+    results = []
+    barrier = threading.Barrier(args.clients + 1)
+    threads = [
+        threading.Thread(target=run_client, args=(client, f"user{i}@bench.local", barrier, results, args.timeout))
+        for i, client in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ok = [r for r in results if r["outcome"] == "ok"]
+    busy = sum(1 for r in results if r["outcome"] == "busy")
+    timeouts = sum(1 for r in results if r["outcome"] == "timeout")
+    handler = [r["handler"] for r in results]
+    first = [r["first_piece"] for r in ok if r["first_piece"] is not None]
+    total = [r["total"] for r in ok]
+
+    print(f"\nCompleted {len(ok)} / {len(results)} chats in {elapsed:.2f}s "
+          f"({len(ok) / elapsed:.1f} chats/s); busy: {busy}, timed out: {timeouts}")
+    for label, samples in (("handler", handler), ("first piece", first), ("full reply", total)):
+        print(f"  {label:<12} p50 {percentile_ms(samples, 50):8.1f} ms   "
+              f"p95 {percentile_ms(samples, 95):8.1f} ms   p99 {percentile_ms(samples, 99):8.1f} ms")
+    print(f"\nWorker pool: {pool.stats()}")
+
+    for client in clients:
+        client.disconnect()
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+OpenAI-compatible stub server for benchmarking the chatbot offline.
+
+Serves the two endpoints the chatbot uses:
+- POST /v1/chat/completions: a scripted tool call when the request offers tools
+  and the latest user message matches a script rule, a plain answer otherwise.
+  Once tool results are in the conversation it writes the final answer.
+  With "stream": true the answer is sent as server-sent events, one chunk
+  every --token-delay seconds.
+- POST /v1/embeddings: deterministic local hashed n-gram vectors
+
+Every response waits --latency seconds first (time to first byte).
+GET /stats reports request counts.
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8765/v1 (any API key works).
+
+Usage:
+    python3 -m benchmarks.stub_llm_server --port 8765 --latency 0.3 --token-delay 0.02
+    python3 -m benchmarks.stub_llm_server --script my_script.json
+
+A script is a JSON list of rules, checked in order:
+    [{"match": "badge", "tool": "get_my_badges", "arguments": {}}, ...]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot.embedding_providers import HashingEmbeddingProvider
+
+DEFAULT_SCRIPT = [
+    {"match": r"\bupcoming\b|\bnext event", "tool": "get_my_upcoming_events", "arguments": {"limit": 3}},
+    {"match": r"\bcompleted\b|\bpast events?\b", "tool": "get_my_completed_events", "arguments": {"limit": 5}},
+    {"match": r"\bbadges?\b", "tool": "get_my_badges", "arguments": {}},
+    {"match": r"\bmy teams?\b", "tool": "get_my_teams", "arguments": {}},
+    {"match": r"\bteams?\b", "tool": "list_teams", "arguments": {}},
+    {"match": r"\bstats\b|\bhours\b", "tool": "get_my_stats", "arguments": {}},
+    {"match": r"\b(find|search|volunteer)\b", "tool": "search_events", "arguments": {"keyword": "beach cleanup"}},
+]
+
+DEFAULT_ANSWER = (
+    "Here is what I found for you. The beach cleanup on Saturday is the closest match, "
+    "and there are two more events next week if that date doesn't work."
+)
+DEFAULT_CHAT_ANSWER = "OneSky helps you find volunteering events, join teams and earn badges."
+
+
+def _words(text, per_chunk):
+    pieces = re.findall(r"\S+\s*", text)
+    return ["".join(pieces[i:i + per_chunk]) for i in range(0, len(pieces), per_chunk)]
+
+
+class StubLLM:
+    """Scripted responses and request counters, shared by the handler threads"""
+
+    def __init__(self, script=None, latency=0.2, token_delay=0.02, words_per_chunk=2,
+                 answer=DEFAULT_ANSWER, embedding_dim=1536):
+        """
+        Args:
+            script (list): Rules {"match": regex, "tool": name, "arguments": dict}, first match wins
+            latency (float): Seconds before each response starts
+            token_delay (float): Seconds between streamed chunks
+            words_per_chunk (int): Words per streamed chunk
+            answer (str): Text of the final (post-tool) answer
+            embedding_dim (int): Size of the returned embeddings
+        """
+        self.rules = [(re.compile(rule["match"], re.IGNORECASE), rule["tool"], rule.get("arguments", {}))
+                      for rule in (script or DEFAULT_SCRIPT)]
+        self.latency = float(latency)
+        self.token_delay = float(token_delay)
+        self.words_per_chunk = max(1, int(words_per_chunk))
+        self.answer = answer
+        self.embedder = HashingEmbeddingProvider(dim=embedding_dim)
+        self._lock = threading.Lock()
+        self.counts = {"chat": 0, "chat_stream": 0, "tool_calls": 0, "embeddings": 0}
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+    def choose(self, body):
+        """
+        Returns:
+            tuple: ("tool", name, arguments) or ("text", content)
+        """
+        messages = body.get("messages") or []
+        if messages and messages[-1].get("role") == "tool":
+            return ("text", self.answer)
+        user_text = next((str(m.get("content") or "") for m in reversed(messages) if m.get("role") == "user"), "")
+        if body.get("tools"):
+            for pattern, tool, arguments in self.rules:
+                if pattern.search(user_text):
+                    return ("tool", tool, arguments)
+        return ("text", DEFAULT_CHAT_ANSWER)
+
+
+def _completion(model, message, finish_reason):
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def _chunk(chunk_id, model, delta, finish_reason=None):
+    return {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _write_chunk(self, data):
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                self._send_json(200, stub.stats())
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": {"message": "invalid JSON"}})
+                return
+
+            time.sleep(stub.latency)
+            if self.path.endswith("/embeddings"):
+                self._embeddings(body)
+            elif self.path.endswith("/chat/completions"):
+                self._chat(body)
+            else:
+                self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+        def _embeddings(self, body):
+            stub.count("embeddings")
+            texts = body.get("input")
+            texts = [texts] if isinstance(texts, str) else list(texts or [])
+            vectors = stub.embedder.embed_array(texts) if texts else []
+            self._send_json(200, {
+                "object": "list",
+                "model": body.get("model", "stub-embedding"),
+                "data": [{"object": "embedding", "index": i, "embedding": [float(x) for x in vector]}
+                         for i, vector in enumerate(vectors)],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            })
+
+        def _chat(self, body):
+            model = body.get("model", "stub")
+            choice = stub.choose(body)
+            if choice[0] == "tool":
+                stub.count("tool_calls")
+                _, tool, arguments = choice
+                message = {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{
+                        "id": f"call_{uuid.uuid4().hex[:12]}",
+                        "type": "function",
+                        "function": {"name": tool, "arguments": json.dumps(arguments)},
+                    }],
+                }
+                stub.count("chat")
+                self._send_json(200, _completion(model, message, "tool_calls"))
+                return
+
+            text = choice[1]
+            if not body.get("stream"):
+                stub.count("chat")
+                self._send_json(200, _completion(model, {"role": "assistant", "content": text}, "stop"))
+                return
+
+            stub.count("chat_stream")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            try:
+                self._write_chunk(f"data: {json.dumps(_chunk(chunk_id, model, {'role': 'assistant', 'content': ''}))}\n\n".encode())
+                for index, piece in enumerate(_words(text, stub.words_per_chunk)):
+                    if index:
+                        time.sleep(stub.token_delay)
+                    self._write_chunk(f"data: {json.dumps(_chunk(chunk_id, model, {'content': piece}))}\n\n".encode())
+                self._write_chunk(f"data: {json.dumps(_chunk(chunk_id, model, {}, 'stop'))}\n\n".encode())
+                self._write_chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # client cancelled the stream
+                self.close_connection = True
+
+    return Handler
+
+
+class StubLLMServer:
+    """Runs the stub on a background thread (port 0 picks a free port)"""
+
+    def __init__(self, stub=None, host="127.0.0.1", port=0):
+        self.stub = stub or StubLLM()
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.stub))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before each response")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    parser.add_argument("--words-per-chunk", type=int, default=2)
+    parser.add_argument("--script", help="JSON file with tool-call rules")
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+    stub = StubLLM(script=script, latency=args.latency, token_delay=args.token_delay,
+                   words_per_chunk=args.words_per_chunk)
+    server = StubLLMServer(stub, host=args.host, port=args.port)
+    print(f"Stub LLM listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+ANN Index
+Approximate nearest neighbour search for event embeddings (pure NumPy).
+
+Implements an IVF (inverted file) coarse quantizer: vectors are clustered with
+spherical k-means and each vector is assigned to its closest centroid ("list").
+A query only scores the vectors in its n_probe closest lists, trading a little
+recall for a large reduction in work once the catalog is big.
+
+Knobs:
+- n_lists: number of clusters (more lists = fewer vectors scanned per probe)
+- n_probe: lists scanned per query (higher = better recall, slower)
+"""
+import os
+
+import numpy as np
+
+
+class IVFIndex:
+    """Spherical k-means coarse quantizer used by EventEmbeddingIndex."""
+
+    name = "ivf"
+
+    def __init__(self, n_lists=None, n_probe=8, kmeans_iters=15, max_train_points=50000, seed=0):
+        """
+        Args:
+            n_lists (int, optional): Number of inverted lists; defaults to ~sqrt(n) at training time
+            n_probe (int): Lists scanned per query
+            kmeans_iters (int): Lloyd iterations used when training
+            max_train_points (int): Training sample size cap
+            seed (int): RNG seed so training is reproducible
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.kmeans_iters = kmeans_iters
+        self.max_train_points = max_train_points
+        self.seed = seed
+        self.centroids = None
+
+    @property
+    def trained(self):
+        return self.centroids is not None
+
+    def train(self, vectors):
+        """
+        Fit centroids on unit-normalized vectors with spherical k-means.
+
+        Args:
+            vectors (np.ndarray): (n, dim) float32 matrix of unit vectors
+        """
+        n = vectors.shape[0]
+        if n == 0:
+            self.centroids = None
+            return
+        n_lists = self.n_lists or max(1, int(np.sqrt(n)))
+        n_lists = min(n_lists, n)
+
+        rng = np.random.default_rng(self.seed)
+        sample = vectors
+        if n > self.max_train_points:
+            sample = vectors[rng.choice(n, self.max_train_points, replace=False)]
+
+        centroids = sample[rng.choice(sample.shape[0], n_lists, replace=False)].copy()
+        for _ in range(self.kmeans_iters):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # Re-seed empty clusters with random points so every list stays usable
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample.shape[0], int(empty.sum()))]
+                norms[empty] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        self.centroids = centroids
+
+    def assign(self, vectors):
+        """Return the inverted-list id for each vector (int32)."""
+        if not self.trained or vectors.shape[0] == 0:
+            return np.zeros(vectors.shape[0], dtype=np.int32)
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def probe(self, query, n_probe=None):
+        """Return the ids of the lists closest to the query."""
+        n_probe = min(n_probe or self.n_probe, self.centroids.shape[0])
+        scores = self.centroids @ query
+        if n_probe >= scores.size:
+            return np.arange(scores.size, dtype=np.int32)
+        return np.argpartition(-scores, n_probe - 1)[:n_probe].astype(np.int32)
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+    def save(self, path, ids, assignments):
+        """
+        Write centroids and list assignments to an .npz file (atomically).
+
+        Args:
+            path (str): Target file path
+            ids (np.ndarray): Event IDs, parallel to assignments
+            assignments (np.ndarray): Inverted-list id per event
+        """
+        if not self.trained:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            np.savez(
+                fh,
+                centroids=self.centroids,
+                ids=np.asarray(ids, dtype=np.int64),
+                assignments=np.asarray(assignments, dtype=np.int32),
+            )
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """
+        Load centroids saved with save(). n_probe stays as configured on this instance.
+
+        Returns:
+            dict: {event_id: list_id} assignments stored alongside the centroids
+        """
+        with np.load(path) as data:
+            self.centroids = data["centroids"].astype(np.float32)
+            self.n_lists = self.centroids.shape[0]
+            return dict(zip(data["ids"].tolist(), data["assignments"].tolist()))
+
+
+def create_ann_index(backend, **kwargs):
+    """
+    Build an ANN index by name.
+
+    Args:
+        backend (str): "exact" (no ANN, brute force) or "ivf"
+
+    Returns:
+        IVFIndex or None
+    """
+    backend = (backend or "exact").lower()
+    if backend == "exact":
+        return None
+    if backend == "ivf":
+        return IVFIndex(**kwargs)
+    raise ValueError(f"Unknown embedding index backend: {backend}")
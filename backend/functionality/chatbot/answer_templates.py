@@ -0,0 +1,171 @@
+"""
+Answer Templates
+Builds the chatbot's reply locally for data-only lookups (stats, badges,
+my events, my teams), so the second model call is only made when the user
+asks something that needs reasoning over the data.
+
+The cards (events, badges, teams) are rendered by the frontend; these
+sentences are the short summary shown above them.
+"""
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# Questions that want more than the data read back to them
+_NEEDS_REASONING = re.compile(
+    r"\b(why|how come|how can|how do|should|recommend|suggest|advice|tips?|best|compare|"
+    r"explain|difference|closest|nearest|longest|shortest|which one|what if|help me|plan|"
+    r"summar(y|ise|ize)|tell me about|describe)\b",
+    re.IGNORECASE,
+)
+
+MAX_NAMES = 5
+
+
+def needs_reasoning(message: str) -> bool:
+    """True when the question needs the model, not just the data."""
+    return bool(_NEEDS_REASONING.search(message or ""))
+
+
+def _plural(count, singular, plural=None):
+    return f"{count} {singular if count == 1 else (plural or singular + 's')}"
+
+
+def _join_names(names: List[str], total: Optional[int] = None) -> str:
+    names = [n for n in names if n]
+    shown = names[:MAX_NAMES]
+    total = max(total or 0, len(names))
+    if total > len(shown) and shown:
+        return f"{', '.join(shown)} and {total - len(shown)} more"
+    if len(shown) > 1:
+        return f"{', '.join(shown[:-1])} and {shown[-1]}"
+    return shown[0] if shown else ""
+
+
+def _field(row: dict, *keys):
+    for key in keys:
+        if row.get(key) not in (None, ""):
+            return row[key]
+    return None
+
+
+def _format_date(value) -> Optional[str]:
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").strftime("%a %d %b")
+    except (TypeError, ValueError):
+        return str(value) if value else None
+
+
+def _format_time(value) -> Optional[str]:
+    if not value:
+        return None
+    parts = str(value).split(":")
+    if len(parts) >= 2:
+        return f"{int(parts[0]):02d}:{parts[1]}"
+    return str(value)
+
+
+def _describe_event(event: dict) -> str:
+    title = _field(event, "title", "Title") or "an event"
+    text = title
+    day = _format_date(_field(event, "Date", "date"))
+    if day:
+        text += f" on {day}"
+    start = _format_time(_field(event, "StartTime", "start_time"))
+    if start:
+        text += f" at {start}"
+    city = _field(event, "location", "LocationCity")
+    if city:
+        text += f" in {city}"
+    return text
+
+
+# The event tools return at most `limit` rows; `total` is the user's real count
+# when the list was cut short (see ChatbotConnector._run_tool_call)
+def _upcoming_events(data, total=None):
+    if not data:
+        return "You don't have any upcoming events yet. Want me to find some for you?"
+    total = max(total or 0, len(data))
+    return f"You have {_plural(total, 'upcoming event')}. Next up: {_describe_event(data[0])}."
+
+
+def _completed_events(data, total=None):
+    if not data:
+        return "You haven't completed any events yet. Want me to find one to get started?"
+    total = max(total or 0, len(data))
+    titles = [_field(e, "title", "Title") for e in data]
+    return f"You've completed {_plural(total, 'event')}: {_join_names(titles, total)}."
+
+
+def _my_badges(data):
+    if not data:
+        return "You haven't earned any badges yet. Sign up for an event to earn your first one!"
+    names = [_field(b, "Name", "name") for b in data]
+    return f"You've earned {_plural(len(data), 'badge')}: {_join_names(names)}."
+
+
+def _available_badges(data):
+    if not data:
+        return "You've earned every badge available. Great work!"
+    names = [_field(b, "Name", "name") for b in data]
+    return f"There {'is' if len(data) == 1 else 'are'} {_plural(len(data), 'badge')} left to earn: {_join_names(names)}."
+
+
+def _my_teams(data):
+    if not data:
+        return "You're not in any teams yet. Ask me to list teams you can join."
+    names = [_field(t, "name", "Name") for t in data]
+    return f"You're a member of {_plural(len(data), 'team')}: {_join_names(names)}."
+
+
+def _my_stats(data):
+    if not data:
+        return "I couldn't find any volunteering stats for you yet."
+    hours = data.get("total_hours") or 0
+    hours = int(hours) if float(hours).is_integer() else round(float(hours), 1)
+    return (
+        f"So far you've volunteered {_plural(hours, 'hour')} across "
+        f"{_plural(int(data.get('completed_events') or 0), 'completed event')}. "
+        f"You have {int(data.get('upcoming_events') or 0)} coming up and "
+        f"{_plural(int(data.get('badges_count') or 0), 'badge')} earned."
+    )
+
+
+TEMPLATES = {
+    "get_my_upcoming_events": _upcoming_events,
+    "get_my_completed_events": _completed_events,
+    "get_my_badges": _my_badges,
+    "get_available_badges": _available_badges,
+    "get_my_teams": _my_teams,
+    "get_my_stats": _my_stats,
+}
+
+
+def render_answer(user_message: str, tool_results: List[Tuple[str, dict]], force: bool = False) -> Optional[str]:
+    """
+    Render the reply for a data-only lookup.
+
+    Args:
+        user_message (str): The user's question
+        tool_results (list): (tool_name, result) pairs from this turn
+        force (bool): Render even when the question needs reasoning (used when
+            the model is unavailable)
+
+    Returns:
+        str or None: The reply, or None when the model should write it
+            (several tools, a tool without a template, a failed tool, or a
+            question that needs reasoning)
+    """
+    if len(tool_results) != 1 or (not force and needs_reasoning(user_message)):
+        return None
+    tool_name, result = tool_results[0]
+    template = TEMPLATES.get(tool_name)
+    if template is None or not isinstance(result, dict):
+        return None
+    try:
+        if result.get("total") is not None:
+            return template(result.get("data"), total=result["total"])
+        return template(result.get("data"))
+    except Exception as e:
+        print(f"Answer template error for {tool_name}: {e}")
+        return None
@@ -0,0 +1,144 @@
+"""
+Chat Workers
+Bounded executor for socket chat turns, so Socket.IO handlers return
+immediately instead of holding their connection for two LLM calls.
+
+- At most max_workers turns run at once; up to max_pending more wait
+- Each user may have at most per_user_limit turns queued or running
+- Anything beyond those limits is rejected straight away with ChatBusyError
+  rather than queueing without bound
+
+Under eventlet/gevent (SOCKETIO_ASYNC_MODE) the standard library is
+monkey-patched, so these worker threads are green threads.
+
+Limits come from CHATBOT_CHAT_WORKERS, CHATBOT_CHAT_PENDING and
+CHATBOT_CHAT_PER_USER.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ChatBusyError(RuntimeError):
+    """Raised when a chat turn can't be accepted (user or server at capacity)."""
+
+
+class ChatWorkerPool:
+    """Bounded thread pool for chat turns with a per-user concurrency limit"""
+
+    def __init__(self, max_workers=16, per_user_limit=2, max_pending=256):
+        """
+        Args:
+            max_workers (int): Chat turns processed at once
+            per_user_limit (int): Turns one user may have queued or running
+            max_pending (int): Turns allowed to wait for a free worker
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.per_user_limit = max(1, int(per_user_limit))
+        self.max_pending = max(0, int(max_pending))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chatbot-chat")
+        self._lock = threading.Lock()
+        self._per_user = {}
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected_user = 0
+        self.rejected_busy = 0
+        self._total_wait = 0.0
+
+    def submit(self, user_key, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) for a user.
+
+        Args:
+            user_key (str): User email, or the socket ID for anonymous users
+
+        Returns:
+            Future: Completes when the turn has finished
+
+        Raises:
+            ChatBusyError: The user already has per_user_limit turns in flight, or the
+                server has max_workers + max_pending turns in flight
+        """
+        with self._lock:
+            if self._per_user.get(user_key, 0) >= self.per_user_limit:
+                self.rejected_user += 1
+                raise ChatBusyError("Please wait for your previous message to finish.")
+            if self._in_flight >= self.max_workers + self.max_pending:
+                self.rejected_busy += 1
+                raise ChatBusyError("The assistant is busy right now. Please try again in a moment.")
+            self._per_user[user_key] = self._per_user.get(user_key, 0) + 1
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+
+        submitted = time.perf_counter()
+        try:
+            return self._executor.submit(self._run, user_key, submitted, fn, args, kwargs)
+        except RuntimeError:
+            self._release(user_key, failed=True)
+            raise
+
+    def _run(self, user_key, submitted, fn, args, kwargs):
+        with self._lock:
+            self._total_wait += time.perf_counter() - submitted
+        failed = False
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            failed = True
+            print(f"[chat] turn for {user_key} failed: {e}")
+        finally:
+            self._release(user_key, failed)
+
+    def _release(self, user_key, failed):
+        with self._lock:
+            remaining = self._per_user.get(user_key, 1) - 1
+            if remaining > 0:
+                self._per_user[user_key] = remaining
+            else:
+                self._per_user.pop(user_key, None)
+            self._in_flight -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: in_flight, queued, active_users, peak_in_flight, completed, failed,
+                  rejected_user, rejected_busy, avg_queue_wait_ms and the configured limits
+        """
+        with self._lock:
+            started = self.completed + self.failed
+            return {
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.max_workers),
+                "active_users": len(self._per_user),
+                "peak_in_flight": self.peak_in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected_user": self.rejected_user,
+                "rejected_busy": self.rejected_busy,
+                "avg_queue_wait_ms": round(self._total_wait / started * 1000, 3) if started else 0.0,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "per_user_limit": self.per_user_limit,
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_chat_pool = ChatWorkerPool(
+    max_workers=int(os.getenv("CHATBOT_CHAT_WORKERS", 16)),
+    per_user_limit=int(os.getenv("CHATBOT_CHAT_PER_USER", 2)),
+    max_pending=int(os.getenv("CHATBOT_CHAT_PENDING", 256)),
+)
+
+
+def get_chat_worker_pool():
+    """Return the process-wide chat worker pool."""
+    return _chat_pool
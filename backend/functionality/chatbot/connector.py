@@ -9,17 +9,40 @@ import os
 import json
 import calendar
 import re
+import threading
+import time
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
 from datetime import date, datetime, timedelta
+from types import SimpleNamespace
 from typing import Any, Dict, List, Optional, Tuple, Callable
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
 from data_access import DataAccess
+from .answer_templates import render_answer
+from .conversation_store import create_conversation_store
 from .embedding_helper import EmbeddingHelper
+from .http_pool import create_llm_http_pool
+from .intent_router import get_intent_router
+from .prompt_builder import create_prompt_builder, dump_tool_output
+from .tool_cache import CACHEABLE_TOOLS, get_tool_result_cache
+from .tool_executor import get_tool_executor
+from .query_embedding_cache import get_query_embedding_cache
+from .resilience import get_embedding_caller, get_llm_caller
+from .response_cache import get_response_cache
+from .stage_timer import StageTimer, get_stage_histograms, record_stage, timed_stage
 
 load_dotenv()
 
+# Streaming: deltas are coalesced into pieces of at least this many characters,
+# or whatever has arrived after this many seconds, whichever comes first
+STREAM_MIN_CHUNK_CHARS = int(os.getenv("CHATBOT_STREAM_MIN_CHARS", 24))
+STREAM_FLUSH_INTERVAL = float(os.getenv("CHATBOT_STREAM_FLUSH_INTERVAL", 0.05))
+
 # ---------------------------------------------------------------------
 # Security / Prompt-injection safeguards
 # ---------------------------------------------------------------------
@@ -41,9 +64,50 @@ _SPECIAL_CHARS = [
     "!", "@", "$", "%", "^", "*", "(", ")", "-", "_", '"', "'", ":", ";", "<", ">", "/", "\\", "~", "“", "”", "‘", "’",
 ]
 
-# Module-level memory storage (shared-ish)
-_short_term_memory: Dict[str, List[Dict[str, str]]] = {}
-_long_term_memory: Dict[str, str] = {}
+
+
+def _first_chars(parsed) -> Optional[set]:
+    """Characters a parsed regex must start with, or None when that isn't a fixed set."""
+    for op, av in parsed:
+        if op is sre_parse.AT:  # \b and friends consume nothing
+            continue
+        if op is sre_parse.LITERAL:
+            return {chr(av)}
+        if op is sre_parse.SUBPATTERN:
+            return _first_chars(av[-1])
+        if op is sre_parse.BRANCH:
+            branches = [_first_chars(branch) for branch in av[1]]
+            return None if None in branches else set().union(*branches)
+        if op is sre_parse.IN and all(item_op is sre_parse.LITERAL for item_op, _ in av):
+            return {chr(item_av) for _, item_av in av}
+        return None
+    return None
+
+
+def _compile_forbidden(patterns) -> re.Pattern:
+    """
+    One alternation for every forbidden pattern (case-insensitive). When every pattern
+    starts with a fixed set of characters, a lookahead on that set lets the scan skip
+    other positions without trying each alternative there; the set is derived from the
+    patterns, so it can't fall out of step with them.
+    """
+    first = set()
+    for pattern in patterns:
+        chars = _first_chars(sre_parse.parse(pattern.pattern, pattern.flags))
+        if chars is None:
+            first = None
+            break
+        first |= chars
+    # (?i:) on the lookahead too, so İ, ı, ſ and K match i, i, s and k as they do in the patterns
+    lookahead = f"(?=(?i:[{''.join(re.escape(c) for c in sorted(first))}]))" if first else ""
+    return re.compile(lookahead + "(?i:" + "|".join(f"(?:{p.pattern})" for p in patterns) + ")")
+
+
+# Single-pass forms of the above: one combined regex and a translate table deleting
+# every special character (one scan each instead of one per entry)
+_FORBIDDEN_RE = _compile_forbidden(_FORBIDDEN_PATTERNS)
+_SPECIAL_CHARS_TABLE = str.maketrans("", "", "".join(_SPECIAL_CHARS))
+_REPEATED_WHITESPACE = re.compile(r"\s\s+")
 
 # ---------------------------------------------------------------------
 # Shared system prompt
@@ -97,18 +161,86 @@ class ChatbotConnector:
       - process_message_stream(...) -> for sockets (new)
     """
 
-    def __init__(self):
+    def __init__(self, http_pool=None, memory=None):
+        """
+        Args:
+            http_pool (LLMHttpPool, optional): Keep-alive connection pool shared by the chat
+                and embedding clients; a new one is created when omitted
+            memory (optional): Conversation store; defaults to the CHATBOT_MEMORY_BACKEND store
+        """
         self.dao = DataAccess()
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
-        self.openai_client = OpenAI(api_key=api_key)
+        base_url = os.getenv("OPENAI_BASE_URL") or None
+        self.http_pool = http_pool or create_llm_http_pool()
+        # timeouts, retries and circuit breaking are done by the resilient callers below
+        self.openai_client = OpenAI(
+            api_key=api_key, base_url=base_url, http_client=self.http_pool.client, max_retries=0
+        )
+        self.llm_caller = get_llm_caller()
+        # process-wide cache of search text -> embedding, shared with the embedding helper
+        self.query_embedding_cache = get_query_embedding_cache()
         # keep embedding helper because we may need semantic search inside tools
-        self.embedding_helper = EmbeddingHelper(api_key)
+        self.embedding_helper = EmbeddingHelper(
+            api_key,
+            base_url=base_url,
+            cache=self.query_embedding_cache,
+            http_client=self.http_pool.client,
+            caller=get_embedding_caller(),
+        )
+        # local classifier that answers obvious requests without the tool-selection call
+        self.intent_router = get_intent_router()
+        # shared bounded pool so several tool calls in one turn run side by side
+        self.tool_executor = get_tool_executor()
+        # short-TTL per-user tool results, invalidated by DataAccess writes
+        self.tool_cache = get_tool_result_cache()
+        # general (no tool) answers reused for similar questions, e.g. platform FAQs
+        self.response_cache = get_response_cache()
+        # answer plain data lookups locally instead of with a second model call
+        self.use_answer_templates = os.getenv("CHATBOT_ANSWER_TEMPLATES", "1").strip().lower() not in (
+            "0", "false", "off", "no"
+        )
+
+        # bounded, expiring conversation memory (instance-scoped so tests don’t leak);
+        # the stores are thread-safe, so one connector can serve HTTP and socket threads
+        self.memory = memory if memory is not None else create_conversation_store()
+        # keeps prompts inside a token budget and records their sizes
+        self.prompt_builder = create_prompt_builder()
+        # per-stage latency of every turn; spans go to the client too when debugging
+        self.stage_metrics = get_stage_histograms()
+        self.debug_timings = os.getenv("CHATBOT_DEBUG_TIMINGS", "").strip().lower() in ("1", "true", "on", "yes")
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics for the LLM HTTP client."""
+        return self.http_pool.stats()
+
+    def prompt_stats(self) -> Dict[str, Any]:
+        """Estimated prompt sizes per model call site."""
+        return self.prompt_builder.stats()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Tool result, query embedding and general answer cache statistics."""
+        return {
+            "tool_results": self.tool_cache.stats(),
+            "query_embeddings": self.query_embedding_cache.stats(),
+            "responses": self.response_cache.stats() if self.response_cache is not None else None,
+        }
+
+    def stage_stats(self) -> Dict[str, Any]:
+        """Latency histograms per pipeline stage."""
+        return self.stage_metrics.stats()
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Retry, hedge and circuit breaker statistics for the LLM and embedding APIs."""
+        stats = {"llm": self.llm_caller.stats()}
+        embedding_caller = getattr(self.embedding_helper, "caller", None)
+        stats["embedding"] = embedding_caller.stats() if hasattr(embedding_caller, "stats") else None
+        return stats
 
-        # instance-scoped memory (so tests don’t leak)
-        self.short_term_memory: Dict[str, List[Dict[str, str]]] = {}
-        self.long_term_memory: Dict[str, str] = {}
+    def close(self):
+        """Release pooled HTTP connections."""
+        self.http_pool.close()
 
     def _sanitise_user_message(self, message: str) -> str:
         """Basic input sanitisation to reduce prompt-injection risks."""
@@ -119,15 +251,10 @@ class ChatbotConnector:
         if not trimmed:
             raise PromptInjectionError("Message rejected due to unsafe content.")
 
-        for pattern in _FORBIDDEN_PATTERNS:
-            if pattern.search(trimmed):
-                raise PromptInjectionError("Message rejected due to unsafe content.")
-
-        sanitised = trimmed
-        for char in _SPECIAL_CHARS:
-            sanitised = sanitised.replace(char, "")
+        if _FORBIDDEN_RE.search(trimmed):
+            raise PromptInjectionError("Message rejected due to unsafe content.")
 
-        sanitised = re.sub(r"\s{2,}", " ", sanitised).strip()
+        sanitised = _REPEATED_WHITESPACE.sub(" ", trimmed.translate(_SPECIAL_CHARS_TABLE)).strip()
 
         if not sanitised:
             raise PromptInjectionError("Message rejected due to unsafe content.")
@@ -141,55 +268,84 @@ class ChatbotConnector:
         self,
         user_message: str,
         user_email: Optional[str] = None,
+        timings: Optional[dict] = None,
     ) -> Tuple[str, str, Optional[List[dict]], Optional[List[dict]], Optional[List[dict]], Optional[List[dict]]]:
         """
         Processes the user message using tool calling.
         This is the non-streaming version (for your current /api/chatbot/chat).
         Returns 6 values:
         (response_text, category, events, teams, badges, team_events)
+        timings (dict, optional): filled with the turn's stage timings (StageTimer.report())
         """
-        messages = self._prepare_messages(user_message, user_email)
-
-        # 4) First call: let the model decide whether to call a tool
+        timer = StageTimer("http")
         try:
-            first_response = self.openai_client.chat.completions.create(
-                model="gpt-5-nano",
-                messages=messages,
-                tools=self._get_tools(),
-                tool_choice="auto",  # let model decide
-            )
-        except Exception as e:
-            print(f"OpenAI API error (first call): {e}")
-            return (
-                "Sorry, I'm having trouble processing your request right now.",
-                "general",
-                None,
-                None,
-                None,
-                None,
-            )
+            with timer.activate():
+                return self._process_message(user_message, user_email)
+        finally:
+            self.stage_metrics.record(timer)
+            if timings is not None:
+                timings.update(timer.report())
+
+    def _process_message(self, user_message: str, user_email: Optional[str]):
+        with timed_stage("prepare_messages"):
+            messages = self._prepare_messages(user_message, user_email)
 
-        if not first_response or not first_response.choices:
-            return (
-                "Sorry, I received an unexpected response from the AI.",
-                "general",
-                None,
-                None,
-                None,
-                None,
-            )
+        # 4) Obvious requests skip the first call entirely
+        routed = self._route_intent(messages[-1]["content"], user_email)
+        if routed:
+            assistant_msg, tool_calls = routed
+        else:
+            # A FAQ answered before needs no model call at all
+            cached_answer = self._cached_general_answer(messages[-1]["content"])
+            if cached_answer is not None:
+                if user_email:
+                    self._add_to_conversation_history(user_email, "assistant", cached_answer)
+                return cached_answer, "general", None, None, None, None
+
+            # First call: let the model decide whether to call a tool
+            # (prompt size is recorded by _prepare_messages)
+            try:
+                with timed_stage("llm_tool_selection"):
+                    first_response = self._create_completion(
+                        model="gpt-5-nano",
+                        messages=messages,
+                        tools=self._get_tools(),
+                        tool_choice="auto",  # let model decide
+                    )
+            except Exception as e:
+                print(f"OpenAI API error (first call): {e}")
+                return (
+                    "Sorry, I'm having trouble processing your request right now.",
+                    "general",
+                    None,
+                    None,
+                    None,
+                    None,
+                )
 
-        assistant_msg = first_response.choices[0].message
+            if not first_response or not first_response.choices:
+                return (
+                    "Sorry, I received an unexpected response from the AI.",
+                    "general",
+                    None,
+                    None,
+                    None,
+                    None,
+                )
 
-        # If the model did NOT call a tool → just return its answer
-        if not getattr(assistant_msg, "tool_calls", None):
-            final_text = assistant_msg.content.strip() if assistant_msg.content else "Done."
-            if user_email:
-                self._add_to_conversation_history(user_email, "assistant", final_text)
-            return final_text, "general", None, None, None, None
+            assistant_msg = first_response.choices[0].message
 
-        # 5) If we're here, the model asked to call one or more tools
-        tool_calls = assistant_msg.tool_calls
+            # If the model did NOT call a tool → just return its answer
+            if not getattr(assistant_msg, "tool_calls", None):
+                final_text = assistant_msg.content.strip() if assistant_msg.content else "Done."
+                if assistant_msg.content:
+                    self._remember_general_answer(messages, final_text, user_email)
+                if user_email:
+                    self._add_to_conversation_history(user_email, "assistant", final_text)
+                return final_text, "general", None, None, None, None
+            tool_calls = assistant_msg.tool_calls
+
+        # 5) If we're here, the model (or the router) asked to call one or more tools
         tool_outputs_for_model, results = self._execute_and_categorize_tools(tool_calls, user_email)
         events_result = results["events"]
         teams_result = results["teams"]
@@ -197,21 +353,25 @@ class ChatbotConnector:
         team_events_result = results["team_events"]
         detected_category = results["category"]
 
-        # 6) Second call: let the model phrase the answer
-        try:
-            second_messages = messages + [assistant_msg] + tool_outputs_for_model
-            second_response = self.openai_client.chat.completions.create(
-                model="gpt-4.1-nano",
-                messages=second_messages,
-            )
-            final_text = (
-                second_response.choices[0].message.content.strip()
-                if second_response and second_response.choices
-                else "Done."
-            )
-        except Exception as e:
-            print(f"OpenAI API error (second call): {e}")
-            final_text = "Here are the details you asked for."
+        # 6) Second call: let the model phrase the answer (data-only lookups use a template)
+        final_text = self._templated_answer(messages, results)
+        if final_text is None:
+            try:
+                second_messages = messages + [assistant_msg] + tool_outputs_for_model
+                self.prompt_builder.record("answer", second_messages)
+                with timed_stage("llm_answer"):
+                    second_response = self._create_completion(
+                        model="gpt-4.1-nano",
+                        messages=second_messages,
+                    )
+                final_text = (
+                    second_response.choices[0].message.content.strip()
+                    if second_response and second_response.choices
+                    else "Done."
+                )
+            except Exception as e:
+                print(f"OpenAI API error (second call): {e}")
+                final_text = self._fallback_answer(messages, results)
 
         # 7) Store assistant reply
         if user_email:
@@ -236,16 +396,39 @@ class ChatbotConnector:
     user_email: str | None,
     emit_fn,
     room: str | None = None,
+    cancel_event=None,
     ):
         """
         Streaming version for socket use.
         - Lets the model decide whether to call a tool (like get_my_events)
         - If a tool is called → execute it, show results fast
         - If no tool is called → respond directly
-        - Streams text progressively to improve UX
+        - Streams the second completion token by token as it is generated
+        - cancel_event (threading.Event, optional): set it to stop generation early
+          (e.g. when the client disconnects)
+        - With CHATBOT_DEBUG_TIMINGS the final "done" payload carries the stage timings
         """
+        timer = StageTimer("stream")
+
+        def timed_emit(event_name, data, **kwargs):
+            if self.debug_timings and data.get("done"):
+                data = dict(data, timings=timer.report())
+            started = time.perf_counter()
+            try:
+                emit_fn(event_name, data, **kwargs)
+            finally:
+                timer.accumulate("emit", time.perf_counter() - started)
+
         try:
-            messages = self._prepare_messages(user_message, user_email)
+            with timer.activate():
+                self._process_message_stream(user_message, user_email, timed_emit, room, cancel_event)
+        finally:
+            self.stage_metrics.record(timer)
+
+    def _process_message_stream(self, user_message, user_email, emit_fn, room, cancel_event):
+        try:
+            with timed_stage("prepare_messages"):
+                messages = self._prepare_messages(user_message, user_email)
         except PromptInjectionError:
             rejection_payload = {
                 "response": "Sorry, I can't process that request.",
@@ -261,69 +444,96 @@ class ChatbotConnector:
 
         detected_category = "general"
 
-        # ---------------- First model call ----------------
-        # The model decides if a tool (function) should be called
-        try:
-            first_response = self.openai_client.chat.completions.create(
-                model="gpt-4.1-nano",
-                messages=messages,
-                tools=self._get_tools(),
-                tool_choice="auto",  # Let the model decide automatically
-            )
-        except Exception:
-            # Handle API or connection errors gracefully
-            err_payload = {
-                "response": "Sorry, I couldn't process that right now.",
-                "category": "general",
-                "done": True,
-                "stream": True,
-            }
-            if room:
-                emit_fn("chatbot_response", err_payload, room=room)
-            else:
-                emit_fn("chatbot_response", err_payload)
-            return
-
-        # Handle empty/invalid responses
-        if not first_response or not first_response.choices:
-            done_payload = {
-                "response": "Sorry, I received an empty response.",
-                "category": "general",
-                "done": True,
-                "stream": True,
-            }
-            if room:
-                emit_fn("chatbot_response", done_payload, room=room)
-            else:
-                emit_fn("chatbot_response", done_payload)
-            return
-
-        assistant_msg = first_response.choices[0].message
-
-        # ---------------- CASE 1: No tool called ----------------
-        # For general chat or conceptual platform questions
-        if not getattr(assistant_msg, "tool_calls", None):
-            final_text = (assistant_msg.content or "").strip() or "Okay."
-            payload = {
-                "response": final_text,
-                "category": "general",
-                "done": True,
-                "stream": True,
-                "final_text": final_text,
-            }
-            if room:
-                emit_fn("chatbot_response", payload, room=room)
-            else:
-                emit_fn("chatbot_response", payload)
+        # ---------------- Local intent routing ----------------
+        # Obvious requests skip the first model call entirely
+        routed = self._route_intent(messages[-1]["content"], user_email)
+        if routed:
+            assistant_msg, tool_calls = routed
+        else:
+            # ---------------- Cached FAQ answer ----------------
+            cached_answer = self._cached_general_answer(messages[-1]["content"])
+            if cached_answer is not None:
+                payload = {
+                    "response": cached_answer,
+                    "category": "general",
+                    "done": True,
+                    "stream": True,
+                    "final_text": cached_answer,
+                }
+                if room:
+                    emit_fn("chatbot_response", payload, room=room)
+                else:
+                    emit_fn("chatbot_response", payload)
+                if user_email:
+                    self._add_to_conversation_history(user_email, "assistant", cached_answer)
+                return
+
+            # ---------------- First model call ----------------
+            # The model decides if a tool (function) should be called
+            try:
+                with timed_stage("llm_tool_selection"):
+                    first_response = self._create_completion(
+                        model="gpt-4.1-nano",
+                        messages=messages,
+                        tools=self._get_tools(),
+                        tool_choice="auto",  # Let the model decide automatically
+                    )
+            except Exception:
+                # Handle API or connection errors gracefully
+                err_payload = {
+                    "response": "Sorry, I couldn't process that right now.",
+                    "category": "general",
+                    "done": True,
+                    "stream": True,
+                }
+                if room:
+                    emit_fn("chatbot_response", err_payload, room=room)
+                else:
+                    emit_fn("chatbot_response", err_payload)
+                return
+
+            # Handle empty/invalid responses
+            if not first_response or not first_response.choices:
+                done_payload = {
+                    "response": "Sorry, I received an empty response.",
+                    "category": "general",
+                    "done": True,
+                    "stream": True,
+                }
+                if room:
+                    emit_fn("chatbot_response", done_payload, room=room)
+                else:
+                    emit_fn("chatbot_response", done_payload)
+                return
+
+            assistant_msg = first_response.choices[0].message
+
+            # ---------------- CASE 1: No tool called ----------------
+            # For general chat or conceptual platform questions
+            if not getattr(assistant_msg, "tool_calls", None):
+                final_text = (assistant_msg.content or "").strip() or "Okay."
+                if assistant_msg.content:
+                    self._remember_general_answer(messages, final_text, user_email)
+                payload = {
+                    "response": final_text,
+                    "category": "general",
+                    "done": True,
+                    "stream": True,
+                    "final_text": final_text,
+                }
+                if room:
+                    emit_fn("chatbot_response", payload, room=room)
+                else:
+                    emit_fn("chatbot_response", payload)
 
-            # Save assistant reply in memory
-            if user_email:
-                self._add_to_conversation_history(user_email, "assistant", final_text)
-            return
+                # Save assistant reply in memory
+                if user_email:
+                    self._add_to_conversation_history(user_email, "assistant", final_text)
+                return
+            tool_calls = assistant_msg.tool_calls
 
         # ---------------- CASE 2: Tool(s) called ----------------
-        # The model wants to retrieve or search data via one of our defined tools
-        tool_calls = assistant_msg.tool_calls
+        # The model (or the router) wants to retrieve or search data via our tools
         tool_outputs_for_model, results = self._execute_and_categorize_tools(tool_calls, user_email)
         events_result = results["events"]
         teams_result = results["teams"]
@@ -352,25 +562,9 @@ class ChatbotConnector:
             emit_fn("chatbot_response", partial_payload)
 
         # ---------------- Second model call ----------------
-        # Now the model writes the natural-language summary based on tool results
-        try:
-            second_messages = messages + [assistant_msg] + tool_outputs_for_model
-            second_response = self.openai_client.chat.completions.create(
-                model="gpt-4.1-nano",
-                messages=second_messages,
-            )
-            final_text = (
-                second_response.choices[0].message.content.strip()
-                if second_response and second_response.choices
-                else "Here are the details you asked for."
-            )
-        except Exception:
-            final_text = "Here are the details you asked for."
-
-        # Stream the text back in small chunks for a typing effect
-        chunk_size = 30
-        for i in range(0, len(final_text), chunk_size):
-            piece = final_text[i : i + chunk_size]
+        # Now the model writes the natural-language summary based on tool results,
+        # forwarding tokens to the client as they are generated
+        def emit_piece(piece: str):
             piece_payload = {
                 "response": piece,
                 "category": detected_category,
@@ -381,6 +575,21 @@ class ChatbotConnector:
             else:
                 emit_fn("chatbot_response", piece_payload)
 
+        final_text = self._templated_answer(messages, results)
+        cancelled = False
+        if final_text is not None:
+            # data-only lookup: the reply is built locally, no second model call
+            emit_piece(final_text)
+        else:
+            second_messages = messages + [assistant_msg] + tool_outputs_for_model
+            self.prompt_builder.record("answer_stream", second_messages)
+            final_text, cancelled = self._stream_completion(
+                second_messages,
+                emit_piece,
+                cancel_event=cancel_event,
+                fallback_text=self._fallback_answer(messages, results),
+            )
+
         # Send a final "done" signal so frontend stops loading
         done_payload = {
             "response": None,
@@ -389,15 +598,196 @@ class ChatbotConnector:
             "stream": True,
             "final_text": final_text,
         }
+        if cancelled:
+            done_payload["cancelled"] = True
         if room:
             emit_fn("chatbot_response", done_payload, room=room)
         else:
             emit_fn("chatbot_response", done_payload)
 
         # Save assistant message to memory for context continuity
-        if user_email:
+        if user_email and final_text:
             self._add_to_conversation_history(user_email, "assistant", final_text)
 
+    def _route_intent(self, message: str, user_email: Optional[str]):
+        """
+        Ask the local intent router for a confident tool call.
+
+        Returns:
+            (assistant_msg, tool_calls) shaped like the first model call's output, or
+            None when the router is disabled or unsure
+        """
+        if self.intent_router is None:
+            return None
+        try:
+            with timed_stage("intent_router"):
+                match = self.intent_router.route(message, user_email)
+        except Exception as e:
+            print(f"Intent router error: {e}")
+            return None
+        if match is None:
+            return None
+
+        call_id = f"route_{match.tool_name}"
+        arguments = json.dumps(match.arguments)
+        # dict form goes back to the model in the second call; objects feed tool execution
+        assistant_msg = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": match.tool_name, "arguments": arguments},
+                }
+            ],
+        }
+        tool_calls = [
+            SimpleNamespace(
+                id=call_id,
+                function=SimpleNamespace(name=match.tool_name, arguments=arguments),
+            )
+        ]
+        return assistant_msg, tool_calls
+
+    def _cached_general_answer(self, message: str) -> Optional[str]:
+        """Stored answer to a similar general question, or None."""
+        if self.response_cache is None:
+            return None
+        with timed_stage("response_cache"):
+            return self.response_cache.get(message)
+
+    def _remember_general_answer(self, messages: List[dict], answer: str, user_email: Optional[str]):
+        """
+        Cache a no-tool answer unless it is personalized for this user. Only answers
+        to a standalone question (system prompt plus the question, no earlier turns
+        or summary) are stored: with history in the prompt the answer may depend on
+        it ("and in Manchester?").
+        """
+        if self.response_cache is None or len(messages) != 2:
+            return
+        message = messages[-1]["content"]
+        personal_terms = []
+        if user_email:
+            personal_terms = [user_email, user_email.split("@")[0], self.memory.get_value(user_email, "first_name")]
+        self.response_cache.put(message, answer, personal_terms=personal_terms)
+
+    def _templated_answer(self, messages: List[dict], results: Dict[str, Any]) -> Optional[str]:
+        """Locally rendered reply for a data-only lookup, or None when the model should answer."""
+        if not self.use_answer_templates:
+            return None
+        with timed_stage("answer_template"):
+            return render_answer(messages[-1]["content"], results.get("tool_results", []))
+
+    def _fallback_answer(self, messages: List[dict], results: Dict[str, Any]) -> str:
+        """Reply used when the answer completion fails: the data-only template if there is one."""
+        try:
+            answer = render_answer(messages[-1]["content"], results.get("tool_results", []), force=True)
+        except Exception as e:
+            print(f"Fallback answer error: {e}")
+            answer = None
+        return answer or "Here are the details you asked for."
+
+    def _create_completion(self, stream: bool = False, **kwargs):
+        """
+        Chat completion through the LLM caller (per-attempt timeout, deadline, retries
+        on transient errors, circuit breaker). A streamed completion is read under the
+        same deadline and breaker (ResilientCaller.call_stream).
+
+        Raises:
+            CircuitOpenError: The LLM API is failing and the circuit is open
+            Exception: The final attempt's error
+        """
+        def create(timeout):
+            return self.openai_client.chat.completions.create(timeout=timeout, **kwargs)
+
+        if stream:
+            # never hedged: a second stream would generate (and bill) the answer twice
+            kwargs["stream"] = True
+            return self.llm_caller.call_stream(create)
+        return self.llm_caller.call(create)
+
+    def _stream_completion(
+        self,
+        messages: List[dict],
+        emit_piece: Callable[[str], None],
+        cancel_event=None,
+        fallback_text: str = "Done.",
+        model: str = "gpt-4.1-nano",
+    ) -> Tuple[str, bool]:
+        """
+        Run a chat completion with stream=True and forward text deltas via emit_piece.
+
+        The first delta is emitted immediately so time-to-first-token is one network
+        round trip. After that, deltas are coalesced until STREAM_MIN_CHUNK_CHARS have
+        built up or STREAM_FLUSH_INTERVAL has passed, so a slow consumer (emit_fn
+        blocks while the socket drains) receives fewer, larger pieces instead of
+        falling behind token by token.
+
+        Returns:
+            (final_text, cancelled)
+        """
+        parts: List[str] = []
+        pending: List[str] = []
+        pending_chars = 0
+        last_flush = time.monotonic()
+        cancelled = False
+        stream = None
+        started = time.perf_counter()
+
+        def flush():
+            nonlocal pending, pending_chars, last_flush
+            if pending:
+                emit_piece("".join(pending))
+                pending = []
+                pending_chars = 0
+            last_flush = time.monotonic()
+
+        try:
+            stream = self._create_completion(
+                model=model,
+                messages=messages,
+                stream=True,
+            )
+            for chunk in stream:
+                if cancel_event is not None and cancel_event.is_set():
+                    cancelled = True
+                    break
+                choices = getattr(chunk, "choices", None)
+                if not choices:
+                    continue
+                delta = getattr(choices[0].delta, "content", None)
+                if not delta:
+                    continue
+                first = not parts
+                if first:
+                    record_stage("llm_first_token", started, time.perf_counter() - started)
+                parts.append(delta)
+                pending.append(delta)
+                pending_chars += len(delta)
+                if (
+                    first
+                    or pending_chars >= STREAM_MIN_CHUNK_CHARS
+                    or time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL
+                ):
+                    flush()
+        except Exception as e:
+            print(f"OpenAI API error (streamed call): {e}")
+        finally:
+            if stream is not None and hasattr(stream, "close"):
+                # Stop reading the HTTP response (after a cancel or an error) so the
+                # model stops generating for us
+                stream.close()
+
+        if not cancelled:
+            flush()
+        record_stage("llm_answer_stream", started, time.perf_counter() - started)
+
+        final_text = "".join(parts).strip()
+        if not final_text and not cancelled:
+            final_text = fallback_text
+            emit_piece(final_text)
+        return final_text, cancelled
 
     # ======================================================================
     # TOOL DEFINITIONS
@@ -528,19 +918,48 @@ class ChatbotConnector:
     # TOOL EXECUTION
     # ======================================================================
 
+    def _registered_event_ids(self, user_email: str) -> set:
+        """IDs of events the user is registered for, individually or through a team."""
+        try:
+            with timed_stage("db.registered_event_ids"):
+                return self.dao.get_registered_event_ids(user_email)
+        except Exception as e:
+            print(f"Error loading user's registered events: {e}")
+            return set()
+
     def _execute_tool_call(self, tool_name: str, arguments: dict, user_email: Optional[str]) -> dict:
         """
         Executes the tool by name and returns a dict with:
         {"type": "events|teams|badges|impact|team_events", "data": [...] or {...}}
+        Per-user results of CACHEABLE_TOOLS are served from the tool result cache.
         """
+        cacheable = bool(user_email) and tool_name in CACHEABLE_TOOLS
+        if cacheable:
+            cached = self.tool_cache.get(user_email, tool_name, arguments)
+            if cached is not None:
+                return cached
+
         # Helper to get user_id
         user_id = None
         if user_email:
             try:
-                user_id = self.dao.get_user_id_by_email(user_email)
+                with timed_stage("db.user_id"):
+                    user_id = self.dao.get_user_id_by_email(user_email)
             except Exception as e:
                 print(f"Error getting user_id for {user_email}: {e}")
 
+        # the tool's own DB queries (and embedding call, timed separately too)
+        with timed_stage(f"tool.{tool_name}"):
+            result = self._run_tool_call(tool_name, arguments, user_email, user_id)
+        # only cache real answers (an unknown user_id means the lookup failed)
+        if cacheable and user_id:
+            self.tool_cache.put(user_email, tool_name, arguments, result, user_id=user_id)
+        return result
+
+    def _run_tool_call(
+        self, tool_name: str, arguments: dict, user_email: Optional[str], user_id: Optional[int]
+    ) -> dict:
+        """Run a tool against the DAO (uncached)."""
         # 1) get_my_upcoming_events
         if tool_name == "get_my_upcoming_events":
             if not user_id:
@@ -548,7 +967,11 @@ class ChatbotConnector:
             limit = int(arguments.get("limit", 5))
             events = self.dao.get_upcoming_events(user_id, limit=limit) or []
             normalized = [self._normalize_event(e) for e in events]
-            return {"type": "events", "data": normalized}
+            result = {"type": "events", "data": normalized}
+            if len(events) >= limit:
+                # the list was cut at `limit`; answers should quote the real count
+                result["total"] = self.dao.get_upcoming_events_count(user_id)
+            return result
 
         # 1b) get_my_completed_events
         if tool_name == "get_my_completed_events":
@@ -557,7 +980,10 @@ class ChatbotConnector:
             limit = int(arguments.get("limit", 50))
             events = self.dao.get_completed_events(user_id, limit=limit) or []
             normalized = [self._normalize_event(e) for e in events]
-            return {"type": "events", "data": normalized}
+            result = {"type": "events", "data": normalized}
+            if len(events) >= limit:
+                result["total"] = self.dao.get_completed_events_count(user_id)
+            return result
 
         # 2) search_events
         if tool_name == "search_events":
@@ -581,60 +1007,39 @@ class ChatbotConnector:
 
             events: List[dict] = []
 
+            # user's own and team registrations are left out of recommendations
+            # inside the retrieval step, so `limit` eligible events come back
+            query_embedding = None
+            if use_semantic and keyword:
+                with timed_stage("embedding"):
+                    query_embedding = self.embedding_helper.generate_embedding(keyword)
+                if query_embedding is None:
+                    # embeddings unavailable (error, timeout or open circuit): keyword search instead
+                    use_semantic = False
+
             if use_semantic:
-                query_text = keyword or ""
-                query_embedding = self.embedding_helper.generate_embedding(query_text)
-                events = self.dao.search_events_with_embeddings(
+                registered_ids = self._registered_event_ids(user_email) if user_email else set()
+                # One hybrid pass: keyword + vector ranking with filters applied in the index
+                events = self.dao.search_events_hybrid(
+                    query_text=keyword or "",
                     query_embedding=query_embedding,
                     location=location,
                     limit=limit,
                     similarity_threshold=0.3 if not (start_date or end_date) else 0.05,
                     start_date=start_date,
                     end_date=end_date,
+                    exclude_ids=registered_ids,
                 )
-                if not events:
-                    events = self.dao.get_filtered_events(
-                        keyword=keyword,
-                        location=location,
-                        start_date=start_date,
-                        end_date=end_date,
-                    )
             else:
                 events = self.dao.get_filtered_events(
                     keyword=keyword,
                     location=location,
                     start_date=start_date,
                     end_date=end_date,
+                    exclude_user_email=user_email,
+                    limit=limit,
                 )
 
-            # filter out user's own registered events and team registered events from recommendations
-            if user_email and events:
-                try:
-                    # Get user's individual event registrations
-                    user_event_ids = self.dao.get_user_events(user_email) or []
-                    registered_ids = {
-                        (row[0] if isinstance(row, tuple) else row)
-                        for row in user_event_ids
-                    }
-                    
-                    # Get events that user's teams are registered to
-                    team_events = self.dao.get_team_events(user_email) or []
-                    for team_event in team_events:
-                        team_event_id = team_event.get("ID") or team_event.get("id")
-                        if team_event_id:
-                            registered_ids.add(int(team_event_id))
-                    
-                    # Filter out registered events
-                    filtered = []
-                    for ev in events:
-                        ev_id = ev.get("ID") or ev.get("id")
-                        if ev_id and int(ev_id) in registered_ids:
-                            continue
-                        filtered.append(ev)
-                    events = filtered
-                except Exception as e:
-                    print(f"Error filtering out user's registered events: {e}")
-
             events = events[:limit]
             normalized = [self._normalize_event(e) for e in events]
             return {"type": "events", "data": normalized}
@@ -735,28 +1140,23 @@ class ChatbotConnector:
     # ======================================================================
 
     def _add_to_conversation_history(self, user_email: str, role: str, message: str):
-        """Add a message to short-term memory (kept in RAM for context)."""
-        if user_email not in self.short_term_memory:
-            self.short_term_memory[user_email] = []
-        self.short_term_memory[user_email].append({"role": role, "content": message})
-        if len(self.short_term_memory[user_email]) > 10:
-            self.short_term_memory[user_email] = self.short_term_memory[user_email][-10:]
+        """Add a message to the user's conversation (trimmed to the store's token budget)."""
+        self.memory.append(user_email, role, message)
 
     def _get_conversation_history(self, user_email: str) -> List[Dict[str, str]]:
-        """Retrieve the last few messages for context."""
-        if user_email not in self.short_term_memory:
-            return []
-        return self.short_term_memory[user_email][-10:]
+        """Retrieve the recent messages for context."""
+        return self.memory.history(user_email)
 
     def _get_user_first_name(self, user_email: str) -> Optional[str]:
         """Fetch and cache the user's first name for personalization."""
-        if user_email in self.long_term_memory:
-            return self.long_term_memory[user_email]
+        cached = self.memory.get_value(user_email, "first_name")
+        if cached:
+            return cached
         try:
             user = self.dao.get_user_by_email(user_email)
             if user and user.get("FirstName"):
                 first_name = user["FirstName"]
-                self.long_term_memory[user_email] = first_name
+                self.memory.set_value(user_email, "first_name", first_name)
                 return first_name
         except Exception as e:
             print(f"Error fetching user first name: {e}")
@@ -771,57 +1171,87 @@ class ChatbotConnector:
         """
         Prepare messages list with sanitization, history, and system prompt.
         Shared between process_message and process_message_stream.
+        Recent turns are sent verbatim, older ones summarized, within the prompt budget.
         """
-        sanitised_message = self._sanitise_user_message(user_message)
+        with timed_stage("sanitize"):
+            sanitised_message = self._sanitise_user_message(user_message)
 
-        # Store user message in short-term memory
-        if user_email:
-            self._add_to_conversation_history(user_email, "user", sanitised_message)
+        with timed_stage("history"):
+            # History before this message (so the current message isn't sent twice)
+            history = self._get_conversation_history(user_email) if user_email else []
 
-        # Personalization
-        user_first_name = self._get_user_first_name(user_email) if user_email else None
+            # Store user message in short-term memory
+            if user_email:
+                self._add_to_conversation_history(user_email, "user", sanitised_message)
 
-        # Build base messages (system + history + user)
-        messages = [
-            {"role": "system", "content": self._build_system_prompt(user_first_name)}
-        ]
-        if user_email:
-            history = self._get_conversation_history(user_email)
-            messages.extend(history)
-        messages.append({"role": "user", "content": sanitised_message})
-        
-        return messages
+        # Personalization
+        with timed_stage("user_profile"):
+            user_first_name = self._get_user_first_name(user_email) if user_email else None
+
+        # Build base messages (system + summary + recent history + user)
+        with timed_stage("prompt_build"):
+            return self.prompt_builder.build(
+                self._build_system_prompt(user_first_name),
+                history,
+                sanitised_message,
+                call="tool_selection",
+            )
 
     def _execute_and_categorize_tools(
         self, tool_calls: List, user_email: Optional[str]
     ) -> Tuple[List[dict], Dict[str, Any]]:
         """
         Execute tool calls and categorize results.
+        Independent calls run concurrently on the shared tool executor; results are
+        merged in the order the model asked for them.
         Returns (tool_outputs_for_model, results_dict) where results_dict contains:
-        {"events": [], "teams": [], "badges": [], "team_events": [], "category": "general"}
+        {"events": [], "teams": [], "badges": [], "team_events": [], "category": "general",
+         "tool_results": [(tool_name, result or None if it failed), ...]}
         """
         tool_outputs_for_model = []
+        tool_results: List[Tuple[str, Optional[dict]]] = []
         events_result: List[dict] = []
         teams_result: List[dict] = []
         badges_result: List[dict] = []
         team_events_result: List[dict] = []
         detected_category = "general"
 
+        calls = []
         for tool_call in tool_calls:
-            tool_name = tool_call.function.name
             try:
                 tool_args = json.loads(tool_call.function.arguments or "{}")
             except (json.JSONDecodeError, Exception):
                 tool_args = {}
+            calls.append((tool_call.function.name, tool_args))
 
-            exec_result = self._execute_tool_call(tool_name, tool_args, user_email)
+        with timed_stage("tools"):
+            outcomes = self.tool_executor.run_all(
+                lambda name, args: self._execute_tool_call(name, args, user_email), calls
+            )
 
-            # For the model: we pass the raw data as JSON (stringify everything)
+        for tool_call, outcome in zip(tool_calls, outcomes):
+            tool_results.append((outcome["tool"], None if outcome["error"] else outcome["result"]))
+            if outcome["error"]:
+                print(f"Tool {outcome['tool']} failed ({outcome['error']}) after {outcome['elapsed']:.2f}s")
+                # every tool_call_id still needs an answer for the second model call
+                tool_outputs_for_model.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "content": json.dumps({"error": "This information is unavailable right now."}),
+                    }
+                )
+                continue
+            exec_result = outcome["result"] or {}
+
+            # For the model: a compact JSON view with just the fields it needs
             tool_outputs_for_model.append(
                 {
                     "role": "tool",
                     "tool_call_id": tool_call.id,
-                    "content": json.dumps(exec_result.get("data", []), default=str),
+                    "content": dump_tool_output(
+                        exec_result.get("type"), exec_result.get("data", []), total=exec_result.get("total")
+                    ),
                 }
             )
 
@@ -847,6 +1277,7 @@ class ChatbotConnector:
             "badges": badges_result,
             "team_events": team_events_result,
             "category": detected_category,
+            "tool_results": tool_results,
         }
         return tool_outputs_for_model, results
 
@@ -1079,7 +1510,7 @@ class ChatbotConnector:
     # ======================================================================
     def get_ai_response(self, prompt: str) -> str:
         try:
-            response = self.openai_client.chat.completions.create(
+            response = self._create_completion(
                 model="gpt-4.1-nano", messages=[{"role": "user", "content": prompt}]
             )
             if response and response.choices and len(response.choices) > 0:
@@ -1089,4 +1520,35 @@ class ChatbotConnector:
             return "Sorry, I received an unexpected response from the AI. Please try again."
         except Exception as e:
             print(f"OpenAI API error: {e}")
-            return "Sorry, I'm having trouble processing your request right now."
\ No newline at end of file
+            return "Sorry, I'm having trouble processing your request right now."
+
+
+# ---------------------------------------------------------------------
+# Process-wide connector
+# ---------------------------------------------------------------------
+_shared_connector: Optional[ChatbotConnector] = None
+_shared_connector_lock = threading.Lock()
+
+
+def get_chatbot_connector() -> ChatbotConnector:
+    """
+    Return the connector shared by the HTTP routes and the Socket.IO handlers.
+    Created on first use so conversation memory and warm LLM connections persist
+    across requests.
+    """
+    global _shared_connector
+    if _shared_connector is None:
+        with _shared_connector_lock:
+            if _shared_connector is None:
+                _shared_connector = ChatbotConnector()
+    return _shared_connector
+
+
+def close_chatbot_connector():
+    """Close the shared connector's connections; the next call to get_chatbot_connector builds a new one."""
+    global _shared_connector
+    with _shared_connector_lock:
+        connector, _shared_connector = _shared_connector, None
+    if connector is not None:
+        connector.close()
+    get_query_embedding_cache().close()
@@ -0,0 +1,318 @@
+"""
+Conversation Store
+Bounded, expiring chatbot memory: the recent messages of each user's
+conversation plus small per-user values (e.g. first name).
+
+Backends:
+- memory: in-process LRU with idle TTL; at most max_users conversations are
+          resident, the least recently active is evicted first
+- sqlite: a SQLite file shared by every worker on the host, so a user's
+          conversation follows them between HTTP and socket workers
+
+Both trim each conversation to a token budget (oldest messages go first)
+rather than a fixed message count.
+
+Configured with CHATBOT_MEMORY_BACKEND ("memory" or "sqlite"),
+CHATBOT_MEMORY_PATH, CHATBOT_MEMORY_MAX_USERS, CHATBOT_MEMORY_TTL (seconds),
+CHATBOT_MEMORY_MAX_TOKENS and CHATBOT_MEMORY_MAX_MESSAGES.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .token_counter import count_tokens
+
+DEFAULT_MAX_USERS = 5000
+DEFAULT_TTL_SECONDS = 2 * 60 * 60
+DEFAULT_MAX_TOKENS = 1500
+DEFAULT_MAX_MESSAGES = 10
+
+
+class _Conversation:
+    __slots__ = ("messages", "tokens", "values", "touched")
+
+    def __init__(self, now):
+        self.messages = deque()  # (role, content, tokens)
+        self.tokens = 0
+        self.values = {}
+        self.touched = now
+
+
+class InMemoryConversationStore:
+    """Thread-safe per-process LRU/TTL conversation store"""
+
+    def __init__(self, max_users=DEFAULT_MAX_USERS, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_tokens=DEFAULT_MAX_TOKENS, max_messages=DEFAULT_MAX_MESSAGES, clock=time.monotonic):
+        """
+        Args:
+            max_users (int): Conversations kept resident; least recently active evicted first
+            ttl_seconds (float): Conversations idle longer than this are dropped
+            max_tokens (int): Token budget per conversation
+            max_messages (int): Hard cap on messages per conversation
+            clock (callable): Time source (monotonic seconds)
+        """
+        self.max_users = max(1, int(max_users))
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_tokens = int(max_tokens)
+        self.max_messages = max(1, int(max_messages))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conversations = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._conversations)
+
+    def _expire_locked(self, now):
+        # LRU order is also idle order, so expired conversations sit at the front
+        while self._conversations:
+            key, conversation = next(iter(self._conversations.items()))
+            if now - conversation.touched <= self.ttl_seconds:
+                break
+            del self._conversations[key]
+            self.expirations += 1
+
+    def _get_locked(self, user_key, create):
+        now = self._clock()
+        self._expire_locked(now)
+        conversation = self._conversations.get(user_key)
+        if conversation is None:
+            if not create:
+                return None
+            conversation = self._conversations[user_key] = _Conversation(now)
+            while len(self._conversations) > self.max_users:
+                self._conversations.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._conversations.move_to_end(user_key)
+        conversation.touched = now
+        return conversation
+
+    def append(self, user_key, role, content):
+        """Add a message and trim the conversation to its budget."""
+        tokens = count_tokens(content)
+        with self._lock:
+            conversation = self._get_locked(user_key, create=True)
+            conversation.messages.append((role, content, tokens))
+            conversation.tokens += tokens
+            # always keep the newest message, even if it alone is over budget
+            while len(conversation.messages) > 1 and (
+                conversation.tokens > self.max_tokens or len(conversation.messages) > self.max_messages
+            ):
+                conversation.tokens -= conversation.messages.popleft()[2]
+
+    def history(self, user_key):
+        """Messages of the conversation, oldest first, as chat dicts."""
+        with self._lock:
+            conversation = self._get_locked(user_key, create=False)
+            if conversation is None:
+                return []
+            return [{"role": role, "content": content} for role, content, _ in conversation.messages]
+
+    def get_value(self, user_key, name):
+        with self._lock:
+            conversation = self._get_locked(user_key, create=False)
+            return conversation.values.get(name) if conversation is not None else None
+
+    def set_value(self, user_key, name, value):
+        with self._lock:
+            self._get_locked(user_key, create=True).values[name] = value
+
+    def clear(self, user_key=None):
+        with self._lock:
+            if user_key is None:
+                self._conversations.clear()
+            else:
+                self._conversations.pop(user_key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "users": len(self._conversations),
+                "messages": sum(len(c.messages) for c in self._conversations.values()),
+                "tokens": sum(c.tokens for c in self._conversations.values()),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "max_users": self.max_users,
+            }
+
+
+class SQLiteConversationStore:
+    """Conversation store in a SQLite file shared by the workers on one host"""
+
+    def __init__(self, path, ttl_seconds=DEFAULT_TTL_SECONDS, max_tokens=DEFAULT_MAX_TOKENS,
+                 max_messages=DEFAULT_MAX_MESSAGES, purge_every=500, clock=time.time):
+        """
+        Args:
+            path (str): SQLite database file
+            ttl_seconds (float): Conversations idle longer than this are ignored and purged
+            max_tokens (int): Token budget per conversation
+            max_messages (int): Hard cap on messages per conversation
+            purge_every (int): Delete expired rows after this many writes
+            clock (callable): Time source (wall-clock seconds, shared between processes)
+        """
+        self.path = path
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_tokens = int(max_tokens)
+        self.max_messages = max(1, int(max_messages))
+        self.purge_every = max(1, int(purge_every))
+        self._clock = clock
+        self._writes = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_key TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_chat_messages_user ON chat_messages (user_key, id);
+            CREATE TABLE IF NOT EXISTS chat_values (
+                user_key TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value TEXT,
+                updated REAL NOT NULL,
+                PRIMARY KEY (user_key, name)
+            );
+            """
+        )
+        self._db.commit()
+
+    def _after_write_locked(self, now):
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self._purge_locked(now)
+
+    def _purge_locked(self, now):
+        cutoff = now - self.ttl_seconds
+        self._db.execute(
+            "DELETE FROM chat_messages WHERE user_key IN ("
+            " SELECT user_key FROM chat_messages GROUP BY user_key HAVING MAX(created) < ?)",
+            (cutoff,),
+        )
+        self._db.execute("DELETE FROM chat_values WHERE updated < ?", (cutoff,))
+        self._db.commit()
+
+    def append(self, user_key, role, content):
+        """Add a message and trim the conversation to its budget."""
+        tokens = count_tokens(content)
+        now = self._clock()
+        with self._lock:
+            # a conversation idle past its TTL starts over
+            self._db.execute(
+                "DELETE FROM chat_messages WHERE user_key = ? AND created < ?",
+                (user_key, now - self.ttl_seconds),
+            )
+            self._db.execute(
+                "INSERT INTO chat_messages (user_key, role, content, tokens, created) VALUES (?, ?, ?, ?, ?)",
+                (user_key, role, content, tokens, now),
+            )
+            rows = self._db.execute(
+                "SELECT id, tokens FROM chat_messages WHERE user_key = ? ORDER BY id DESC",
+                (user_key,),
+            ).fetchall()
+            kept_tokens = 0
+            cutoff_id = None
+            for position, (row_id, row_tokens) in enumerate(rows):
+                kept_tokens += row_tokens
+                if position > 0 and (kept_tokens > self.max_tokens or position >= self.max_messages):
+                    cutoff_id = row_id
+                    break
+            if cutoff_id is not None:
+                self._db.execute(
+                    "DELETE FROM chat_messages WHERE user_key = ? AND id <= ?", (user_key, cutoff_id)
+                )
+            self._db.commit()
+            self._after_write_locked(now)
+
+    def history(self, user_key):
+        """Messages of the conversation, oldest first, as chat dicts."""
+        cutoff = self._clock() - self.ttl_seconds
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT role, content FROM chat_messages WHERE user_key = ? AND created >= ? ORDER BY id",
+                (user_key, cutoff),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def get_value(self, user_key, name):
+        cutoff = self._clock() - self.ttl_seconds
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM chat_values WHERE user_key = ? AND name = ? AND updated >= ?",
+                (user_key, name, cutoff),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_value(self, user_key, name, value):
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO chat_values (user_key, name, value, updated) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (user_key, name) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+                (user_key, name, value, now),
+            )
+            self._db.commit()
+            self._after_write_locked(now)
+
+    def clear(self, user_key=None):
+        with self._lock:
+            if user_key is None:
+                self._db.execute("DELETE FROM chat_messages")
+                self._db.execute("DELETE FROM chat_values")
+            else:
+                self._db.execute("DELETE FROM chat_messages WHERE user_key = ?", (user_key,))
+                self._db.execute("DELETE FROM chat_values WHERE user_key = ?", (user_key,))
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            users, messages, tokens = self._db.execute(
+                "SELECT COUNT(DISTINCT user_key), COUNT(*), COALESCE(SUM(tokens), 0) FROM chat_messages"
+            ).fetchone()
+        return {"backend": "sqlite", "users": users, "messages": messages, "tokens": tokens, "path": self.path}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def create_conversation_store(backend=None):
+    """
+    Build a conversation store from the CHATBOT_MEMORY_* environment variables.
+
+    Args:
+        backend (str, optional): "memory" or "sqlite" (defaults to CHATBOT_MEMORY_BACKEND)
+
+    Returns:
+        InMemoryConversationStore or SQLiteConversationStore
+    """
+    backend = (backend or os.getenv("CHATBOT_MEMORY_BACKEND") or "memory").strip().lower()
+    ttl_seconds = float(os.getenv("CHATBOT_MEMORY_TTL", DEFAULT_TTL_SECONDS))
+    max_tokens = int(os.getenv("CHATBOT_MEMORY_MAX_TOKENS", DEFAULT_MAX_TOKENS))
+    max_messages = int(os.getenv("CHATBOT_MEMORY_MAX_MESSAGES", DEFAULT_MAX_MESSAGES))
+    if backend == "sqlite":
+        path = os.getenv("CHATBOT_MEMORY_PATH") or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "chat_memory.sqlite"
+        )
+        return SQLiteConversationStore(path, ttl_seconds=ttl_seconds, max_tokens=max_tokens, max_messages=max_messages)
+    if backend == "memory":
+        return InMemoryConversationStore(
+            max_users=int(os.getenv("CHATBOT_MEMORY_MAX_USERS", DEFAULT_MAX_USERS)),
+            ttl_seconds=ttl_seconds,
+            max_tokens=max_tokens,
+            max_messages=max_messages,
+        )
+    raise ValueError(f"Unknown conversation store backend: {backend}")
@@ -1,22 +1,45 @@
 """
 Embedding Helper
-Utilities for generating and comparing embeddings using OpenAI
+Utilities for generating and comparing embeddings.
+Vectors come from a pluggable provider (OpenAI by default, or a local
+hashed n-gram provider; see embedding_providers.py).
 """
 import json
 import numpy as np
-from openai import OpenAI
 import os
 
+from .embedding_providers import create_embedding_provider
+
 
 class EmbeddingHelper:
     """Helper class for generating and comparing embeddings"""
     
-    def __init__(self, api_key):
-        """Initialize with OpenAI API key"""
-        if not api_key:
-            raise ValueError("API key is required for embeddings")
-        self.client = OpenAI(api_key=api_key)
-        self.model = "text-embedding-3-small" 
+    def __init__(self, api_key=None, base_url=None, cache=None, provider=None, http_client=None, caller=None):
+        """
+        Initialize with an embedding provider.
+        
+        Args:
+            api_key (str, optional): OpenAI API key (required by the openai provider)
+            base_url (str, optional): OpenAI-compatible base URL
+            cache (QueryEmbeddingCache, optional): Serves repeated texts in generate_embedding
+            provider (object, optional): Provider instance or name; defaults to EMBEDDING_PROVIDER
+            http_client (httpx.Client, optional): Shared connection pool for API providers
+            caller (ResilientCaller, optional): Applies a timeout, retries and a circuit
+                breaker to generate_embedding's provider requests
+        """
+        if provider is None or isinstance(provider, str):
+            provider = create_embedding_provider(
+                provider, api_key=api_key, base_url=base_url, http_client=http_client
+            )
+        self.provider = provider
+        self.model = provider.model
+        self.cache = cache
+        self.caller = caller
+    
+    @property
+    def client(self):
+        """Underlying OpenAI client (None for local providers)"""
+        return getattr(self.provider, "client", None)
     
     def generate_embedding(self, text):
         """
@@ -26,21 +49,46 @@ class EmbeddingHelper:
             text (str): Text to embed
             
         Returns:
-            list: Embedding vector (list of floats)
+            list: Embedding vector (list of floats), or None when the provider
+                fails, times out or its circuit is open
         """
         if not text or not text.strip():
             return None
+        
+        if self.cache is not None:
+            cached = self.cache.get(text, self.model)
+            if cached is not None:
+                return cached
             
         try:
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=text.strip()
-            )
-            return response.data[0].embedding
+            if self.caller is not None:
+                # the caller owns timeouts and retries, so the client must not retry as well
+                embedding = self.caller.call(
+                    lambda timeout: self.provider.embed([text.strip()], max_retries=0, timeout=timeout)
+                )[0]
+            else:
+                embedding = self.provider.embed([text.strip()])[0]
+            if self.cache is not None:
+                self.cache.put(text, self.model, embedding)
+            return embedding
         except Exception as e:
             print(f"Error generating embedding: {e}")
             return None
     
+    def generate_embeddings(self, texts, max_retries=None):
+        """
+        Generate embeddings for many texts with a single provider request.
+        Unlike generate_embedding, errors are raised so callers can retry.
+        
+        Args:
+            texts (list): Non-empty texts to embed
+            max_retries (int, optional): Override the client's built-in retry count
+            
+        Returns:
+            list: One embedding vector per input text, in input order
+        """
+        return self.provider.embed([text.strip() for text in texts], max_retries=max_retries)
+    
     def cosine_similarity(self, vec1, vec2):
         """
         Calculate cosine similarity between two embedding vectors
@@ -0,0 +1,851 @@
+"""
+Embedding Index
+Process-wide, in-memory index of event embeddings used for semantic search.
+
+Embeddings are held in one contiguous, pre-normalized float32 matrix with
+parallel arrays for event IDs, dates and locations, so a query is scored
+against every event with a single matrix-vector product. For large catalogs
+an ANN index (see ann_index.py) can be plugged in so queries only score the
+vectors in the closest inverted lists, and a quantized mode (see quantization.py)
+keeps only compact int8/binary codes in RAM for the candidate scan.
+
+When a shared on-disk store (see embedding_store.py) exists, the index maps it
+read-only instead of loading from MySQL, and picks up new versions of the file.
+An index loaded from MySQL instead compares per-event embedding versions with
+the database every refresh_interval seconds (see DataAccess.sync_event_index),
+so embeddings written by other processes (e.g. the generator) show up without
+a restart.
+
+hybrid_search fuses BM25 keyword ranking with vector ranking (reciprocal rank
+fusion) in one pass, applying date, location and exclusion filters inside the
+index.
+"""
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from .ann_index import create_ann_index
+from .event_fields import normalize_location, to_day, to_start
+from .lexical_index import BM25Index, event_text, tokenize
+from .quantization import (
+    QUANTIZATION_MODES,
+    binary_codes,
+    code_dtype,
+    code_width,
+    hamming_distances,
+    int8_scores,
+    quantize_int8,
+)
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "event_embeddings.idx")
+
+
+def get_store_path():
+    """Path of the shared embedding store file (EMBEDDING_STORE_PATH overrides the default)."""
+    return os.getenv("EMBEDDING_STORE_PATH") or DEFAULT_STORE_PATH
+
+
+def normalize_vector(embedding):
+    """
+    Convert an embedding to a unit-length float32 vector.
+
+    Returns:
+        np.ndarray or None: None if the embedding is empty or has zero norm
+    """
+    if embedding is None:
+        return None
+    vec = np.asarray(embedding, dtype=np.float32).ravel()
+    if vec.size == 0:
+        return None
+    norm = np.linalg.norm(vec)
+    if norm == 0 or not np.isfinite(norm):
+        return None
+    return vec / norm
+
+
+class EventEmbeddingIndex:
+    """
+    In-memory embedding index for events.
+
+    Rows are stored in pre-allocated buffers that grow geometrically, so single
+    event inserts are amortised O(dim) and removals swap the last row into the
+    freed slot. Row order is irrelevant because results are ranked by score.
+
+    If an ANN index is supplied it is trained once the index holds at least
+    ann_min_size vectors; below that size brute force is both exact and fast.
+
+    With quantization enabled, candidates are shortlisted using int8 or binary
+    codes and only the shortlist is rescored with the full-precision vectors,
+    which are then kept in a disk-backed memory map instead of the heap.
+    Quantization is off by default. int8 only saves memory (its scan is a little
+    slower than exact scoring); binary codes are both smaller and the faster scan.
+
+    A BM25 keyword index over the same events is maintained alongside the
+    vectors for hybrid_search.
+    """
+
+    def __init__(
+        self,
+        ann=None,
+        ann_min_size=2048,
+        ann_path=None,
+        quantization=None,
+        rerank_factor=10,
+        min_rerank=100,
+        full_precision_on_disk=None,
+        store_path=None,
+        store_check_interval=2.0,
+        refresh_interval=60.0,
+    ):
+        """
+        Args:
+            ann (IVFIndex, optional): Approximate index used for large catalogs
+            ann_min_size (int): Minimum number of vectors before the ANN index is trained
+            ann_path (str, optional): File used to persist/restore the ANN index
+            quantization (str, optional): None, "int8" or "binary"
+            rerank_factor (int): Shortlist size as a multiple of the requested limit
+            min_rerank (int): Minimum shortlist size rescored at full precision
+            full_precision_on_disk (bool, optional): Keep float32 vectors in a memory-mapped
+                temp file; defaults to True when quantization is enabled
+            store_path (str, optional): Shared embedding store file to map instead of loading from the DB
+            store_check_interval (float): Seconds between checks for a newer store file
+            refresh_interval (float): Seconds between checks of a DB-loaded index for
+                embeddings changed by other processes; 0 disables the check
+        """
+        if quantization in ("", "none"):
+            quantization = None
+        if quantization is not None and quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {quantization}")
+        self.ann = ann
+        self.ann_min_size = ann_min_size
+        self.ann_path = ann_path
+        self.quantization = quantization
+        self.rerank_factor = rerank_factor
+        self.min_rerank = min_rerank
+        if full_precision_on_disk is None:
+            full_precision_on_disk = quantization is not None
+        self.full_precision_on_disk = full_precision_on_disk
+        self.store_path = store_path
+        self.store_check_interval = store_check_interval
+        self.refresh_interval = refresh_interval
+        self._refreshed_at = 0.0
+        self._versions = {}  # event ID -> embedding version the indexed row was built from
+        self._store = None
+        self._store_checked_at = 0.0
+        self._private = False  # store-backed arrays copied so local changes can be applied
+        self._overlay_metadata = {}  # event ID -> details of rows upserted into a store-backed index
+        self._pending = {}  # event ID -> (time, row or None) local changes not yet in a store file
+        self._metadata_loader = None
+        self._spill_file = None
+        self._lexical = BM25Index()
+        self._lock = threading.RLock()
+        self._size = 0
+        self._dim = 0
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._codes = np.empty((0, 0), dtype=np.uint8)
+        self._scales = np.empty(0, dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._dates = np.empty(0, dtype="datetime64[D]")
+        self._starts = np.empty(0, dtype="datetime64[s]")
+        self._locations = np.empty(0, dtype=object)
+        self._lists = np.empty(0, dtype=np.int32)
+        self._metadata = []
+        self._row_by_id = {}
+        self.loaded = False
+
+    # ------------------------
+    # Loading / maintenance
+    # ------------------------
+    def __len__(self):
+        return self._size
+
+    @property
+    def dim(self):
+        return self._dim
+
+    def load(self, rows):
+        """
+        Replace the index contents with the given event rows.
+
+        Args:
+            rows (list): Event dicts as returned by DataAccess.get_event_embedding_rows
+                         (metadata fields plus an 'embedding' list)
+        """
+        with self._lock:
+            self.loaded = False
+            self._reset()
+            self._pending = {}
+            for row in rows or []:
+                self._upsert_locked(row)
+            self._build_ann_locked()
+            self._refreshed_at = time.monotonic()
+            self.loaded = True
+
+    def ensure_loaded(self, loader, metadata_loader=None):
+        """
+        Load the index once if it has not been loaded yet.
+
+        Args:
+            loader (callable): Returns all event rows with embeddings (used without a store file)
+            metadata_loader (callable, optional): Returns event dicts for a list of IDs;
+                used to fill in result details when the index is mapped from a store file
+        """
+        if self.loaded:
+            if metadata_loader is not None and self._metadata_loader is None:
+                self._metadata_loader = metadata_loader
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            if self.store_path and os.path.exists(self.store_path):
+                from .embedding_store import EmbeddingStore
+                try:
+                    self.load_store(EmbeddingStore(self.store_path), metadata_loader)
+                    return
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Could not map embedding store {self.store_path}: {e}")
+            self.load(loader())
+
+    def load_store(self, store, metadata_loader=None):
+        """
+        Serve the index from a memory-mapped EmbeddingStore.
+
+        The float32 matrix, IDs and dates stay in the shared page cache; only
+        per-process extras (location names, keyword index, quantized codes, ANN
+        lists) are built. Event details are fetched with metadata_loader for the
+        hits of each search. Local upserts/removes made after the file's snapshot
+        are re-applied on top of it.
+        """
+        with self._lock:
+            self.loaded = False
+            self._reset()
+            self._set_dim(store.dim)
+            n = store.count
+            self._store = store
+            self._store_checked_at = time.monotonic()
+            self._metadata_loader = metadata_loader or self._metadata_loader
+            self._size = n
+            self._matrix = store.matrix
+            self._ids = store.ids
+            self._dates = store.dates
+            self._starts = store.starts
+            self._locations = store.location_names()
+            self._lists = np.zeros(n, dtype=np.int32)
+            self._metadata = None
+            self._row_by_id = {event_id: row for row, event_id in enumerate(store.ids.tolist())}
+            for event_id, text in store.texts():
+                self._lexical.add(event_id, text)
+            if self.quantization:
+                self._encode_all_locked()
+            self._build_ann_locked()
+
+            # Changes this process made before the snapshot are already in the file
+            self._pending = {
+                event_id: change for event_id, change in self._pending.items() if change[0] >= store.snapshot_at
+            }
+            for event_id, (_, row) in self._pending.items():
+                self._make_private_locked()
+                if row is None:
+                    self._remove_locked(event_id)
+                else:
+                    self._upsert_locked(row)
+            self.loaded = True
+
+    def _maybe_reload_store_locked(self):
+        """Swap in a newer store file if one has been published since it was mapped."""
+        if self._store is None:
+            return
+        now = time.monotonic()
+        if now - self._store_checked_at < self.store_check_interval:
+            return
+        self._store_checked_at = now
+        if not self._store.is_stale():
+            return
+        from .embedding_store import EmbeddingStore
+        try:
+            self.load_store(EmbeddingStore(self._store.path), self._metadata_loader)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not reload embedding store {self._store.path}: {e}")
+
+    def _make_private_locked(self):
+        """
+        Copy the store-backed arrays into private memory so rows can be changed.
+        The store stays attached, so a newer file still replaces the copy.
+        """
+        if self._store is None or self._private:
+            return
+        n = self._size
+        matrix = self._allocate_matrix(n)
+        matrix[:n] = self._matrix[:n]
+        self._matrix = matrix
+        self._ids = np.array(self._ids, dtype=np.int64)
+        self._dates = np.array(self._dates)
+        self._starts = np.array(self._starts)
+        self._private = True
+
+    def _encode_all_locked(self):
+        """Compute quantized codes for every row in blocks (used after mapping a store)."""
+        n = self._size
+        width = code_width(self.quantization, self._dim)
+        self._codes = np.zeros((n, width), dtype=code_dtype(self.quantization))
+        self._scales = np.ones(n, dtype=np.float32)
+        for start in range(0, n, 4096):
+            block = np.asarray(self._matrix[start : start + 4096], dtype=np.float32)
+            if self.quantization == "int8":
+                codes, scales = quantize_int8(block)
+                self._codes[start : start + block.shape[0]] = codes
+                self._scales[start : start + block.shape[0]] = scales
+            else:
+                self._codes[start : start + block.shape[0]] = binary_codes(block)
+
+    def upsert(self, row):
+        """Insert or replace a single event row. Returns True if the row was indexed."""
+        with self._lock:
+            if self._store is not None and row.get("ID") is not None:
+                self._make_private_locked()
+                self._pending[int(row["ID"])] = (time.time(), row)
+            return self._upsert_locked(row)
+
+    def remove(self, event_id):
+        """Remove an event from the index. Returns True if it was present."""
+        with self._lock:
+            if self._store is not None:
+                self._make_private_locked()
+                self._pending[int(event_id)] = (time.time(), None)
+            return self._remove_locked(event_id)
+
+    def _remove_locked(self, event_id):
+        event_id = int(event_id)
+        self._versions.pop(event_id, None)
+        self._overlay_metadata.pop(event_id, None)
+        row = self._row_by_id.pop(event_id, None)
+        if row is None:
+            return False
+        self._lexical.remove(event_id)
+        last = self._size - 1
+        if row != last:
+            self._move_row(last, row)
+        if self._metadata is not None:
+            self._metadata.pop()
+        self._size = last
+        return True
+
+    def refresh_due(self):
+        """
+        True at most once per refresh_interval for an index loaded from the database,
+        telling the caller to compare embedding versions (see stale_ids).
+        Store-backed indexes pick up changes through the store file instead.
+        """
+        if not self.loaded or not self.refresh_interval or self._store is not None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._refreshed_at < self.refresh_interval:
+                return False
+            self._refreshed_at = now
+            return True
+
+    def stale_ids(self, versions):
+        """
+        Compare the database's embedding versions with the indexed ones.
+
+        Args:
+            versions (dict): Event ID -> embedding version for every event with an embedding
+
+        Returns:
+            list: IDs to refresh (new or changed embeddings, and indexed events that lost theirs)
+        """
+        with self._lock:
+            changed = [event_id for event_id, version in versions.items()
+                       if event_id not in self._versions or self._versions[event_id] != version]
+            removed = [event_id for event_id in self._row_by_id if event_id not in versions]
+        return changed + removed
+
+    def memory_usage(self):
+        """
+        Bytes held by the vector storage.
+
+        Returns:
+            dict: {"codes": resident code bytes, "full_precision": float32 bytes,
+                   "full_precision_on_disk": bool}
+        """
+        n = self._size
+        codes = self._codes[:n].nbytes if self.quantization else 0
+        if self.quantization == "int8":
+            codes += self._scales[:n].nbytes
+        return {
+            "codes": int(codes),
+            "full_precision": int(n * self._dim * 4),
+            "full_precision_on_disk": bool(
+                self.full_precision_on_disk or (self._store is not None and not self._private)
+            ),
+        }
+
+    def _allocate_matrix(self, capacity):
+        """Allocate the float32 vector buffer, spilling it to a temp-file memmap if configured."""
+        if not self.full_precision_on_disk or capacity == 0 or self._dim == 0:
+            return np.zeros((capacity, self._dim), dtype=np.float32)
+        spill = tempfile.TemporaryFile(prefix="onesky-embeddings-")
+        self._spill_file = spill
+        return np.memmap(spill, dtype=np.float32, mode="w+", shape=(capacity, self._dim))
+
+    def _set_dim(self, dim):
+        self._dim = dim
+        self._matrix = np.empty((0, dim), dtype=np.float32)
+        if self.quantization:
+            self._codes = np.empty((0, code_width(self.quantization, dim)), dtype=code_dtype(self.quantization))
+            self._scales = np.empty(0, dtype=np.float32)
+
+    def _reset(self):
+        self._size = 0
+        self._dim = 0
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._codes = np.empty((0, 0), dtype=np.uint8)
+        self._scales = np.empty(0, dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._dates = np.empty(0, dtype="datetime64[D]")
+        self._starts = np.empty(0, dtype="datetime64[s]")
+        self._locations = np.empty(0, dtype=object)
+        self._lists = np.empty(0, dtype=np.int32)
+        self._metadata = []
+        self._row_by_id = {}
+        self._versions = {}
+        self._store = None
+        self._private = False
+        self._overlay_metadata = {}
+        self._lexical.clear()
+        if self.ann is not None:
+            self.ann.centroids = None
+
+    def _ensure_capacity(self, needed):
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+
+        old_spill = self._spill_file
+        matrix = self._allocate_matrix(new_capacity)
+        matrix[: self._size] = self._matrix[: self._size]
+        self._matrix = matrix
+        if old_spill is not None and old_spill is not self._spill_file:
+            old_spill.close()
+
+        if self.quantization:
+            codes = np.zeros((new_capacity, self._codes.shape[1]), dtype=self._codes.dtype)
+            codes[: self._size] = self._codes[: self._size]
+            self._codes = codes
+            self._scales = np.resize(self._scales, new_capacity)
+
+        self._ids = np.resize(self._ids, new_capacity)
+        self._dates = np.resize(self._dates, new_capacity)
+        self._starts = np.resize(self._starts, new_capacity)
+        self._lists = np.resize(self._lists, new_capacity)
+        locations = np.empty(new_capacity, dtype=object)
+        locations[: self._size] = self._locations[: self._size]
+        self._locations = locations
+
+    def _move_row(self, src, dst):
+        self._matrix[dst] = self._matrix[src]
+        if self.quantization:
+            self._codes[dst] = self._codes[src]
+            self._scales[dst] = self._scales[src]
+        self._ids[dst] = self._ids[src]
+        self._dates[dst] = self._dates[src]
+        self._starts[dst] = self._starts[src]
+        self._locations[dst] = self._locations[src]
+        self._lists[dst] = self._lists[src]
+        if self._metadata is not None:
+            self._metadata[dst] = self._metadata[src]
+        self._row_by_id[int(self._ids[dst])] = dst
+
+    def _upsert_locked(self, row):
+        event_id = row.get("ID")
+        if event_id is not None and "EmbeddingVersion" in row:
+            # remembered even when the row is rejected, so it isn't re-fetched on every refresh
+            self._versions[int(event_id)] = row["EmbeddingVersion"]
+        vec = normalize_vector(row.get("embedding"))
+        if event_id is None or vec is None:
+            return False
+        event_id = int(event_id)
+
+        if self._size == 0 and self._dim != vec.size:
+            self._set_dim(vec.size)
+        if vec.size != self._dim:
+            # Embeddings from a different model/dimension cannot be compared
+            return False
+
+        metadata = {k: v for k, v in row.items() if k not in ("embedding", "EmbeddingVersion")}
+
+        position = self._row_by_id.get(event_id)
+        if position is None:
+            self._ensure_capacity(self._size + 1)
+            position = self._size
+            self._size += 1
+            if self._metadata is not None:
+                self._metadata.append(metadata)
+            self._row_by_id[event_id] = position
+        elif self._metadata is not None:
+            self._metadata[position] = metadata
+        if self._metadata is None:
+            self._overlay_metadata[event_id] = metadata
+
+        self._matrix[position] = vec
+        if self.quantization == "int8":
+            codes, scales = quantize_int8(vec[np.newaxis, :])
+            self._codes[position] = codes[0]
+            self._scales[position] = scales[0]
+        elif self.quantization == "binary":
+            self._codes[position] = binary_codes(vec[np.newaxis, :])[0]
+        self._ids[position] = event_id
+        day = to_day(row.get("Date"))
+        self._dates[position] = day if day is not None else np.datetime64("NaT", "D")
+        self._starts[position] = to_start(row.get("Date"), row.get("StartTime"))
+        self._locations[position] = normalize_location(row.get("LocationCity"))
+        self._lexical.add(event_id, event_text(row))
+        if self._ann_active():
+            self._lists[position] = self.ann.assign(vec[np.newaxis, :])[0]
+        elif self.ann is not None and self.loaded and self._size >= self.ann_min_size:
+            # Catalog has grown past the brute-force threshold: train now
+            self._build_ann_locked()
+        return True
+
+    # ------------------------
+    # ANN maintenance
+    # ------------------------
+    def _ann_active(self):
+        return self.ann is not None and self.ann.trained
+
+    def _build_ann_locked(self):
+        """Train (or restore from disk) the ANN index and assign every row to a list."""
+        if self.ann is None or self._size < self.ann_min_size:
+            return
+        vectors = self._matrix[: self._size]
+
+        stored = None
+        if self.ann_path and os.path.exists(self.ann_path):
+            try:
+                stored = self.ann.load(self.ann_path)
+                if self.ann.centroids.shape[1] != self._dim:
+                    self.ann.centroids = None
+                    stored = None
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Could not load ANN index from {self.ann_path}: {e}")
+                self.ann.centroids = None
+                stored = None
+
+        if stored is None:
+            self.ann.train(vectors)
+            self._lists[: self._size] = self.ann.assign(vectors)
+            self.save_ann()
+            return
+
+        # Reuse persisted assignments; only new/unknown events need assigning
+        ids = self._ids[: self._size]
+        assignments = np.array([stored.get(int(i), -1) for i in ids], dtype=np.int32)
+        missing = np.flatnonzero(assignments < 0)
+        self._lists[: self._size] = assignments
+        if missing.size or len(stored) != self._size:
+            self._lists[missing] = self.ann.assign(vectors[missing])
+            # keep the file in step with the catalog so the next start doesn't redo this
+            self.save_ann()
+
+    def rebuild_ann(self):
+        """Retrain the ANN index from the current vectors (e.g. after large catalog changes)."""
+        with self._lock:
+            if self.ann is None:
+                return
+            self.ann.centroids = None
+            path, self.ann_path = self.ann_path, None
+            try:
+                self._build_ann_locked()
+            finally:
+                self.ann_path = path
+            self.save_ann()
+
+    def save_ann(self):
+        """
+        Persist the ANN index to ann_path (no-op when ANN is disabled or untrained).
+        upsert() and remove() only change the in-memory list assignments; call this
+        after a batch of them so a restart doesn't lose the assignments.
+        """
+        with self._lock:
+            if self.ann_path and self._ann_active():
+                try:
+                    self.ann.save(self.ann_path, self._ids[: self._size], self._lists[: self._size])
+                except OSError as e:
+                    print(f"Could not save ANN index to {self.ann_path}: {e}")
+
+    # ------------------------
+    # Search
+    # ------------------------
+    def _filter_mask(self, n, location=None, start_date=None, end_date=None, now=None):
+        """
+        Boolean mask mirroring the SQL filters previously used for semantic search:
+        - date range (BETWEEN / >= / <=) when any date is given
+        - otherwise only events that have not started yet
+        - optional case-insensitive location match
+        """
+        mask = np.ones(n, dtype=bool)
+        start = to_day(start_date)
+        end = to_day(end_date)
+        dates = self._dates[:n]
+
+        if start is not None:
+            mask &= dates >= start
+        if end is not None:
+            mask &= dates <= end
+        if start is None and end is None:
+            current = np.datetime64(now or datetime.now(), "s")
+            mask &= self._starts[:n] >= current
+
+        if location:
+            mask &= self._locations[:n] == normalize_location(location)
+        return mask
+
+    def search(
+        self,
+        query_embedding,
+        location=None,
+        limit=10,
+        similarity_threshold=0.3,
+        start_date=None,
+        end_date=None,
+        now=None,
+        n_probe=None,
+        exact=False,
+    ):
+        """
+        Rank indexed events by cosine similarity to the query.
+
+        Args:
+            query_embedding (list): Embedding vector for user query
+            location (str, optional): Filter by location city
+            limit (int): Maximum number of results
+            similarity_threshold (float): Minimum similarity score (0-1)
+            start_date (date, optional): Filter events from this date onwards
+            end_date (date, optional): Filter events up to this date
+            now (datetime, optional): Reference time for the "upcoming only" filter
+            n_probe (int, optional): Override the ANN lists scanned for this query
+            exact (bool): Force a brute-force scan even when an ANN index is trained
+
+        Returns:
+            list: Event dicts sorted by similarity score (highest first)
+        """
+        query = normalize_vector(query_embedding)
+        if query is None or limit <= 0:
+            return []
+
+        with self._lock:
+            self._maybe_reload_store_locked()
+            n = self._size
+            if n == 0 or query.size != self._dim:
+                return []
+
+            eligible = self._filter_mask(n, location, start_date, end_date, now)
+            rows, scores = self._vector_rank_locked(
+                query, eligible, limit, similarity_threshold, n_probe=n_probe, exact=exact
+            )
+            matches = self._collect_locked(rows)
+
+        return self._build_results(matches, [{"similarity_score": float(score)} for score in scores])
+
+    def hybrid_search(
+        self,
+        query_text,
+        query_embedding=None,
+        location=None,
+        limit=10,
+        similarity_threshold=0.3,
+        start_date=None,
+        end_date=None,
+        exclude_ids=None,
+        candidates=None,
+        rrf_k=60,
+        now=None,
+    ):
+        """
+        Rank events by fusing keyword (BM25) and vector similarity rankings.
+
+        Both rankings only consider events that pass the date/location filters
+        and are not in exclude_ids, so `limit` eligible results come back from a
+        single pass. Either signal may be missing (no embedding, or no keyword
+        terms); with neither, upcoming events are returned in date order.
+
+        Args:
+            query_text (str): Free-text keywords
+            query_embedding (list, optional): Embedding vector for the same query
+            location (str, optional): Filter by location city
+            limit (int): Maximum number of results
+            similarity_threshold (float): Minimum cosine similarity for a vector candidate
+            start_date (date, optional): Filter events from this date onwards
+            end_date (date, optional): Filter events up to this date
+            exclude_ids (iterable, optional): Event IDs to leave out (e.g. already registered)
+            candidates (int, optional): Depth of each ranking fed into fusion
+            rrf_k (int): Reciprocal rank fusion constant
+            now (datetime, optional): Reference time for the "upcoming only" filter
+
+        Returns:
+            list: Event dicts with similarity_score, lexical_score and hybrid_score
+                  (highest hybrid_score first)
+        """
+        if limit <= 0:
+            return []
+        depth = candidates or max(limit * 4, 40)
+        query = normalize_vector(query_embedding)
+
+        with self._lock:
+            self._maybe_reload_store_locked()
+            n = self._size
+            if n == 0:
+                return []
+            lexical_scores = self._lexical.score(query_text) if query_text else {}
+            if query is not None and query.size != self._dim:
+                query = None
+
+            eligible = self._filter_mask(n, location, start_date, end_date, now)
+            if exclude_ids:
+                excluded = np.fromiter((int(i) for i in exclude_ids), dtype=np.int64)
+                eligible &= ~np.isin(self._ids[:n], excluded)
+
+            fused = {}
+            vector_rows = np.empty(0, dtype=np.int64)
+            if query is not None:
+                vector_rows, _ = self._vector_rank_locked(query, eligible.copy(), depth, similarity_threshold)
+                for rank, row in enumerate(vector_rows.tolist()):
+                    fused[row] = fused.get(row, 0.0) + 1.0 / (rrf_k + rank + 1)
+
+            lexical_rows = []
+            for event_id, score in lexical_scores.items():
+                row = self._row_by_id.get(event_id)
+                if row is not None and row < n and eligible[row]:
+                    lexical_rows.append((score, row))
+            lexical_rows = sorted(lexical_rows, key=lambda item: -item[0])[:depth]
+            for rank, (_, row) in enumerate(lexical_rows):
+                fused[row] = fused.get(row, 0.0) + 1.0 / (rrf_k + rank + 1)
+
+            if query is None and not tokenize(query_text):
+                # Nothing to rank by: browse eligible events soonest first
+                rows = np.flatnonzero(eligible)
+                rows = rows[np.argsort(self._starts[rows], kind="stable")][:limit]
+                extras = [{"similarity_score": 0.0, "lexical_score": 0.0, "hybrid_score": 0.0} for _ in rows]
+                return self._build_results(self._collect_locked(rows), extras)
+
+            ranked = sorted(fused.items(), key=lambda item: -item[1])[:limit]
+            rows = np.array([row for row, _ in ranked], dtype=np.int64)
+            similarities = (
+                self._matrix[rows] @ query if query is not None and rows.size else np.zeros(rows.size)
+            )
+            lexical_by_row = {row: score for score, row in lexical_rows}
+            extras = [
+                {
+                    "similarity_score": float(similarity),
+                    "lexical_score": float(lexical_by_row.get(row, 0.0)),
+                    "hybrid_score": float(fused_score),
+                }
+                for (row, fused_score), similarity in zip(ranked, similarities)
+            ]
+            matches = self._collect_locked(rows)
+
+        return self._build_results(matches, extras)
+
+    def _vector_rank_locked(self, query, eligible, limit, similarity_threshold, n_probe=None, exact=False):
+        """
+        Top rows by cosine similarity among the eligible mask (which may be narrowed in place).
+
+        Returns:
+            tuple: (rows, scores) sorted by score, highest first
+        """
+        n = self._size
+        approximate = not exact
+        if self._ann_active() and approximate:
+            probed = np.zeros(self.ann.centroids.shape[0], dtype=bool)
+            probed[self.ann.probe(query, n_probe)] = True
+            eligible &= probed[self._lists[:n]]
+        rows = np.flatnonzero(eligible)
+
+        if self.quantization and approximate:
+            shortlist = max(limit * self.rerank_factor, self.min_rerank)
+            rows = self._quantized_shortlist(query, rows, shortlist)
+            scores = self._matrix[rows] @ query
+        elif self._ann_active() and approximate:
+            scores = self._matrix[rows] @ query
+        else:
+            scores = (self._matrix[:n] @ query)[rows]
+
+        keep = scores >= similarity_threshold
+        rows, scores = rows[keep], scores[keep]
+
+        if rows.size > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return rows[order], scores[order]
+
+    def _collect_locked(self, rows):
+        """Snapshot what is needed to build results for rows before releasing the lock."""
+        if self._metadata is not None:
+            return [self._metadata[row] for row in rows], None, None
+        ids = [int(self._ids[row]) for row in rows]
+        return [self._overlay_metadata.get(event_id) for event_id in ids], ids, self._metadata_loader
+
+    def _build_results(self, collected, extras):
+        """Turn collected rows into result dicts, merging per-row extra fields."""
+        matches, ids, metadata_loader = collected
+        if ids is not None:
+            # Store-backed index: fetch details for the hits only, outside the lock
+            missing = [event_id for event_id, match in zip(ids, matches) if match is None]
+            found = {int(m["ID"]): m for m in (metadata_loader(missing) if metadata_loader and missing else [])}
+            matches = [match if match is not None else found.get(event_id) for event_id, match in zip(ids, matches)]
+
+        results = []
+        for metadata, extra in zip(matches, extras):
+            if metadata is None:
+                continue
+            event = dict(metadata)
+            event.pop("embedding", None)
+            event.update(extra)
+            results.append(event)
+        return results
+
+    def _quantized_shortlist(self, query, rows, shortlist):
+        """Pick the best `shortlist` rows by approximate (quantized) score."""
+        if rows.size <= shortlist:
+            return rows
+        if self.quantization == "int8":
+            approx = int8_scores(self._codes, self._scales, query, rows)
+        else:
+            approx = -hamming_distances(self._codes, binary_codes(query[np.newaxis, :])[0], rows)
+        top = np.argpartition(-approx, shortlist - 1)[:shortlist]
+        return rows[top]
+
+
+def _build_default_index():
+    """Create the process-wide index from environment configuration."""
+    n_lists = os.getenv("EMBEDDING_IVF_LISTS")
+    ann = create_ann_index(
+        os.getenv("EMBEDDING_INDEX_BACKEND", "exact"),
+        n_lists=int(n_lists) if n_lists else None,
+        n_probe=int(os.getenv("EMBEDDING_IVF_PROBE", 8)),
+    )
+    return EventEmbeddingIndex(
+        ann=ann,
+        ann_min_size=int(os.getenv("EMBEDDING_ANN_MIN_SIZE", 2048)),
+        ann_path=os.getenv("EMBEDDING_IVF_PATH") or None,
+        quantization=os.getenv("EMBEDDING_QUANTIZATION") or None,
+        rerank_factor=int(os.getenv("EMBEDDING_RERANK_FACTOR", 10)),
+        store_path=get_store_path(),
+        refresh_interval=float(os.getenv("EMBEDDING_INDEX_REFRESH", 60)),
+    )
+
+
+# Process-wide index shared by every DataAccess instance in this worker
+_event_index = _build_default_index()
+
+
+def get_event_index():
+    """Return the process-wide event embedding index."""
+    return _event_index
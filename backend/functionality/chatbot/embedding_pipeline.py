@@ -0,0 +1,233 @@
+"""
+Embedding Pipeline
+Batched, concurrent embedding generation for many events.
+
+Texts are packed into batches (bounded by item count and an estimated token
+budget per request), a bounded number of batches are in flight at once, and
+transient API failures (rate limits, timeouts, 5xx) are retried with
+exponential backoff and jitter. Each finished batch is handed to a writer
+callback so results can be stored while later batches are still running.
+
+refresh_event_embeddings only embeds events whose source text hash or
+embedding model differs from what is stored, so routine refreshes don't
+re-embed the whole catalogue.
+"""
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import openai
+
+# OpenAI accepts up to 2048 inputs and ~300k tokens per embeddings request
+MAX_BATCH_ITEMS = 2048
+MAX_BATCH_TOKENS = 300000
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+def embedding_content_hash(text):
+    """SHA-256 of the text an embedding is generated from."""
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def needs_embedding(event, model):
+    """True if an event's embedding is missing, stale for its current text, or from another model."""
+    return (
+        not event.get('has_embedding')
+        or event.get('EmbeddingHash') != event.get('content_hash')
+        or event.get('EmbeddingModel') != model
+    )
+
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token) used for batch sizing."""
+    return len(text) // 4 + 1
+
+
+def make_batches(events, batch_size=256, max_batch_tokens=250000):
+    """
+    Split events into batches for the embeddings API.
+
+    Args:
+        events (list): Dicts with 'ID' and 'text'
+        batch_size (int): Maximum texts per request (capped at MAX_BATCH_ITEMS)
+        max_batch_tokens (int): Estimated token budget per request (capped at MAX_BATCH_TOKENS)
+
+    Returns:
+        list: Lists of events, in input order
+    """
+    batch_size = max(1, min(batch_size, MAX_BATCH_ITEMS))
+    max_batch_tokens = max(1, min(max_batch_tokens, MAX_BATCH_TOKENS))
+
+    batches, current, current_tokens = [], [], 0
+    for event in events:
+        tokens = estimate_tokens(event['text'])
+        if current and (len(current) >= batch_size or current_tokens + tokens > max_batch_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(event)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+class EmbeddingPipeline:
+    """Generate embeddings for many events with batching, bounded concurrency and retries"""
+
+    def __init__(
+        self,
+        embedding_helper,
+        batch_size=256,
+        max_batch_tokens=250000,
+        max_concurrency=4,
+        max_retries=5,
+        backoff_base=0.5,
+        max_backoff=20.0,
+        sleep=time.sleep,
+    ):
+        """
+        Args:
+            embedding_helper (EmbeddingHelper): Provides generate_embeddings(texts)
+            batch_size (int): Maximum texts per API request
+            max_batch_tokens (int): Estimated token budget per API request
+            max_concurrency (int): Maximum API requests in flight
+            max_retries (int): Retries per batch for transient errors
+            backoff_base (float): First retry delay in seconds (doubles each attempt)
+            max_backoff (float): Upper bound on a single retry delay
+            sleep (callable): Sleep function (overridable in tests)
+        """
+        self.embedding_helper = embedding_helper
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self._stats_lock = threading.Lock()
+
+    def _backoff(self, attempt, error):
+        """Delay before the given retry attempt, honouring Retry-After when the server sends one."""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base * (2 ** attempt), self.max_backoff)
+        return delay * (0.5 + random.random() / 2)
+
+    def _embed_batch(self, batch, stats):
+        texts = [event['text'] for event in batch]
+        attempt = 0
+        while True:
+            with self._stats_lock:
+                stats['requests'] += 1
+            try:
+                # Retries are handled here, not by the OpenAI client
+                vectors = self.embedding_helper.generate_embeddings(texts, max_retries=0)
+                if len(vectors) != len(batch):
+                    raise ValueError(f"Expected {len(batch)} embeddings, got {len(vectors)}")
+                return vectors
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                with self._stats_lock:
+                    stats['retries'] += 1
+                self.sleep(self._backoff(attempt, e))
+                attempt += 1
+
+    def run(self, events, writer=None):
+        """
+        Embed all events.
+
+        Args:
+            events (list): Dicts with 'ID' and 'text' (events without text are skipped)
+            writer (callable, optional): Called with {event_id: embedding} for every finished batch
+
+        Returns:
+            dict: Throughput report with embedded/failed/skipped counts, failed_ids,
+                  requests, retries, batches, elapsed_seconds and events_per_second
+        """
+        started = time.perf_counter()
+        todo = [event for event in events if event.get('text') and event['text'].strip()]
+        stats = {
+            'embedded': 0,
+            'failed': 0,
+            'skipped': len(events) - len(todo),
+            'failed_ids': [],
+            'requests': 0,
+            'retries': 0,
+            'batches': 0,
+            'estimated_tokens': sum(estimate_tokens(event['text']) for event in todo),
+        }
+
+        batches = make_batches(todo, self.batch_size, self.max_batch_tokens)
+        stats['batches'] = len(batches)
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                futures = {pool.submit(self._embed_batch, batch, stats): batch for batch in batches}
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    ids = [event['ID'] for event in batch]
+                    try:
+                        vectors = future.result()
+                    except Exception as e:
+                        print(f"Error generating embeddings for events {ids[0]}..{ids[-1]}: {e}")
+                        stats['failed'] += len(batch)
+                        stats['failed_ids'].extend(ids)
+                        continue
+
+                    if writer:
+                        try:
+                            writer(dict(zip(ids, vectors)))
+                        except Exception as e:
+                            print(f"Error storing embeddings for events {ids[0]}..{ids[-1]}: {e}")
+                            stats['failed'] += len(batch)
+                            stats['failed_ids'].extend(ids)
+                            continue
+                    stats['embedded'] += len(batch)
+
+        elapsed = time.perf_counter() - started
+        stats['elapsed_seconds'] = round(elapsed, 3)
+        stats['events_per_second'] = round(stats['embedded'] / elapsed, 1) if elapsed > 0 else 0.0
+        return stats
+
+
+def refresh_event_embeddings(dao, embedding_helper, event_ids=None, full=False, **pipeline_options):
+    """
+    Embed new or changed events and store the results.
+
+    Args:
+        dao (DataAccess): Data access object
+        embedding_helper (EmbeddingHelper): Embedding client (its model name is stored per event)
+        event_ids (list, optional): Only consider these events
+        full (bool): Re-embed every event regardless of stored hash/model
+        **pipeline_options: Passed to EmbeddingPipeline (batch_size, max_concurrency, ...)
+
+    Returns:
+        dict: Pipeline throughput report plus 'considered' and 'up_to_date' counts
+    """
+    model = embedding_helper.model
+    candidates = dao.get_all_events_for_embedding(event_ids)
+    events = candidates if full else [event for event in candidates if needs_embedding(event, model)]
+    hashes = {event['ID']: event['content_hash'] for event in events}
+
+    def write(embeddings):
+        dao.store_event_embeddings(embeddings, content_hashes=hashes, model=model)
+
+    report = EmbeddingPipeline(embedding_helper, **pipeline_options).run(events, writer=write)
+    report['considered'] = len(candidates)
+    report['up_to_date'] = len(candidates) - len(events)
+    return report
+
@@ -0,0 +1,130 @@
+"""
+Embedding Providers
+Interchangeable backends that turn texts into embedding vectors.
+
+- openai: OpenAI (or any OpenAI-compatible server) embeddings API
+- local:  deterministic hashed word + character n-gram vectors computed with
+          NumPy; no network access, so search can be tested and benchmarked offline
+
+Select with EMBEDDING_PROVIDER (default "openai"); EMBEDDING_DIM sets the
+local vector size.
+"""
+import os
+import re
+import zlib
+
+import numpy as np
+from openai import OpenAI
+
+PROVIDERS = ("openai", "local")
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class OpenAIEmbeddingProvider:
+    """Embeddings from the OpenAI API"""
+
+    def __init__(self, api_key, base_url=None, model="text-embedding-3-small", http_client=None):
+        if not api_key:
+            raise ValueError("API key is required for embeddings")
+        self.client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        self.model = model
+
+    def embed(self, texts, max_retries=None, timeout=None):
+        """
+        Embed texts with one API request.
+
+        Args:
+            texts (list): Texts to embed
+            max_retries (int, optional): Override the client's built-in retry count
+            timeout (float, optional): Override the client's request timeout in seconds
+
+        Returns:
+            list: One embedding vector per text, in input order
+        """
+        options = {}
+        if max_retries is not None:
+            options["max_retries"] = max_retries
+        if timeout is not None:
+            options["timeout"] = timeout
+        client = self.client.with_options(**options) if options else self.client
+        response = client.embeddings.create(model=self.model, input=list(texts))
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class HashingEmbeddingProvider:
+    """
+    Deterministic local embeddings using the hashing trick.
+
+    Each word and each character n-gram of the padded word is hashed (CRC32)
+    to a bucket and a sign; counts are log-scaled and the vector is L2
+    normalised. Texts sharing words or word fragments get high cosine
+    similarity, which is enough to exercise ranking end to end.
+    """
+
+    def __init__(self, dim=512, ngram_range=(3, 5), word_weight=2.0):
+        self.dim = int(dim)
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+        self.model = f"local-hashing-{self.dim}"
+
+    def _features(self, text):
+        features = []
+        weights = []
+        low, high = self.ngram_range
+        for word in _WORD.findall((text or "").lower()):
+            features.append("w:" + word)
+            weights.append(self.word_weight)
+            padded = f"<{word}>"
+            for n in range(low, high + 1):
+                for start in range(0, max(len(padded) - n + 1, 0)):
+                    features.append(padded[start:start + n])
+                    weights.append(1.0)
+        return features, weights
+
+    def embed_array(self, texts):
+        """Embed texts into a float32 matrix (one L2-normalised row per text)."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features, weights = self._features(text)
+            if not features:
+                continue
+            hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+            buckets = (hashes % self.dim).astype(np.intp)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], buckets, signs * np.asarray(weights, dtype=np.float32))
+
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def embed(self, texts, max_retries=None, timeout=None):
+        """Embed texts; max_retries and timeout are accepted for interface compatibility and ignored."""
+        return self.embed_array(list(texts)).tolist()
+
+
+def get_embedding_provider_name():
+    """Configured provider name (EMBEDDING_PROVIDER, default "openai")."""
+    return (os.getenv("EMBEDDING_PROVIDER") or "openai").strip().lower()
+
+
+def create_embedding_provider(name=None, api_key=None, base_url=None, http_client=None):
+    """
+    Build an embedding provider by name.
+
+    Args:
+        name (str, optional): "openai" or "local" (defaults to EMBEDDING_PROVIDER)
+        api_key (str, optional): OpenAI API key (openai provider only)
+        base_url (str, optional): OpenAI-compatible base URL (openai provider only)
+        http_client (httpx.Client, optional): Shared connection pool (openai provider only)
+
+    Returns:
+        object: Provider with a `model` attribute and `embed(texts, max_retries=None, timeout=None)`
+    """
+    name = (name or get_embedding_provider_name()).lower()
+    if name == "openai":
+        return OpenAIEmbeddingProvider(api_key, base_url=base_url, http_client=http_client)
+    if name in ("local", "hashing"):
+        return HashingEmbeddingProvider(dim=int(os.getenv("EMBEDDING_DIM", 512)))
+    raise ValueError(f"Unknown embedding provider: {name}")
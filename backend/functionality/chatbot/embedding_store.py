@@ -0,0 +1,188 @@
+"""
+Embedding Store
+Compact on-disk snapshot of the event embedding index that worker processes
+map read-only with np.memmap, so the OS page cache holds a single copy shared
+by every worker and startup doesn't need to decode embeddings from MySQL.
+
+File layout (little-endian, every section 64-byte aligned):
+    magic   8 bytes  b"OSKYEMB1"
+    uint32  format version
+    uint32  length of the JSON header
+    JSON header: count, dim, model, created_at, snapshot_at, section offsets,
+                 location table
+    float32 matrix   (count x dim), rows L2-normalized
+    int64   event IDs
+    int64   event dates (days since epoch, NaT for unknown)
+    int64   event start timestamps (seconds since epoch)
+    int32   location codes (index into the header's location table, -1 = none)
+    int64   text offsets (count + 1) into the text blob
+    bytes   UTF-8 searchable text per event (see lexical_index.event_text), so
+            workers build their keyword index without querying MySQL
+
+New versions are written to a temp file and swapped in with os.replace, so
+readers either see the old file or the complete new one.
+"""
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+from .embedding_index import normalize_vector
+from .event_fields import normalize_location, to_day, to_start
+from .lexical_index import event_text
+
+MAGIC = b"OSKYEMB1"
+FORMAT_VERSION = 2
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 64
+
+def _align(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_embedding_store(path, rows, model=None, snapshot_at=None):
+    """
+    Write event embedding rows to an index file and atomically replace `path`.
+
+    Args:
+        path (str): Destination file
+        rows (list): Event dicts with 'ID', 'Date', 'StartTime', 'LocationCity', the
+            searchable text fields and 'embedding'
+        model (str, optional): Embedding model name recorded in the header
+        snapshot_at (float, optional): Time the rows were read (defaults to now); workers
+            re-apply their own changes made after it when they switch to this file
+
+    Returns:
+        int: Number of events written
+    """
+    vectors, ids, days, starts, cities, texts = [], [], [], [], [], []
+    dim = None
+    for row in rows or []:
+        vec = normalize_vector(row.get("embedding"))
+        if vec is None or row.get("ID") is None:
+            continue
+        if dim is None:
+            dim = vec.size
+        if vec.size != dim:
+            continue
+        day = to_day(row.get("Date"))
+        vectors.append(vec)
+        ids.append(int(row["ID"]))
+        days.append(day if day is not None else np.datetime64("NaT", "D"))
+        starts.append(to_start(row.get("Date"), row.get("StartTime")))
+        cities.append(normalize_location(row.get("LocationCity")))
+        texts.append(event_text(row).encode("utf-8"))
+
+    count = len(ids)
+    dim = dim or 0
+    locations = sorted(set(c for c in cities if c))
+    location_codes = {name: code for code, name in enumerate(locations)}
+
+    sections = [
+        ("matrix", np.asarray(vectors, dtype="<f4").reshape(count, dim)),
+        ("ids", np.asarray(ids, dtype="<i8")),
+        ("dates", np.asarray(days, dtype="datetime64[D]").view("<i8")),
+        ("starts", np.asarray(starts, dtype="datetime64[s]").view("<i8")),
+        ("locations", np.asarray([location_codes.get(c, -1) for c in cities], dtype="<i4")),
+        ("text_offsets", np.concatenate(([0], np.cumsum([len(t) for t in texts], dtype=np.int64))).astype("<i8")),
+        ("texts", np.frombuffer(b"".join(texts), dtype=np.uint8)),
+    ]
+
+    created_at = time.time()
+    header = {
+        "count": count,
+        "dim": dim,
+        "model": model,
+        "created_at": created_at,
+        "snapshot_at": created_at if snapshot_at is None else float(snapshot_at),
+        "locations": locations,
+        "offsets": {},
+    }
+    # Offsets depend on the header length, so reserve room generously and fill in afterwards
+    reserve = _align(_PREAMBLE.size + len(json.dumps(header)) + 64 * len(sections) + 256)
+    offset = reserve
+    for name, array in sections:
+        header["offsets"][name] = offset
+        offset = _align(offset + array.nbytes)
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    if _PREAMBLE.size + len(header_bytes) > reserve:
+        raise ValueError("Embedding store header too large")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+            fh.write(header_bytes)
+            for name, array in sections:
+                fh.seek(header["offsets"][name])
+                fh.write(array.tobytes())
+            fh.truncate(max(offset, reserve))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+class EmbeddingStore:
+    """Read-only, memory-mapped view of an embedding store file."""
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with open(path, "rb") as fh:
+            magic, file_version, header_len = _PREAMBLE.unpack(fh.read(_PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an embedding store file")
+            if file_version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported embedding store version {file_version}")
+            self.header = json.loads(fh.read(header_len).decode("utf-8"))
+
+        self.count = int(self.header["count"])
+        self.dim = int(self.header["dim"])
+        self.model = self.header.get("model")
+        self.snapshot_at = float(self.header.get("snapshot_at", self.header.get("created_at", 0.0)))
+        self.locations = list(self.header.get("locations") or [])
+        offsets = self.header["offsets"]
+
+        self.matrix = self._map(offsets["matrix"], "<f4", (self.count, self.dim))
+        self.ids = self._map(offsets["ids"], "<i8", (self.count,))
+        self.dates = self._map(offsets["dates"], "<i8", (self.count,)).view("datetime64[D]")
+        self.starts = self._map(offsets["starts"], "<i8", (self.count,)).view("datetime64[s]")
+        self.location_codes = self._map(offsets["locations"], "<i4", (self.count,))
+        self.text_offsets = self._map(offsets["text_offsets"], "<i8", (self.count + 1,))
+        self.text_blob = self._map(offsets["texts"], "u1", (int(self.text_offsets[-1]),))
+
+    def _map(self, offset, dtype, shape):
+        if 0 in shape:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    def location_names(self):
+        """Per-row normalized location names as an object array."""
+        table = np.array(self.locations + [""], dtype=object)
+        return table[self.location_codes]
+
+    def texts(self):
+        """Yield (event ID, searchable text) for every row."""
+        offsets = self.text_offsets.tolist()
+        blob = self.text_blob.tobytes()
+        for row, event_id in enumerate(self.ids.tolist()):
+            yield event_id, blob[offsets[row] : offsets[row + 1]].decode("utf-8")
+
+    def is_stale(self):
+        """True if the file on disk has been replaced since this store was opened."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self.version
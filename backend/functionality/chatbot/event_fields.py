@@ -0,0 +1,42 @@
+"""
+Event Fields
+Conversions of event columns into the values the embedding index and its
+on-disk store filter on, shared so both encode dates, start times and
+locations the same way.
+"""
+from datetime import date, datetime
+
+import numpy as np
+
+
+def normalize_location(location):
+    """Normalise a city name the same way the SQL filter does (LOWER(TRIM(...)))."""
+    return (location or "").strip().lower()
+
+
+def to_day(value):
+    """Convert a date / ISO string to numpy datetime64[D] (None stays None)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return np.datetime64(value.isoformat(), "D")
+    return np.datetime64(str(value)[:10], "D")
+
+
+def to_start(date_value, time_value):
+    """Combine an event Date and StartTime into numpy datetime64[s]."""
+    day = to_day(date_value)
+    if day is None:
+        return np.datetime64("NaT", "s")
+    seconds = 0
+    if hasattr(time_value, "total_seconds"):
+        seconds = int(time_value.total_seconds())
+    elif time_value:
+        parts = str(time_value).split(":")
+        try:
+            seconds = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(float(parts[2]))
+        except (IndexError, ValueError):
+            seconds = 0
+    return day.astype("datetime64[s]") + np.timedelta64(seconds, "s")
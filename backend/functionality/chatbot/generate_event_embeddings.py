@@ -1,15 +1,21 @@
 """
 Script to generate and store embeddings for all events in the database.
 
-Run this script once to populate embeddings for all existing events.
-When new events are added, you can run this again or integrate embedding
-generation into the event creation process.
+Run this script to populate embeddings for new or changed events; events
+whose text and embedding model are unchanged are skipped (use --full to
+re-embed everything).
+
+After generating, the embeddings are exported to the shared embedding store
+file (EMBEDDING_STORE_PATH) which running workers memory-map and reload
+automatically when it is replaced.
 
 Usage:
-    python3 -m chatbot.generate_event_embeddings
+    python3 -m chatbot.generate_event_embeddings [--batch-size 256] [--concurrency 4] [--max-retries 5] [--full]
 """
+import argparse
 import os
 import sys
+import time
 from dotenv import load_dotenv
 
 # Add parent directory to path to import modules
@@ -17,6 +23,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data_access import DataAccess
 from chatbot.embedding_helper import EmbeddingHelper
+from chatbot.embedding_index import get_store_path
+from chatbot.embedding_providers import get_embedding_provider_name
+from chatbot.embedding_pipeline import refresh_event_embeddings
+from chatbot.embedding_store import write_embedding_store
 
 # Load .env but don't override existing env vars (for Docker compatibility)
 load_dotenv(override=False)
@@ -28,64 +38,78 @@ if os.getenv("MYSQL_HOST") == "35.210.202.5" and not os.getenv("DOCKER_ENV"):
         os.environ["MYSQL_PORT"] = "3301"
 
 
-def generate_all_event_embeddings():
-    """Generate and store embeddings for all events"""
+def generate_all_event_embeddings(batch_size=256, concurrency=4, max_retries=5, full=False):
+    """
+    Generate and store embeddings for new or changed events.
+
+    Each event stores a hash of its embedding source text and the model name;
+    events whose hash and model still match are skipped unless full=True.
+    Texts are sent to the embeddings API in batches with a bounded number of
+    concurrent requests, and each finished batch is written back with a
+    multi-row UPDATE.
+    """
     dao = DataAccess()
     api_key = os.getenv("OPENAI_API_KEY")
     
-    if not api_key:
+    if not api_key and get_embedding_provider_name() == "openai":
         print("ERROR: OPENAI_API_KEY not found in environment variables")
         print("Please set it in your .env file or export it")
         return
     
-    embedding_helper = EmbeddingHelper(api_key)
+    embedding_helper = EmbeddingHelper(api_key, base_url=os.getenv("OPENAI_BASE_URL") or None)
+    dao.ensure_embedding_columns()
     
-    # Get all events that need embeddings
-    events = dao.get_all_events_for_embedding()
+    report = refresh_event_embeddings(
+        dao,
+        embedding_helper,
+        full=full,
+        batch_size=batch_size,
+        max_concurrency=concurrency,
+        max_retries=max_retries,
+    )
     
-    if not events:
+    if not report['considered']:
         print("No events found in database")
-        return
-    
-    print(f"Found {len(events)} events to process")
-    
-    success_count = 0
-    error_count = 0
-    
-    for event in events:
-        event_id = event['ID']
-        event_text = event['text']
-        
-        if not event_text:
-            print(f"Skipping event {event_id}: No text content")
-            continue
-        
-        print(f"Processing event {event_id}: {event.get('text', '')[:50]}...")
-        
-        # Generate embedding
-        embedding = embedding_helper.generate_embedding(event_text)
-        
-        if embedding:
-            # Store embedding
-            dao.store_event_embedding(event_id, embedding)
-            success_count += 1
-            print(f"✓ Stored embedding for event {event_id}")
-        else:
-            error_count += 1
-            print(f"✗ Failed to generate embedding for event {event_id}")
+        return report
     
     print(f"\n=== Summary ===")
-    print(f"Successfully processed: {success_count} events")
-    print(f"Errors: {error_count} events")
-    print(f"Total: {len(events)} events")
+    print(f"Successfully processed: {report['embedded']} events")
+    print(f"Already up to date: {report['up_to_date']} events")
+    print(f"Errors: {report['failed']} events")
+    print(f"Total: {report['considered']} events")
+    print(f"Requests: {report['requests']} ({report['batches']} batches, {report['retries']} retries)")
+    print(f"Throughput: {report['events_per_second']} events/s in {report['elapsed_seconds']}s")
+    if report['failed_ids']:
+        print(f"Failed event IDs: {report['failed_ids']}")
+
+    export_embedding_store(dao, model=embedding_helper.model)
+    return report
+
+
+def export_embedding_store(dao=None, path=None, model=None):
+    """Write every stored event embedding to the shared embedding store file"""
+    dao = dao or DataAccess()
+    path = path or get_store_path()
+    # taken before reading, so workers keep any change they make while the rows are read
+    snapshot_at = time.time()
+    count = write_embedding_store(path, dao.get_event_embedding_rows(), model=model, snapshot_at=snapshot_at)
+    print(f"Exported {count} event embeddings to {path}")
+    return count
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate embeddings for all events")
+    parser.add_argument("--batch-size", type=int, default=256, help="Texts per embeddings request")
+    parser.add_argument("--concurrency", type=int, default=4, help="Embeddings requests in flight")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per batch on transient errors")
+    parser.add_argument("--full", action="store_true", help="Re-embed every event, not just new or changed ones")
+    args = parser.parse_args()
+
     print("Starting embedding generation for all events...")
     print("=" * 50)
     
     try:
-        generate_all_event_embeddings()
+        generate_all_event_embeddings(args.batch_size, args.concurrency, args.max_retries, full=args.full)
         print("\n✓ Embedding generation complete!")
     except Exception as e:
         print(f"\n✗ Error during embedding generation: {e}")
@@ -0,0 +1,143 @@
+"""
+LLM HTTP Pool
+One keep-alive httpx connection pool for every OpenAI (or OpenAI-compatible)
+client in the process, so chat completions and embeddings reuse warm TLS
+connections instead of opening new ones per request.
+
+Limits come from:
+- LLM_HTTP_MAX_CONNECTIONS    (default 20)
+- LLM_HTTP_MAX_KEEPALIVE      (default 10)
+- LLM_HTTP_KEEPALIVE_EXPIRY   seconds an idle connection is kept (default 60)
+- LLM_HTTP_TIMEOUT            seconds per request (default 60)
+"""
+import os
+import threading
+import weakref
+
+import httpx
+
+
+class _CountingTransport(httpx.BaseTransport):
+    """Wraps the pooled transport so every request is counted, including failed ones"""
+
+    def __init__(self, transport, pool):
+        self._transport = transport
+        self._pool = pool
+
+    def handle_request(self, request):
+        self._pool._on_request()
+        response = None
+        try:
+            response = self._transport.handle_request(request)
+            return response
+        finally:
+            # connect errors, timeouts and cancels must leave in_flight too
+            self._pool._on_done(response is not None)
+
+    def close(self):
+        self._transport.close()
+
+
+class LLMHttpPool:
+    """Shared httpx.Client with request and connection statistics"""
+
+    def __init__(self, max_connections=20, max_keepalive=10, keepalive_expiry=60.0, timeout=60.0):
+        """
+        Args:
+            max_connections (int): Upper bound on open connections
+            max_keepalive (int): Idle connections kept open for reuse
+            keepalive_expiry (float): Seconds before an idle connection is closed
+            timeout (float): Request timeout in seconds
+        """
+        self.limits = httpx.Limits(
+            max_connections=int(max_connections),
+            max_keepalive_connections=int(max_keepalive),
+            keepalive_expiry=float(keepalive_expiry),
+        )
+        self._transport = httpx.HTTPTransport(limits=self.limits)
+        self.client = httpx.Client(
+            transport=_CountingTransport(self._transport, self),
+            timeout=httpx.Timeout(float(timeout), connect=10.0),
+        )
+        self._lock = threading.Lock()
+        self._seen_connections = weakref.WeakSet()
+        self.requests = 0
+        self.responses = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.connections_opened = 0
+
+    def _connections(self):
+        # httpcore's pool is not public API; stats degrade to request counts if it moves
+        pool = getattr(self._transport, "_pool", None)
+        try:
+            return list(pool.connections) if pool is not None else []
+        except Exception:
+            return []
+
+    def _on_request(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+
+    def _on_done(self, responded):
+        connections = self._connections()
+        with self._lock:
+            self.in_flight -= 1
+            if responded:
+                self.responses += 1
+            else:
+                self.failed += 1
+            for connection in connections:
+                if connection not in self._seen_connections:
+                    self._seen_connections.add(connection)
+                    self.connections_opened += 1
+
+    def stats(self):
+        """
+        Pool statistics.
+
+        Returns:
+            dict: requests, responses, failed, in_flight, connections_opened, open/idle connection
+                  counts, reuse_ratio (share of requests that didn't open a connection)
+                  and the configured limits
+        """
+        connections = self._connections()
+        idle = 0
+        for connection in connections:
+            try:
+                idle += 1 if connection.is_idle() else 0
+            except Exception:
+                pass
+        with self._lock:
+            requests = self.requests
+            stats = {
+                "requests": requests,
+                "responses": self.responses,
+                "failed": self.failed,
+                "in_flight": self.in_flight,
+                "connections_opened": self.connections_opened,
+            }
+        stats.update({
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "reuse_ratio": round(1 - stats["connections_opened"] / requests, 4) if requests else 0.0,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+        })
+        return stats
+
+    def close(self):
+        """Close every pooled connection."""
+        self.client.close()
+
+
+def create_llm_http_pool():
+    """Build a pool configured from the LLM_HTTP_* environment variables."""
+    return LLMHttpPool(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", 20)),
+        max_keepalive=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", 10)),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", 60)),
+        timeout=float(os.getenv("LLM_HTTP_TIMEOUT", 60)),
+    )
@@ -0,0 +1,219 @@
+"""
+Intent Router
+Local fast path that maps obvious chatbot requests ("show my badges",
+"my upcoming events", "what are my stats") straight to a tool call, so the
+connector can skip the tool-selection LLM round trip.
+
+Two stages, both local:
+- rules:      ordered regular expressions for unambiguous phrasings
+- similarity: cosine similarity against canned example utterances, embedded
+              with the local hashed n-gram provider (no network call)
+
+Anything long, multi-part or asking for reasoning falls back to the LLM.
+"""
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+from .embedding_providers import HashingEmbeddingProvider
+
+
+class IntentMatch(NamedTuple):
+    tool_name: str
+    arguments: dict
+    confidence: float
+    source: str  # "rule" or "similarity"
+
+
+# Tools that only make sense for a logged-in user
+PERSONAL_TOOLS = frozenset({
+    "get_my_upcoming_events",
+    "get_my_completed_events",
+    "get_my_teams",
+    "get_my_badges",
+    "get_available_badges",
+    "get_my_stats",
+    "get_my_team_events",
+})
+
+# Ordered most specific first; the first matching rule wins. Rules only fire on
+# possessive or imperative phrasings about the user ("my stats", "show my badges",
+# "how many hours have i ..."); general questions that merely mention a topic
+# ("what impact does volunteering have?") go to the similarity stage or the model.
+_RULES = [
+    ("get_available_badges", re.compile(
+        r"\bbadges? (can|could) i (still )?(earn|get|unlock)\b"
+        r"|\bbadges? (i )?(haven'?t|have not|still need to|can still) (earned|got|unlocked|earn|get|unlock)\b"
+        r"|^(show |list )?(me )?(the )?(available|unearned|remaining|missing) badges$")),
+    ("get_my_badges", re.compile(
+        r"\bmy badges?\b|\bbadges? (have i|i'?ve|i have) (earned|got|unlocked)\b"
+        r"|^(show |list )?(me )?badges?$")),
+    ("get_my_stats", re.compile(
+        r"\bmy (volunteering )?(stats|statistics|impact|hours)\b"
+        r"|\bhow many hours (have i|did i|i'?ve)\b|^(show )?(me )?stats$")),
+    ("get_my_team_events", re.compile(
+        r"\bmy teams?'?s? events?\b|\bevents? (for|of) my teams?\b")),
+    ("get_my_completed_events", re.compile(
+        r"\bmy (past|completed|previous|attended|finished)( volunteering)? events?\b"
+        r"|\bevents? i'?(ve| have) (done|attended|completed)\b|\bmy volunteering history\b")),
+    ("get_my_upcoming_events", re.compile(
+        r"\bmy( next| upcoming| registered| booked)?( \d{1,2})? events?\b"
+        r"|\b(am i|i'?m) (signed up|registered|booked) (for|on)\b|\bmy upcoming\b")),
+    ("get_my_teams", re.compile(
+        r"\bmy teams?\b|\bteams? (am i|i'?m) (in|on|part of)$")),
+    ("list_teams", re.compile(
+        r"^(list|show)( me)?( all| the| available| other)? teams$"
+        r"|\b(what|which) teams (can|could) i join\b|^(what|which) teams are there$")),
+]
+
+# Canned utterances for the similarity stage
+EXAMPLES: Dict[str, List[str]] = {
+    "get_my_upcoming_events": [
+        "show my upcoming events", "what events am i registered for",
+        "my next volunteering events", "what have i signed up for",
+        "events i am booked on", "my registered events",
+    ],
+    "get_my_completed_events": [
+        "show my past events", "events i have attended",
+        "my completed volunteering", "my volunteering history",
+        "what events have i done",
+    ],
+    "get_my_teams": [
+        "show my teams", "which teams am i in", "teams i belong to",
+        "my team memberships",
+    ],
+    "list_teams": [
+        "list all teams", "what teams can i join", "show available teams",
+        "other teams on the platform",
+    ],
+    "get_my_badges": [
+        "show my badges", "what badges have i earned", "my achievements",
+        "badges i have",
+    ],
+    "get_available_badges": [
+        "what badges can i earn", "badges i have not earned yet",
+        "remaining badges to unlock", "available badges",
+    ],
+    "get_my_stats": [
+        "what are my stats", "show my impact", "how many hours have i volunteered",
+        "my volunteering statistics", "how am i doing",
+    ],
+    "get_my_team_events": [
+        "show my team events", "events my teams are registered for",
+        "what is my team doing",
+    ],
+}
+
+# Phrasings that need the model: explanations, advice, comparisons, several asks,
+# actions on the user's data ("cancel my event", "leave my team") and searches
+# ("find events like my past events"); the rules below only read
+_NEEDS_MODEL = re.compile(
+    r"\b(why|how come|should|recommend|suggest|compare|explain|difference|versus|vs|"
+    r"and|also|but|or|if|instead|except|near|around|in [a-z]|"
+    r"today|tonight|tomorrow|week|weekend|month|monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"cancel|unregister|deregister|withdraw|unsubscribe|register|sign (me )?up|book|leave|quit|exit|"
+    r"delete|remove|drop|add|create|edit|change|update|rename|reschedule|move|"
+    r"how (do|can|should) i|how to|"
+    r"find|search|look(ing)? for|like|similar|other|more|new)\b"
+    # "what teams can i join" is a read; "join my team" / "how do i join" are not
+    r"|(?<!can i )(?<!could i )\bjoin\b"
+)
+_LIMIT = re.compile(r"\b(\d{1,2})\b")
+_CLEAN = re.compile(r"[^a-z0-9' ]+")
+
+MAX_WORDS = 10
+
+
+def _normalise(message: str) -> str:
+    return " ".join(_CLEAN.sub(" ", (message or "").lower()).split())
+
+
+class IntentRouter:
+    """
+    Classifies a chatbot message into a single argument-light tool call when
+    confident, otherwise returns None so the caller asks the LLM.
+    """
+
+    def __init__(self, threshold: float = 0.85, margin: float = 0.08, provider=None):
+        self.threshold = threshold
+        self.margin = margin
+        self.provider = provider or HashingEmbeddingProvider(dim=512)
+        self._labels = [tool for tool, utterances in EXAMPLES.items() for _ in utterances]
+        self._matrix = self.provider.embed_array(
+            [utterance for utterances in EXAMPLES.values() for utterance in utterances]
+        )
+
+    def route(self, message: str, user_email: Optional[str] = None) -> Optional[IntentMatch]:
+        """
+        Map a message to a tool call.
+
+        Args:
+            message (str): Sanitised user message
+            user_email (str, optional): Logged-in user; personal tools need one
+
+        Returns:
+            IntentMatch or None: None means "not sure, ask the model"
+        """
+        text = _normalise(message)
+        words = text.split()
+        if not words or len(words) > MAX_WORDS:
+            return None
+
+        # "my events in London" / "my events and badges" need the model
+        if _NEEDS_MODEL.search(text):
+            return None
+
+        match = self._match_rules(text) or self._match_similarity(text)
+        if match is None:
+            return None
+        if match.tool_name in PERSONAL_TOOLS and not user_email:
+            return None
+        return match
+
+    def _match_rules(self, text: str) -> Optional[IntentMatch]:
+        for tool_name, pattern in _RULES:
+            if pattern.search(text):
+                return IntentMatch(tool_name, self._arguments(tool_name, text), 1.0, "rule")
+        return None
+
+    def _match_similarity(self, text: str) -> Optional[IntentMatch]:
+        query = self.provider.embed_array([text])[0]
+        if not query.any():
+            return None
+        scores = self._matrix @ query
+
+        # best score per tool, so near-duplicate examples don't count as a margin
+        best: Dict[str, float] = {}
+        for label, score in zip(self._labels, scores.tolist()):
+            if score > best.get(label, -1.0):
+                best[label] = score
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        tool_name, top = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+        if top < self.threshold or top - runner_up < self.margin:
+            return None
+        return IntentMatch(tool_name, self._arguments(tool_name, text), round(float(top), 4), "similarity")
+
+    @staticmethod
+    def _arguments(tool_name: str, text: str) -> dict:
+        if tool_name in ("get_my_upcoming_events", "get_my_completed_events"):
+            limit = _LIMIT.search(text)
+            if limit and 0 < int(limit.group(1)) <= 50:
+                return {"limit": int(limit.group(1))}
+        return {}
+
+
+_router: Optional[IntentRouter] = None
+
+
+def get_intent_router() -> Optional[IntentRouter]:
+    """
+    Process-wide router, or None when disabled with CHATBOT_INTENT_ROUTER=0.
+    CHATBOT_INTENT_THRESHOLD overrides the similarity threshold.
+    """
+    global _router
+    if os.getenv("CHATBOT_INTENT_ROUTER", "1").strip().lower() in ("0", "false", "off", "no"):
+        return None
+    if _router is None:
+        _router = IntentRouter(threshold=float(os.getenv("CHATBOT_INTENT_THRESHOLD", 0.85)))
+    return _router
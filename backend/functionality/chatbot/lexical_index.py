@@ -0,0 +1,106 @@
+"""
+Lexical Index
+In-memory BM25 keyword index over event text (title, description, cause,
+tags, city), used alongside vector similarity for hybrid event search.
+"""
+import math
+import re
+from collections import Counter
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are at be by for from i in is it me my of on or the to with "
+    "any some find show get want looking events event volunteer volunteering".split()
+)
+
+# Fields that make up the searchable text of an event row
+TEXT_FIELDS = ("Title", "About", "CauseName", "TagName", "LocationCity")
+
+
+def _stem(token):
+    """Very light plural stemming so 'parks' matches 'park' and 'charities' matches 'charity'."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Lower-case word tokens with stopwords removed and plurals folded."""
+    return [_stem(token) for token in _TOKEN.findall((text or "").lower()) if token not in _STOPWORDS]
+
+
+def event_text(row):
+    """Searchable text of an event row."""
+    return " ".join(str(row[field]) for field in TEXT_FIELDS if row.get(field))
+
+
+class BM25Index:
+    """Okapi BM25 over documents keyed by event ID, supporting incremental add/remove"""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def clear(self):
+        self._postings = {}
+        self._doc_len = {}
+        self._doc_terms = {}
+        self._total_len = 0
+
+    def __len__(self):
+        return len(self._doc_len)
+
+    def add(self, doc_id, text):
+        """Index (or re-index) a document."""
+        self.remove(doc_id)
+        counts = Counter(tokenize(text))
+        self._doc_terms[doc_id] = tuple(counts)
+        self._doc_len[doc_id] = sum(counts.values())
+        self._total_len += self._doc_len[doc_id]
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id):
+        """Drop a document. Returns True if it was indexed."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        self._total_len -= self._doc_len.pop(doc_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        return True
+
+    def score(self, query):
+        """
+        BM25 score of every document containing at least one query term.
+
+        Args:
+            query (str): Free-text query
+
+        Returns:
+            dict: doc_id -> score (documents without matching terms are omitted)
+        """
+        n_docs = len(self._doc_len)
+        terms = set(tokenize(query))
+        if not n_docs or not terms:
+            return {}
+        avg_len = self._total_len / n_docs or 1.0
+
+        scores = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
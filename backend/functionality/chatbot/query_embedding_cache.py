@@ -0,0 +1,231 @@
+"""
+Query Embedding Cache
+Bounded LRU cache of normalized search text -> embedding vector, so repeated
+chatbot searches ("beach cleanup", "volunteering this weekend") skip the
+embeddings API round trip.
+
+Vectors are kept as float32 arrays in memory. When a SQLite path is given,
+entries are also written to disk and looked up there on a memory miss, so
+the cache survives restarts and is shared by workers on the same host.
+The lock only guards the in-memory LRU; SQLite reads and writes happen
+outside it on a per-thread connection, so memory hits never wait on disk.
+close() closes every thread's connection; later lookups open new ones.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+# Punctuation that doesn't change what the user is searching for
+_EDGE_PUNCTUATION = "?!.,;:'\"` "
+
+
+def normalize_query(text):
+    """Cache key for a query: Unicode-normalized, case-folded, whitespace collapsed."""
+    text = unicodedata.normalize("NFKC", text or "")
+    text = _WHITESPACE.sub(" ", text.casefold())
+    return text.strip(_EDGE_PUNCTUATION)
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache of query embeddings with optional SQLite persistence"""
+
+    def __init__(self, max_entries=1024, sqlite_path=None, max_disk_entries=100000):
+        """
+        Args:
+            max_entries (int): Maximum vectors kept in memory
+            sqlite_path (str, optional): SQLite file used to persist entries across restarts
+            max_disk_entries (int): Oldest rows beyond this are pruned from the SQLite file
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.max_disk_entries = max_disk_entries
+        self.sqlite_path = sqlite_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+        self._generation = 0
+        self._persistent = False
+        self._disk_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if sqlite_path:
+            self._open_db(sqlite_path)
+
+    def _open_db(self, path):
+        try:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            db = self._connect()
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS query_embeddings (
+                    model TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, query)
+                )
+                """
+            )
+            db.commit()
+            self._persistent = True
+        except sqlite3.Error as e:
+            print(f"Query embedding cache persistence disabled ({path}): {e}")
+            self._persistent = False
+
+    def _connect(self):
+        # check_same_thread=False only so close() can close it from another thread;
+        # each connection is still used by the thread that opened it
+        db = sqlite3.connect(self.sqlite_path, timeout=5, check_same_thread=False)
+        with self._lock:
+            self._connections.append(db)
+            self._local.db = db
+            self._local.generation = self._generation
+        return db
+
+    def _connection(self):
+        """This thread's SQLite connection (sqlite3 connections must not be shared between threads)."""
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.generation != self._generation:
+            db = self._connect()
+        return db
+
+    def get(self, text, model):
+        """
+        Look up a cached embedding.
+
+        Returns:
+            list: Embedding vector, or None on a miss
+        """
+        key = (model, normalize_query(text))
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector.tolist()
+
+        vector = self._load_from_disk(key)
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+                return None
+            self._remember(key, vector)
+            self.hits += 1
+            self.disk_hits += 1
+        return vector.tolist()
+
+    def put(self, text, model, embedding):
+        """Store an embedding for the query text."""
+        if not embedding:
+            return
+        key = (model, normalize_query(text))
+        if not key[1]:
+            return
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+        self._save_to_disk(key, vector)
+
+    def _remember(self, key, vector):
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_from_disk(self, key):
+        if not self._persistent:
+            return None
+        try:
+            db = self._connection()
+            row = db.execute(
+                "SELECT embedding FROM query_embeddings WHERE model = ? AND query = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE query_embeddings SET last_used = ? WHERE model = ? AND query = ?",
+                (time.time(), *key),
+            )
+            db.commit()
+            return np.frombuffer(row[0], dtype=np.float32).copy()
+        except sqlite3.Error as e:
+            print(f"Error reading query embedding cache: {e}")
+            return None
+
+    def _save_to_disk(self, key, vector):
+        if not self._persistent:
+            return
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % 1000 == 0
+        try:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO query_embeddings (model, query, embedding, last_used) VALUES (?, ?, ?, ?)",
+                (*key, vector.tobytes(), time.time()),
+            )
+            if prune:
+                db.execute(
+                    """
+                    DELETE FROM query_embeddings WHERE rowid IN (
+                        SELECT rowid FROM query_embeddings ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_disk_entries,),
+                )
+            db.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing query embedding cache: {e}")
+
+    def stats(self):
+        """Hit-rate counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "persistent": self._persistent,
+            }
+
+    def close(self):
+        """Close every thread's SQLite connection (threads reconnect on their next disk access)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for db in connections:
+            try:
+                db.close()
+            except sqlite3.Error as e:
+                print(f"Error closing query embedding cache: {e}")
+
+    def clear(self):
+        """Drop every in-memory entry and reset the counters (the SQLite file is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+
+# Process-wide cache shared by every ChatbotConnector in this worker
+_query_cache = QueryEmbeddingCache(
+    max_entries=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", 1024)),
+    sqlite_path=os.getenv("QUERY_EMBEDDING_CACHE_PATH") or None,
+)
+
+
+def get_query_embedding_cache():
+    """Return the process-wide query embedding cache."""
+    return _query_cache
@@ -0,0 +1,357 @@
+"""
+Resilience
+Deadlines, retries, hedging and circuit breaking for the chatbot's calls to
+the LLM and embedding APIs, so a provider slowdown degrades chats quickly
+instead of tying up every chat worker.
+
+- Every attempt gets a timeout, and all attempts of one call share a
+  deadline
+- Transient failures (timeouts, connection errors, 429, 5xx) are retried
+  with exponential backoff and full jitter while the deadline allows
+- Optionally, an idempotent call still running after hedge_after seconds
+  gets a second, parallel attempt and the first to succeed wins
+- A circuit breaker per dependency opens after consecutive failures; while
+  open, calls fail immediately with CircuitOpenError so callers use their
+  fallback, and after reset_timeout one probe call decides whether it closes
+
+The connector falls back to keyword search when embeddings are unavailable
+and to a templated answer when the answer completion fails.
+
+Settings (per dependency, LLM / EMBEDDING):
+CHATBOT_LLM_TIMEOUT, CHATBOT_LLM_DEADLINE, CHATBOT_LLM_RETRIES, CHATBOT_LLM_HEDGE_AFTER,
+CHATBOT_EMBEDDING_TIMEOUT, CHATBOT_EMBEDDING_DEADLINE, CHATBOT_EMBEDDING_RETRIES,
+CHATBOT_EMBEDDING_HEDGE_AFTER, CHATBOT_BREAKER_FAILURES, CHATBOT_BREAKER_RESET.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import httpx
+import openai
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call's deadline passes before any attempt succeeds."""
+
+
+def is_transient(error):
+    """True for failures worth retrying (and that say something about the provider's health)."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError,
+                          openai.InternalServerError, httpx.TimeoutException, httpx.TransportError,
+                          TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    return status == 429 or (status is not None and status >= 500)
+
+
+def _is_client_error(error):
+    status = getattr(error, "status_code", None)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        """
+        Args:
+            name (str): Dependency name (for stats and errors)
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open before a probe is allowed
+            clock (callable): Time source
+        """
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self):
+        """True when a call may go ahead (closed, or the single half-open probe)."""
+        with self._lock:
+            state = self._state_locked()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self._state_locked(),
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+class ResilientCaller:
+    """Runs calls to one dependency with timeouts, a deadline, retries, hedging and a breaker"""
+
+    def __init__(self, name, timeout=20.0, deadline=30.0, max_retries=2, backoff_base=0.25, backoff_max=2.0,
+                 hedge_after=None, breaker=None, sleep=time.sleep, clock=time.monotonic, rng=None):
+        """
+        Args:
+            name (str): Dependency name
+            timeout (float): Per-attempt timeout in seconds
+            deadline (float): Budget for the whole call, retries included
+            max_retries (int): Retries after the first attempt (transient errors only)
+            backoff_base (float): First retry's maximum backoff; doubles per retry
+            backoff_max (float): Backoff cap
+            hedge_after (float, optional): Start a parallel second attempt after this many
+                seconds; None disables hedging
+            breaker (CircuitBreaker, optional): Defaults to a breaker named after the dependency
+        """
+        self.name = name
+        self.timeout = float(timeout)
+        self.deadline = float(deadline)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = float(backoff_base)
+        self.backoff_max = float(backoff_max)
+        self.hedge_after = float(hedge_after) if hedge_after else None
+        self.breaker = breaker or CircuitBreaker(name)
+        self._sleep = sleep
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._hedge_pool = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+
+    def call(self, fn, deadline=None, hedge=True):
+        """
+        Call fn(timeout) until it succeeds, the deadline passes or the error isn't transient.
+
+        Args:
+            fn (callable): Makes one attempt; receives the attempt's timeout in seconds
+            deadline (float, optional): Override the call budget in seconds
+            hedge (bool): Allow a hedged attempt (only for idempotent, non-streaming calls)
+
+        Returns:
+            The first successful attempt's result
+
+        Raises:
+            CircuitOpenError: The breaker is open
+            DeadlineExceeded: The budget ran out before an attempt succeeded
+            Exception: The last attempt's error when it isn't transient or retries ran out
+        """
+        with self._lock:
+            self.calls += 1
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+
+        ends_at = self._clock() + (self.deadline if deadline is None else float(deadline))
+        attempt = 0
+        while True:
+            remaining = ends_at - self._clock()
+            if remaining <= 0:
+                self._failed(None)
+                with self._lock:
+                    self.deadline_exceeded += 1
+                raise DeadlineExceeded(f"{self.name} call exceeded its deadline")
+            attempt_timeout = min(self.timeout, remaining)
+            try:
+                if hedge and self.hedge_after is not None and self.hedge_after < attempt_timeout:
+                    result = self._hedged(fn, attempt_timeout)
+                else:
+                    result = fn(attempt_timeout)
+                self.breaker.record_success()
+                return result
+            except Exception as error:
+                if _is_client_error(error):
+                    # our request was bad; the provider is fine
+                    self.breaker.record_success()
+                    raise
+                if not is_transient(error) or attempt >= self.max_retries:
+                    self._failed(error)
+                    raise
+                backoff = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                if self._clock() + backoff >= ends_at:
+                    self._failed(error)
+                    with self._lock:
+                        self.deadline_exceeded += 1
+                    raise DeadlineExceeded(f"{self.name} call exceeded its deadline") from error
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                print(f"[{self.name}] transient error ({error.__class__.__name__}), retry {attempt} in {backoff:.2f}s")
+                self._sleep(backoff)
+
+    def call_stream(self, fn, deadline=None):
+        """
+        Like call (never hedged) for a streamed response. call() returns as soon as
+        the response headers arrive, so the chunks are read through a wrapper that
+        keeps the same deadline and breaker in charge of the body.
+
+        Args:
+            fn (callable): Opens the stream; receives the attempt's timeout in seconds
+            deadline (float, optional): Override the call budget in seconds
+
+        Returns:
+            Iterator over the stream's chunks; closing it closes the stream
+
+        Raises:
+            DeadlineExceeded: (while iterating) the budget ran out mid-stream
+            Exception: (while iterating) the stream's error, recorded as a breaker failure
+        """
+        budget = self.deadline if deadline is None else float(deadline)
+        ends_at = self._clock() + budget
+        stream = self.call(fn, deadline=budget, hedge=False)
+        return self._guard_stream(stream, ends_at)
+
+    def _guard_stream(self, stream, ends_at):
+        try:
+            for chunk in stream:
+                if self._clock() >= ends_at:
+                    with self._lock:
+                        self.deadline_exceeded += 1
+                    raise DeadlineExceeded(f"{self.name} stream exceeded its deadline")
+                yield chunk
+        except Exception as error:
+            self._failed(error)
+            raise
+        finally:
+            # runs on errors and when the consumer stops early (GeneratorExit)
+            if hasattr(stream, "close"):
+                stream.close()
+
+    def _failed(self, error):
+        self.breaker.record_failure()
+        with self._lock:
+            self.failures += 1
+
+    def _hedged(self, fn, attempt_timeout):
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix=f"{self.name}-hedge")
+            pool = self._hedge_pool
+        started = self._clock()
+        primary = pool.submit(fn, attempt_timeout)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        with self._lock:
+            self.hedges += 1
+        backup = pool.submit(fn, max(0.0, attempt_timeout - (self._clock() - started)))
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, attempt_timeout - (self._clock() - started)),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"{self.name} attempt timed out")
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def reset(self):
+        """Close the breaker (e.g. between tests or after an operator fixed the provider)."""
+        self.breaker.reset()
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "deadline_exceeded": self.deadline_exceeded,
+                "timeout": self.timeout,
+                "deadline": self.deadline,
+            }
+        stats["breaker"] = self.breaker.stats()
+        return stats
+
+
+def _caller_from_env(name, prefix, timeout, deadline, retries):
+    hedge_after = os.getenv(f"CHATBOT_{prefix}_HEDGE_AFTER")
+    return ResilientCaller(
+        name,
+        timeout=float(os.getenv(f"CHATBOT_{prefix}_TIMEOUT", timeout)),
+        deadline=float(os.getenv(f"CHATBOT_{prefix}_DEADLINE", deadline)),
+        max_retries=int(os.getenv(f"CHATBOT_{prefix}_RETRIES", retries)),
+        hedge_after=float(hedge_after) if hedge_after else None,
+        breaker=CircuitBreaker(
+            name,
+            failure_threshold=int(os.getenv("CHATBOT_BREAKER_FAILURES", 5)),
+            reset_timeout=float(os.getenv("CHATBOT_BREAKER_RESET", 30)),
+        ),
+    )
+
+
+# Process-wide, so every chat sees (and contributes to) the same provider health
+_llm_caller = _caller_from_env("llm", "LLM", timeout=20, deadline=30, retries=2)
+_embedding_caller = _caller_from_env("embedding", "EMBEDDING", timeout=3, deadline=5, retries=1)
+
+
+def get_llm_caller():
+    """Return the process-wide resilient caller for chat completions."""
+    return _llm_caller
+
+
+def get_embedding_caller():
+    """Return the process-wide resilient caller for query embeddings."""
+    return _embedding_caller
@@ -0,0 +1,244 @@
+"""
+Response Cache
+Semantic cache of general (no tool call) chatbot answers, so platform FAQs
+("how do teams work?", "how do I earn badges?") are answered without an LLM
+call once someone has asked them.
+
+- Questions are embedded with the local hashed n-gram provider (no network
+  call) and matched by cosine similarity; a match must also share its content
+  words with the cached question, so "join a team" never returns the answer
+  for "leave a team"
+- Only non-personalized answers are stored: questions about the user's own
+  data, the conversation so far or dates are skipped, as are answers that
+  mention the user's name or email
+- Entries expire after a TTL and the least recently used are evicted beyond
+  max_entries
+
+Configured with CHATBOT_RESPONSE_CACHE (on/off), CHATBOT_RESPONSE_CACHE_THRESHOLD,
+CHATBOT_RESPONSE_CACHE_TTL and CHATBOT_RESPONSE_CACHE_SIZE.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .embedding_providers import HashingEmbeddingProvider
+
+_CLEAN = re.compile(r"[^a-z0-9' ]+")
+
+# Questions whose answer depends on who asks, what was said before, or when
+_NOT_CACHEABLE = re.compile(
+    r"\b(my|mine|myself|i'm|im|i've|ive|i'd|am i|did i|have i|was i|"
+    r"it|its|that|this|these|those|them|they|again|above|earlier|previous|before|same|"
+    r"today|tonight|tomorrow|yesterday|now|week|weekend|month|year|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b"
+)
+
+_STOPWORDS = frozenset(
+    "a an the is are was were be do does did can could would will shall should may might must "
+    "i you we he she me us your our how what what's whats where when who why which there here "
+    "to of in on at for from by with about as into and or if so just please tell explain "
+    "hi hello hey thanks thank".split()
+)
+
+MAX_WORDS = 20
+
+
+def normalise_question(message: str) -> str:
+    return " ".join(_CLEAN.sub(" ", (message or "").lower()).split())
+
+
+def _content_words(text: str) -> frozenset:
+    # crude plural folding so "team" and "teams" count as the same word
+    return frozenset(
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+        for word in text.split()
+        if word not in _STOPWORDS
+    )
+
+
+class _Entry:
+    __slots__ = ("answer", "expires", "vector", "words")
+
+    def __init__(self, answer, expires, vector, words):
+        self.answer = answer
+        self.expires = expires
+        self.vector = vector
+        self.words = words
+
+
+class SemanticResponseCache:
+    """Thread-safe TTL/LRU cache of general answers, looked up by question similarity"""
+
+    def __init__(self, threshold=0.85, min_word_overlap=0.8, ttl_seconds=3600.0, max_entries=1000,
+                 provider=None, clock=time.monotonic):
+        """
+        Args:
+            threshold (float): Minimum cosine similarity between questions
+            min_word_overlap (float): Minimum Jaccard overlap of the questions' content words
+            ttl_seconds (float): Entry lifetime
+            max_entries (int): Cached answers; least recently used evicted beyond this
+            provider: Embedding provider with embed_array (defaults to the local hashing provider)
+            clock (callable): Time source
+        """
+        self.threshold = float(threshold)
+        self.min_word_overlap = float(min_word_overlap)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self.provider = provider or HashingEmbeddingProvider(dim=512)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # normalised question -> _Entry
+        self._keys = []
+        self._matrix = None  # rebuilt lazily after the entries change
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def is_cacheable_question(message: str) -> bool:
+        """True for general questions whose answer doesn't depend on the user or the conversation."""
+        text = normalise_question(message)
+        words = text.split()
+        return 0 < len(words) <= MAX_WORDS and not _NOT_CACHEABLE.search(text) and bool(_content_words(text))
+
+    def _embed(self, text):
+        return self.provider.embed_array([text])[0]
+
+    def _matrix_locked(self):
+        if self._matrix is None:
+            self._keys = list(self._entries)
+            self._matrix = (
+                np.vstack([self._entries[key].vector for key in self._keys]) if self._keys else None
+            )
+        return self._matrix
+
+    def _drop_locked(self, key):
+        del self._entries[key]
+        self._matrix = None
+
+    def get(self, message: str) -> Optional[str]:
+        """
+        Cached answer for a similar earlier question.
+
+        Args:
+            message (str): Sanitised user message
+
+        Returns:
+            str or None: The answer, or None on a miss (or an uncacheable question)
+        """
+        if not self.is_cacheable_question(message):
+            return None
+        text = normalise_question(message)
+        words = _content_words(text)
+        query = self._embed(text)
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(text)
+            if entry is None and query.any():
+                matrix = self._matrix_locked()
+                if matrix is not None:
+                    scores = matrix @ query
+                    for index in np.argsort(-scores):
+                        if scores[index] < self.threshold:
+                            break
+                        candidate = self._entries[self._keys[index]]
+                        if len(words & candidate.words) / len(words | candidate.words) >= self.min_word_overlap:
+                            text, entry = self._keys[index], candidate
+                            break
+            if entry is not None and entry.expires < now:
+                self._drop_locked(text)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return entry.answer
+
+    def put(self, message: str, answer: str, personal_terms: Iterable[str] = ()) -> bool:
+        """
+        Store a general answer.
+
+        Args:
+            message (str): Sanitised user message the answer was given to
+            answer (str): Model answer (no tool calls were made)
+            personal_terms: Strings identifying the user (first name, email); an answer
+                containing any of them is not stored
+
+        Returns:
+            bool: True when stored
+        """
+        answer = (answer or "").strip()
+        lowered = answer.lower()
+        terms = [term.lower() for term in personal_terms if term and len(term) > 1]
+        if (
+            not answer
+            or not self.is_cacheable_question(message)
+            or any(re.search(rf"\b{re.escape(term)}\b", lowered) for term in terms)
+        ):
+            with self._lock:
+                self.skipped += 1
+            return False
+
+        text = normalise_question(message)
+        entry = _Entry(answer, self._clock() + self.ttl_seconds, self._embed(text), _content_words(text))
+        with self._lock:
+            if text in self._entries:
+                self._drop_locked(text)
+            self._entries[text] = entry
+            self._matrix = None
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stores += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "skipped": self.skipped,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+            }
+
+
+_response_cache: Optional[SemanticResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[SemanticResponseCache]:
+    """
+    Process-wide response cache, or None when disabled with CHATBOT_RESPONSE_CACHE=0.
+    """
+    global _response_cache
+    if os.getenv("CHATBOT_RESPONSE_CACHE", "1").strip().lower() in ("0", "false", "off", "no"):
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = SemanticResponseCache(
+                    threshold=float(os.getenv("CHATBOT_RESPONSE_CACHE_THRESHOLD", 0.85)),
+                    ttl_seconds=float(os.getenv("CHATBOT_RESPONSE_CACHE_TTL", 3600)),
+                    max_entries=int(os.getenv("CHATBOT_RESPONSE_CACHE_SIZE", 1000)),
+                )
+    return _response_cache
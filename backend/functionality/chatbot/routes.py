@@ -4,8 +4,9 @@ Flask blueprint for chatbot endpoints
 """
 from flask import Blueprint, request, jsonify, g
 from flask_cors import CORS
-from .connector import ChatbotConnector, PromptInjectionError
-from auth.routes import token_required
+from .connector import get_chatbot_connector, PromptInjectionError
+from .chat_workers import get_chat_worker_pool
+from auth.routes import ops_required, token_required
 
 bp = Blueprint("chatbot", __name__, url_prefix="/api/chatbot")
 CORS(bp, supports_credentials=True)
@@ -36,7 +37,13 @@ def chat():
     user_email = g.current_user.get("sub")
 
     try:
-        connector = ChatbotConnector()
+        connector = get_chatbot_connector()
+        # stage timings go back to the client only when CHATBOT_DEBUG_TIMINGS is on
+        timings = {} if getattr(connector, "debug_timings", False) else None
+        if timings is not None:
+            result = connector.process_message(message, user_email, timings=timings)
+        else:
+            result = connector.process_message(message, user_email)
         (
             response_text,
             category,
@@ -44,12 +51,14 @@ def chat():
             teams_list,
             badges_list,
             team_events_list,
-        ) = connector.process_message(message, user_email)
+        ) = result
 
         response_data = {
             "response": response_text,
             "category": category,
         }
+        if timings:
+            response_data["timings"] = timings
 
         # If events are present, include them
         if events_list:
@@ -103,3 +112,27 @@ def chat():
             ),
             500,
         )
+
+
+@bp.route("/stats", methods=["GET"])
+@token_required
+@ops_required
+def stats():
+    """
+    GET /api/chatbot/stats (operators only, see OPS_USER_EMAILS)
+    Returns: {"http_pool": {...}, "prompts": {...}, "stages": {...}, "caches": {...},
+    "resilience": {...}, "chat_workers": {...}} connection pool, prompt-size, per-stage latency,
+    cache and retry/circuit breaker statistics for the shared connector, plus socket chat worker load
+    """
+    try:
+        connector = get_chatbot_connector()
+        return jsonify({
+            "http_pool": connector.pool_stats(),
+            "prompts": connector.prompt_stats(),
+            "stages": connector.stage_stats(),
+            "caches": connector.cache_stats(),
+            "resilience": connector.resilience_stats(),
+            "chat_workers": get_chat_worker_pool().stats(),
+        }), 200
+    except ValueError as ve:
+        return jsonify({"error": "Chatbot is not configured", "details": str(ve)}), 500
@@ -2,23 +2,47 @@
 socket_chat.py
 WebSocket / Socket.IO bridge for the OneSky chatbot.
 
-- Listens for: "chatbot_message"
+- Listens for: "chatbot_message", "chatbot_cancel"
 - Streams back: "chatbot_response"
+- Generation for a client stops when it sends "chatbot_cancel" or disconnects
+- Chat turns run on the bounded chat worker pool, so handlers return at once;
+  a user with too many turns in flight gets a "busy" reply instead of queueing
+- SOCKETIO_ASYNC_MODE selects the server: "gevent" (the container default;
+  gevent's WSGI server with WebSockets through simple-websocket), "threading"
+  (local development on Werkzeug) or "eventlet" (must be installed); app.py
+  monkey-patches for gevent and eventlet
 - NOW: extracts user_email from the same JWT cookie ("access_token") in Flask routes
 """
 
 import os
+import threading
 import jwt
 from flask import request, current_app
 from flask_socketio import SocketIO, join_room
 
-from .connector import ChatbotConnector
+from .connector import get_chatbot_connector
+from .chat_workers import ChatBusyError, get_chat_worker_pool
+
+# explicit, so an installed-but-unpatched eventlet is never picked automatically
+SOCKETIO_ASYNC_MODE = (os.getenv("SOCKETIO_ASYNC_MODE") or "threading").strip().lower()
 
 # create socketio instance (init_app happens in app.py)
-socketio = SocketIO(cors_allowed_origins="*")
+socketio = SocketIO(cors_allowed_origins="*", async_mode=SOCKETIO_ASYNC_MODE)
+
+
+# sid -> threading.Event for the reply currently being generated
+_active_streams: dict = {}
+_active_streams_lock = threading.Lock()
 
-# single chatbot instance
-chatbot = ChatbotConnector()
+
+def _cancel_stream(sid) -> bool:
+    """Signal the in-flight reply for this client (if any) to stop."""
+    with _active_streams_lock:
+        cancel_event = _active_streams.get(sid)
+    if cancel_event is None:
+        return False
+    cancel_event.set()
+    return True
 
 
 def _get_user_email_from_cookie() -> str | None:
@@ -52,6 +76,13 @@ def handle_connect():
 @socketio.on("disconnect")
 def handle_disconnect():
     print(f"[socket] client disconnected: {request.sid}")
+    _cancel_stream(request.sid)
+
+
+@socketio.on("chatbot_cancel")
+def handle_chatbot_cancel(payload=None):
+    """Client pressed stop: end generation of the current reply."""
+    _cancel_stream(request.sid)
 
 
 @socketio.on("chatbot_message")
@@ -83,17 +114,56 @@ def handle_chatbot_message(payload):
 
     print(f"[socket] message from {user_email or 'anonymous'}: {user_message}")
 
-    # define how the connector should emit
-    def emit_fn(event_name: str, data: dict, room: str = None):
-        if room:
-            socketio.emit(event_name, data, room=room)
-        else:
-            socketio.emit(event_name, data)
-
-    # run streaming logic
-    chatbot.process_message_stream(
-        user_message=user_message,
-        user_email=user_email,
-        emit_fn=emit_fn,
-        room=room,
-    )
+    # a new message replaces any reply still streaming to this client
+    _cancel_stream(room)
+    cancel_event = threading.Event()
+    with _active_streams_lock:
+        _active_streams[room] = cancel_event
+
+    try:
+        get_chat_worker_pool().submit(
+            user_email or room, _run_chat, user_message, user_email, room, cancel_event
+        )
+    except ChatBusyError as busy:
+        _finish_stream(room, cancel_event)
+        socketio.emit(
+            "chatbot_response",
+            {"response": str(busy), "category": "general", "done": True, "busy": True},
+            room=room,
+        )
+
+
+def _emit(event_name: str, data: dict, room: str = None):
+    # socketio.emit works outside the handler's request context, so workers can use it
+    if room:
+        socketio.emit(event_name, data, room=room)
+    else:
+        socketio.emit(event_name, data)
+
+
+def _finish_stream(room, cancel_event):
+    with _active_streams_lock:
+        if _active_streams.get(room) is cancel_event:
+            del _active_streams[room]
+
+
+def _run_chat(user_message, user_email, room, cancel_event):
+    """Generate and stream one reply (runs on a chat worker)."""
+    try:
+        # same process-wide connector as the HTTP route, so memory is shared
+        get_chatbot_connector().process_message_stream(
+            user_message=user_message,
+            user_email=user_email,
+            emit_fn=_emit,
+            room=room,
+            cancel_event=cancel_event,
+        )
+    except Exception as e:
+        print(f"[socket] chat failed for {user_email or room}: {e}")
+        _emit(
+            "chatbot_response",
+            {"response": "Sorry, something went wrong. Please try again.", "category": "general", "done": True},
+            room=room,
+        )
+    finally:
+        _finish_stream(room, cancel_event)
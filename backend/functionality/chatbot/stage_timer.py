@@ -0,0 +1,201 @@
+"""
+Stage Timer
+Per-stage latency spans for chatbot turns, plus process-wide histograms.
+
+A StageTimer is created per turn and made current for the turn's context;
+code anywhere in the pipeline (including tool calls running on the tool
+executor, which copies the context) records into it with timed_stage(name).
+Without a current timer, timed_stage does nothing.
+
+When the turn ends its spans are folded into the StageHistograms shown on
+/api/chatbot/stats. With CHATBOT_DEBUG_TIMINGS set, the spans are also sent
+to the client with the final reply.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+_current_timer = contextvars.ContextVar("chatbot_stage_timer", default=None)
+
+# Histogram bucket upper bounds (ms)
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class StageTimer:
+    """Timing spans of one chatbot turn (thread-safe: tool calls record concurrently)"""
+
+    def __init__(self, flow):
+        """
+        Args:
+            flow (str): "http" or "stream"
+        """
+        self.flow = flow
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans = []
+        self._totals = {}
+        self.total_seconds = None
+
+    def add(self, stage, started, seconds):
+        """Record a span that started at perf_counter() value `started`."""
+        with self._lock:
+            self._spans.append((stage, started - self._started, seconds))
+
+    def accumulate(self, stage, seconds):
+        """Add to a stage that happens many times per turn (e.g. emits); reported as one total."""
+        with self._lock:
+            self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, started, time.perf_counter() - started)
+
+    def finish(self):
+        if self.total_seconds is None:
+            self.total_seconds = time.perf_counter() - self._started
+        return self.total_seconds
+
+    def stage_seconds(self):
+        """Total seconds per stage (repeated stages summed)."""
+        with self._lock:
+            result = dict(self._totals)
+            for stage, _, seconds in self._spans:
+                result[stage] = result.get(stage, 0.0) + seconds
+        return result
+
+    def report(self):
+        """
+        Returns:
+            dict: {"flow", "total_ms", "stages": {stage: ms}, "spans": [{"stage", "start_ms", "ms"}]}
+                  (total_ms so far if the turn hasn't finished)
+        """
+        total = self.total_seconds if self.total_seconds is not None else time.perf_counter() - self._started
+        with self._lock:
+            spans = sorted(self._spans, key=lambda span: span[1])
+        return {
+            "flow": self.flow,
+            "total_ms": round(total * 1000, 3),
+            "stages": {stage: round(seconds * 1000, 3) for stage, seconds in self.stage_seconds().items()},
+            "spans": [
+                {"stage": stage, "start_ms": round(start * 1000, 3), "ms": round(seconds * 1000, 3)}
+                for stage, start, seconds in spans
+            ],
+        }
+
+    @contextmanager
+    def activate(self):
+        """Make this the current timer for the enclosed code."""
+        token = _current_timer.set(self)
+        try:
+            yield self
+        finally:
+            _current_timer.reset(token)
+
+
+def current_timer():
+    """The StageTimer of the turn being processed, or None."""
+    return _current_timer.get()
+
+
+@contextmanager
+def timed_stage(name):
+    """Time the enclosed block as `name` on the current timer (no-op without one)."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+def record_stage(name, started, seconds):
+    """Record an already measured span on the current timer (no-op without one)."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add(name, started, seconds)
+
+
+class StageHistograms:
+    """Process-wide latency histograms per stage"""
+
+    def __init__(self, buckets_ms=BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def _observe_locked(self, stage, ms):
+        hist = self._stages.get(stage)
+        if hist is None:
+            hist = self._stages[stage] = {"count": 0, "sum_ms": 0.0, "max_ms": 0.0,
+                                          "buckets": [0] * (len(self.buckets_ms) + 1)}
+        hist["count"] += 1
+        hist["sum_ms"] += ms
+        hist["max_ms"] = max(hist["max_ms"], ms)
+        hist["buckets"][bisect.bisect_left(self.buckets_ms, ms)] += 1
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self._observe_locked(stage, seconds * 1000)
+
+    def record(self, timer):
+        """Fold a finished turn into the histograms (its total goes to "turn.<flow>")."""
+        total = timer.finish()
+        stages = timer.stage_seconds()
+        with self._lock:
+            self._observe_locked(f"turn.{timer.flow}", total * 1000)
+            for stage, seconds in stages.items():
+                self._observe_locked(stage, seconds * 1000)
+
+    def _quantile(self, hist, q):
+        # upper bound of the bucket holding the q-th observation (max for the overflow bucket)
+        rank = q * hist["count"]
+        seen = 0
+        for index, count in enumerate(hist["buckets"]):
+            seen += count
+            if count and seen >= rank:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else round(hist["max_ms"], 3)
+        return 0.0
+
+    def stats(self):
+        """
+        Returns:
+            dict: stage -> {count, avg_ms, max_ms, p50_ms, p95_ms, p99_ms, buckets}
+                  where buckets maps "le_<ms>" (and "le_inf") to cumulative counts and the
+                  percentiles are bucket upper bounds
+        """
+        with self._lock:
+            snapshot = {stage: dict(hist, buckets=list(hist["buckets"])) for stage, hist in self._stages.items()}
+        result = {}
+        for stage, hist in sorted(snapshot.items()):
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets_ms + (None,), hist["buckets"]):
+                cumulative += count
+                buckets[f"le_{bound:g}" if bound is not None else "le_inf"] = cumulative
+            result[stage] = {
+                "count": hist["count"],
+                "avg_ms": round(hist["sum_ms"] / hist["count"], 3) if hist["count"] else 0.0,
+                "max_ms": round(hist["max_ms"], 3),
+                "p50_ms": self._quantile(hist, 0.5),
+                "p95_ms": self._quantile(hist, 0.95),
+                "p99_ms": self._quantile(hist, 0.99),
+                "buckets": buckets,
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+
+_stage_histograms = StageHistograms()
+
+
+def get_stage_histograms():
+    """Return the process-wide stage histograms."""
+    return _stage_histograms
@@ -0,0 +1,63 @@
+"""
+Token Counter
+Local, dependency-free token estimates for chat prompts, used to keep
+conversation memory and prompts inside a token budget without calling
+the API.
+
+Counts words and punctuation marks, splitting long words into ~4-character
+pieces, which tracks BPE tokenizers for English chat text far better than
+a flat characters / 4 ratio.
+"""
+import re
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+# Chat formatting overhead per message and for priming the reply
+# (matches OpenAI's published accounting for chat models)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+def count_tokens(text):
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text (str): Any text (None counts as empty)
+
+    Returns:
+        int: Estimated token count
+    """
+    if not text:
+        return 0
+    total = 0
+    for piece in _PIECES.findall(str(text)):
+        total += (len(piece) + 3) // 4 if len(piece) > 6 else 1
+    return total
+
+
+def count_message_tokens(messages):
+    """
+    Estimate the prompt tokens of a chat message list.
+
+    Args:
+        messages (list): Chat messages (dicts with role/content and optionally tool_calls)
+
+    Returns:
+        int: Estimated prompt tokens, including per-message overhead
+    """
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        if not isinstance(message, dict):
+            message = {
+                "role": getattr(message, "role", "assistant"),
+                "content": getattr(message, "content", None),
+                "tool_calls": getattr(message, "tool_calls", None),
+            }
+        total += TOKENS_PER_MESSAGE + count_tokens(message.get("role")) + count_tokens(message.get("content"))
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {}) if isinstance(tool_call, dict) else tool_call.function
+            name = function.get("name") if isinstance(function, dict) else function.name
+            arguments = function.get("arguments") if isinstance(function, dict) else function.arguments
+            total += TOKENS_PER_MESSAGE + count_tokens(name) + count_tokens(arguments)
+    return total
@@ -0,0 +1,135 @@
+"""
+Tool Result Cache
+Short-TTL, per-user cache of chatbot tool results, so a conversation that
+re-asks the same thing ("show my badges", then "which badges can I earn")
+doesn't repeat the DAO queries.
+
+DataAccess invalidates a user's entries when it writes their event
+registrations, team memberships or badges, and everyone's entries for
+writes that change shared results (new/deleted teams, team registrations).
+Invalidation is per process; the TTL (CHATBOT_TOOL_CACHE_TTL, default 30s)
+bounds how stale another worker's entries can get.
+"""
+import json
+import os
+import threading
+import time
+
+# Tools whose result depends only on the user and the arguments
+CACHEABLE_TOOLS = frozenset({
+    "get_my_upcoming_events",
+    "get_my_completed_events",
+    "get_my_teams",
+    "list_teams",
+    "get_my_badges",
+    "get_available_badges",
+    "get_my_stats",
+    "get_my_team_events",
+})
+
+
+class ToolResultCache:
+    """Thread-safe per-user TTL cache of tool results"""
+
+    def __init__(self, ttl_seconds=30.0, max_users=5000, clock=time.monotonic):
+        """
+        Args:
+            ttl_seconds (float): Entry lifetime; 0 disables caching
+            max_users (int): Users with cached entries; the oldest user's entries are dropped beyond this
+            clock (callable): Time source
+        """
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_users = max(1, int(max_users))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}  # user_email -> {(tool, args_json): (expires, result)}
+        self._email_by_id = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(tool_name, arguments):
+        return tool_name, json.dumps(arguments or {}, sort_keys=True, default=str)
+
+    def get(self, user_email, tool_name, arguments):
+        """Cached result, or None on a miss or expiry."""
+        if self.ttl_seconds <= 0:
+            return None
+        key = self._key(tool_name, arguments)
+        with self._lock:
+            entry = self._entries.get(user_email, {}).get(key)
+            if entry is None or entry[0] < self._clock():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_email, tool_name, arguments, result, user_id=None):
+        """
+        Cache a result.
+
+        Args:
+            user_email (str): User the result belongs to
+            tool_name (str): Tool name
+            arguments (dict): Tool arguments
+            result (dict): Tool result
+            user_id (int, optional): Lets writes that only know the user ID invalidate this user
+        """
+        if self.ttl_seconds <= 0:
+            return
+        key = self._key(tool_name, arguments)
+        with self._lock:
+            entries = self._entries.get(user_email)
+            if entries is None:
+                if len(self._entries) >= self.max_users:
+                    # dicts keep insertion order: drop the user cached longest ago
+                    oldest = next(iter(self._entries))
+                    self._drop_user_locked(oldest)
+                entries = self._entries[user_email] = {}
+            entries[key] = (self._clock() + self.ttl_seconds, result)
+            if user_id is not None:
+                self._email_by_id[user_id] = user_email
+
+    def _drop_user_locked(self, user_email):
+        self._entries.pop(user_email, None)
+        for user_id in [uid for uid, email in self._email_by_id.items() if email == user_email]:
+            del self._email_by_id[user_id]
+
+    def invalidate_user(self, user_email=None, user_id=None):
+        """Drop every cached result for a user, identified by email or ID."""
+        with self._lock:
+            if user_email is None and user_id is not None:
+                user_email = self._email_by_id.get(user_id)
+            if user_email is not None and user_email in self._entries:
+                self._drop_user_locked(user_email)
+                self.invalidations += 1
+
+    def invalidate_all(self):
+        """Drop every cached result (writes that affect all users)."""
+        with self._lock:
+            self._entries.clear()
+            self._email_by_id.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "users": len(self._entries),
+                "entries": sum(len(entries) for entries in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+# Process-wide cache shared by the connector and DataAccess invalidation hooks
+_tool_cache = ToolResultCache(ttl_seconds=float(os.getenv("CHATBOT_TOOL_CACHE_TTL", 30)))
+
+
+def get_tool_result_cache():
+    """Return the process-wide tool result cache."""
+    return _tool_cache
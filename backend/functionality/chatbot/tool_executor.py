@@ -0,0 +1,187 @@
+"""
+Tool Executor
+Runs the chatbot's tool calls on a bounded, process-wide thread pool so a
+turn with several independent tool calls costs the slowest call rather than
+the sum of all of them.
+
+- Results come back in the order the model asked for them
+- Each call has a deadline counted from when it starts running; a call that
+  misses it is reported as timed out (the worker thread finishes in the
+  background, its result is discarded)
+- Time spent waiting for a free worker is measured separately; a call that
+  can't start within queue_timeout is dropped and reported as "busy"
+- Per-tool latency, queue wait, error and timeout counters are kept for monitoring
+- Calls run in a copy of the caller's context, so they record into the
+  turn's stage timer
+
+Pool size and timeouts come from CHATBOT_TOOL_WORKERS, CHATBOT_TOOL_TIMEOUT and
+CHATBOT_TOOL_QUEUE_TIMEOUT.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+class ToolExecutor:
+    """Bounded thread pool for tool calls with ordered results and latency stats"""
+
+    def __init__(self, max_workers=8, timeout=10.0, queue_timeout=None, samples_per_tool=256):
+        """
+        Args:
+            max_workers (int): Maximum tool calls running at once across all chats
+            timeout (float): Seconds each tool call may run
+            queue_timeout (float, optional): Seconds a call may wait for a free worker
+                (defaults to timeout)
+            samples_per_tool (int): Recent latencies kept per tool for percentiles
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = float(timeout)
+        self.queue_timeout = self.timeout if queue_timeout is None else float(queue_timeout)
+        self.samples_per_tool = samples_per_tool
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chatbot-tool")
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def run_all(self, fn, calls, timeout=None):
+        """
+        Run fn(tool_name, arguments) for every call concurrently.
+
+        Args:
+            fn (callable): Executes one tool call and returns its result
+            calls (list): (tool_name, arguments) pairs, in the model's order
+            timeout (float, optional): Override the default per-call timeout
+
+        Returns:
+            list: One dict per call, in input order:
+                  {"tool": name, "result": value or None, "error": None | "timeout" | "busy" | message,
+                   "elapsed": seconds running, "queue_wait": seconds waiting for a worker}
+        """
+        timeout = self.timeout if timeout is None else timeout
+        submitted = time.perf_counter()
+        started_at = [None] * len(calls)
+        started = [threading.Event() for _ in calls]
+
+        def timed(position, tool_name, arguments):
+            call_started = time.perf_counter()
+            started_at[position] = call_started
+            started[position].set()
+            try:
+                return fn(tool_name, arguments), None, time.perf_counter() - call_started
+            except Exception as e:
+                return None, str(e) or e.__class__.__name__, time.perf_counter() - call_started
+
+        # one context copy per call: a Context can't be entered by two threads at once
+        futures = [
+            self._pool.submit(contextvars.copy_context().run, timed, position, name, args)
+            for position, (name, args) in enumerate(calls)
+        ]
+
+        # Calls still waiting for a worker at the queue deadline are dropped
+        queue_deadline = submitted + self.queue_timeout
+        dropped_at = [None] * len(calls)
+        for position, (event, future) in enumerate(zip(started, futures)):
+            if not event.wait(max(0.0, queue_deadline - time.perf_counter())) and future.cancel():
+                dropped_at[position] = time.perf_counter()
+
+        # Calls run side by side, so waiting for them in order never waits longer
+        # than the slowest one; each call's clock starts when a worker picks it up
+        outcomes = []
+        for position, ((tool_name, _), future) in enumerate(zip(calls, futures)):
+            if dropped_at[position] is not None:
+                queue_wait = dropped_at[position] - submitted
+                self._record(tool_name, 0.0, "busy", queue_wait)
+                outcomes.append({"tool": tool_name, "result": None, "error": "busy",
+                                 "elapsed": 0.0, "queue_wait": queue_wait})
+                continue
+            started[position].wait()  # cancel() failed: it has just been picked up
+            run_started = started_at[position]
+            try:
+                result, error, elapsed = future.result(
+                    timeout=max(0.0, run_started + timeout - time.perf_counter())
+                )
+            except FutureTimeoutError:
+                result, error, elapsed = None, "timeout", time.perf_counter() - run_started
+            queue_wait = run_started - submitted
+            self._record(tool_name, elapsed, error, queue_wait)
+            outcomes.append({"tool": tool_name, "result": result, "error": error,
+                             "elapsed": elapsed, "queue_wait": queue_wait})
+        return outcomes
+
+    def _record(self, tool_name, elapsed, error, queue_wait=0.0):
+        with self._lock:
+            stats = self._stats.get(tool_name)
+            if stats is None:
+                stats = self._stats[tool_name] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "timeouts": 0,
+                    "busy": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "queue_seconds": 0.0,
+                    "samples": deque(maxlen=self.samples_per_tool),
+                }
+            stats["calls"] += 1
+            stats["queue_seconds"] += queue_wait
+            if error == "busy":
+                stats["busy"] += 1
+                return
+            if error == "timeout":
+                stats["timeouts"] += 1
+            elif error:
+                stats["errors"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            stats["samples"].append(elapsed)
+
+    def stats(self):
+        """
+        Per-tool latency metrics.
+
+        Returns:
+            dict: tool_name -> {calls, errors, timeouts, busy, avg_ms, p50_ms, p95_ms, max_ms,
+                  avg_queue_ms}
+        """
+        with self._lock:
+            snapshot = {name: dict(stats, samples=sorted(stats["samples"])) for name, stats in self._stats.items()}
+
+        def percentile_ms(samples, q):
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 3)
+
+        result = {}
+        for name, stats in snapshot.items():
+            ran = stats["calls"] - stats["busy"]
+            result[name] = {
+                "calls": stats["calls"],
+                "errors": stats["errors"],
+                "timeouts": stats["timeouts"],
+                "busy": stats["busy"],
+                "avg_ms": round(stats["total_seconds"] / ran * 1000, 3) if ran else 0.0,
+                "p50_ms": percentile_ms(stats["samples"], 0.5),
+                "p95_ms": percentile_ms(stats["samples"], 0.95),
+                "max_ms": round(stats["max_seconds"] * 1000, 3),
+                "avg_queue_ms": round(stats["queue_seconds"] / stats["calls"] * 1000, 3) if stats["calls"] else 0.0,
+            }
+        return result
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+_queue_timeout = os.getenv("CHATBOT_TOOL_QUEUE_TIMEOUT")
+_tool_executor = ToolExecutor(
+    max_workers=int(os.getenv("CHATBOT_TOOL_WORKERS", 8)),
+    timeout=float(os.getenv("CHATBOT_TOOL_TIMEOUT", 10)),
+    queue_timeout=float(_queue_timeout) if _queue_timeout else None,
+)
+
+
+def get_tool_executor():
+    """Return the process-wide tool executor."""
+    return _tool_executor
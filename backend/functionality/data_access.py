@@ -1,17 +1,27 @@
 """
 This file includes all database interactions. 
 """
-import bcrypt
 from dotenv import load_dotenv
 import os
 import pymysql
 import random
 import json
-import numpy as np
+import threading
+import time
 from pymysql.cursors import DictCursor
+from auth.password_hasher import get_password_hasher
+from chatbot.embedding_index import get_event_index
+from chatbot.embedding_pipeline import embedding_content_hash
+from chatbot.tool_cache import get_tool_result_cache
 from flask import request
 from datetime import date, timedelta
 
+# Whether any event still has no embedding, shared by every DataAccess in the
+# process and rechecked at most once per embedding index refresh interval, so
+# hybrid search only runs its keyword top-up query while such events exist
+_unembedded_lock = threading.Lock()
+_unembedded_state = {"checked_at": None, "exists": True}
+
 class DataAccess:
     DB_HOST = os.getenv("MYSQL_HOST")
     DB_USER = os.getenv("MYSQL_USER")
@@ -85,7 +95,8 @@ class DataAccess:
             if isinstance(user["Password"], str)
             else user["Password"]
         )
-        if bcrypt.checkpw(password.encode("utf-8"), stored_hashed):
+        # bcrypt runs on the hashing worker pool, not the request thread
+        if get_password_hasher().check_password(password, stored_hashed):
             return user  # full user dict
         return None
     
@@ -386,6 +397,7 @@ class DataAccess:
         """
         with self.get_connection() as conn, conn.cursor() as cursor:
             cursor.execute(sql, (user_id, badge_id))
+        get_tool_result_cache().invalidate_user(user_id=user_id)
 
     def user_completed_weekend_event(self, user_id: int) -> bool:
         """
@@ -440,6 +452,7 @@ class DataAccess:
             with self.get_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(sql, (user_id, event_id))
                 # autocommit=True
+            get_tool_result_cache().invalidate_user(user_email)
         except Exception as e:
             print(f"Error in store_user_event_id: {e}")
             raise
@@ -455,6 +468,33 @@ class DataAccess:
             print(f"Error in check_user_event_signup: {e}")
             raise
 
+    def get_registered_event_ids(self, user_email):
+        """
+        IDs of events the user is registered for, individually or through any of their teams.
+        One query instead of get_user_events + get_team_events.
+        
+        Args:
+            user_email (str): User's email
+            
+        Returns:
+            set: Event IDs
+        """
+        sql = """
+            SELECT er.EventID
+            FROM EventRegistration er
+            JOIN User u ON u.ID = er.UserID
+            WHERE u.Email = %s
+            UNION
+            SELECT ter.EventID
+            FROM TeamEventRegistration ter
+            JOIN TeamMembership tm ON tm.TeamID = ter.TeamID
+            JOIN User u ON u.ID = tm.UserID
+            WHERE u.Email = %s
+        """
+        with self.get_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(sql, (user_email, user_email))
+            return {int(row[0]) for row in cursor.fetchall()}
+
     def delete_user_from_event(self, user_email, event_id):
         try:
             user_id = self.get_id_by_email(user_email)
@@ -462,6 +502,7 @@ class DataAccess:
             with self.get_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(sql, (user_id, event_id))
                 # autocommit=True
+            get_tool_result_cache().invalidate_user(user_email)
         except Exception as e:
             print(f"Error in unregister_user_from_event: {e}")
             raise
@@ -486,7 +527,15 @@ class DataAccess:
         return location_list
     
 
-    def get_filtered_events(self, keyword=None, location=None, start_date=None, end_date=None):
+    def get_filtered_events(self, keyword=None, location=None, start_date=None, end_date=None,
+                            exclude_user_email=None, exclude_ids=None, limit=None, without_embedding=False):
+        """
+        Keyword/location/date event search.
+        exclude_user_email leaves out events the user is registered for, individually or
+        through a team (anti-join), and exclude_ids leaves out specific events, so that
+        `limit` applies to eligible events only. without_embedding only returns events
+        that have no embedding yet (and so aren't in the search index).
+        """
         events = []
         try:
             # Only default to today if NO date parameters are provided at all
@@ -527,12 +576,38 @@ class DataAccess:
                     elif end_date is not None:
                         query += " AND e.Date <= %s"
                         params.append(end_date)
-                    
+
+                    if exclude_user_email:
+                        query += """
+                        AND NOT EXISTS (
+                            SELECT 1 FROM EventRegistration er
+                            JOIN User u ON u.ID = er.UserID
+                            WHERE er.EventID = e.ID AND u.Email = %s
+                        )
+                        AND NOT EXISTS (
+                            SELECT 1 FROM TeamEventRegistration ter
+                            JOIN TeamMembership tm ON tm.TeamID = ter.TeamID
+                            JOIN User u ON u.ID = tm.UserID
+                            WHERE ter.EventID = e.ID AND u.Email = %s
+                        )
+                        """
+                        params.extend([exclude_user_email, exclude_user_email])
+
+                    if exclude_ids:
+                        exclude_ids = [int(event_id) for event_id in exclude_ids]
+                        query += " AND e.ID NOT IN ({})".format(','.join(['%s'] * len(exclude_ids)))
+                        params.extend(exclude_ids)
+
+                    if without_embedding:
+                        query += " AND e.Embedding IS NULL"
 
                     query += """
                     GROUP BY e.ID, e.Title, e.About, e.Date, e.StartTime, e.EndTime, e.LocationCity, e.Address, e.LocationPostcode, e.Capacity, e.Image_path, c.Name
-                    ORDER BY e.Date ASC;
+                    ORDER BY e.Date ASC
                     """
+                    if limit is not None:
+                        query += " LIMIT %s"
+                        params.append(int(limit))
 
                     cursor.execute(query, params)
                     result_set = cursor.fetchall()
@@ -639,6 +714,54 @@ class DataAccess:
     # Embedding Methods for Events
     # ------------------------
 
+    # Columns added to Event after the first schema; schema.sql only runs on a new database
+    _EMBEDDING_COLUMNS = (
+        ('EmbeddingHash', 'char(64)'),
+        ('EmbeddingModel', 'varchar(100)'),
+    )
+
+    def ensure_embedding_columns(self):
+        """
+        Add any missing embedding bookkeeping columns to an existing Event table.
+        Safe to call on every start, and from several processes at once.
+        
+        Returns:
+            list: Names of the columns that were added
+        """
+        sql = """
+            SELECT COLUMN_NAME
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Event'
+        """
+        added = []
+        with self.get_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(sql)
+            existing = {row[0].lower() for row in cursor.fetchall()}
+            for name, definition in self._EMBEDDING_COLUMNS:
+                if name.lower() in existing:
+                    continue
+                try:
+                    cursor.execute(f"ALTER TABLE Event ADD COLUMN {name} {definition}")
+                    added.append(name)
+                except pymysql.MySQLError as e:
+                    # 1060: another process added it first
+                    if e.args and e.args[0] == 1060:
+                        continue
+                    raise
+        if added:
+            print(f"Added Event columns: {', '.join(added)}")
+        return added
+
+    _EMBEDDING_TEXT_FIELDS = (
+        'Title', 'About', 'Activities', 'RequirementsProvided', 'RequirementsBring',
+        'ExpectedImpact', 'CauseName',
+    )
+
+    def _event_embedding_text(self, event):
+        """Concatenate the event fields that make up its embedding source text."""
+        text_parts = [event[field] for field in self._EMBEDDING_TEXT_FIELDS if event.get(field)]
+        return ' '.join(text_parts) if text_parts else None
+
     def get_event_text_for_embedding(self, event_id):
         """
         Get concatenated text from event fields for embedding generation.
@@ -649,44 +772,18 @@ class DataAccess:
         Returns:
             str: Concatenated text from Title, About, Activities, Requirements, ExpectedImpact, and CauseName
         """
-        sql = """
-            SELECT e.Title, e.About, e.Activities, e.Requirements, e.ExpectedImpact, c.Name AS CauseName
-            FROM Event e
-            JOIN Cause c ON e.CauseID = c.ID
-            WHERE e.ID = %s
-            LIMIT 1
-        """
-        with self.get_connection(use_dict_cursor=True) as conn, conn.cursor() as cursor:
-            cursor.execute(sql, (event_id,))
-            event = cursor.fetchone()
-            
-            if not event:
-                return None
-            
-            # Combine all relevant fields
-            text_parts = []
-            if event.get('Title'):
-                text_parts.append(event['Title'])
-            if event.get('About'):
-                text_parts.append(event['About'])
-            if event.get('Activities'):
-                text_parts.append(event['Activities'])
-            if event.get('Requirements'):
-                text_parts.append(event['Requirements'])
-            if event.get('ExpectedImpact'):
-                text_parts.append(event['ExpectedImpact'])
-            if event.get('CauseName'):
-                text_parts.append(event['CauseName'])
-            
-            return ' '.join(text_parts) if text_parts else None
+        events = self.get_all_events_for_embedding([event_id])
+        return events[0]['text'] if events else None
 
-    def store_event_embedding(self, event_id, embedding):
+    def store_event_embedding(self, event_id, embedding, content_hash=None, model=None):
         """
         Store embedding for an event.
         
         Args:
             event_id (int): Event ID
             embedding (list): Embedding vector (list of floats)
+            content_hash (str, optional): Hash of the text the embedding was generated from
+            model (str, optional): Embedding model name
         """
         if not embedding:
             return
@@ -695,63 +792,165 @@ class DataAccess:
         
         sql = """
             UPDATE Event 
-            SET Embedding = %s 
+            SET Embedding = %s, EmbeddingHash = %s, EmbeddingModel = %s
             WHERE ID = %s
         """
         with self.get_connection() as conn, conn.cursor() as cursor:
             try:
-                cursor.execute(sql, (embedding_json, event_id))
+                cursor.execute(sql, (embedding_json, content_hash, model, event_id))
             except pymysql.MySQLError as e:
                 print(f"Error storing embedding for event {event_id}: {e}")
+                return
+
+        self.refresh_event_index([event_id])
+
+    def store_event_embeddings(self, embeddings, content_hashes=None, model=None, chunk_size=100):
+        """
+        Store embeddings for many events using multi-row UPDATE statements.
+
+        Args:
+            embeddings (dict): Mapping of event ID to embedding vector
+            content_hashes (dict, optional): Mapping of event ID to source text hash
+            model (str, optional): Embedding model name
+            chunk_size (int): Events per UPDATE statement (keeps packets well under max_allowed_packet)
+
+        Returns:
+            int: Number of events written
+        """
+        content_hashes = content_hashes or {}
+        items = [
+            (int(event_id), json.dumps(embedding), content_hashes.get(event_id))
+            for event_id, embedding in embeddings.items() if embedding
+        ]
+        if not items:
+            return 0
 
-    def get_all_events_for_embedding(self):
+        with self.get_connection() as conn, conn.cursor() as cursor:
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                cases = ' '.join(['WHEN %s THEN %s'] * len(chunk))
+                sql = """
+                    UPDATE Event
+                    SET Embedding = CASE ID {cases} END,
+                        EmbeddingHash = CASE ID {cases} END,
+                        EmbeddingModel = %s
+                    WHERE ID IN ({ids})
+                """.format(cases=cases, ids=','.join(['%s'] * len(chunk)))
+                params = [value for event_id, embedding_json, _ in chunk for value in (event_id, embedding_json)]
+                params.extend(value for event_id, _, content_hash in chunk for value in (event_id, content_hash))
+                params.append(model)
+                params.extend(event_id for event_id, _, _ in chunk)
+                cursor.execute(sql, params)
+
+        self.refresh_event_index([event_id for event_id, _, _ in items])
+        return len(items)
+
+    def get_all_events_for_embedding(self, event_ids=None):
         """
         Get all events with their IDs and relevant text fields.
         
+        Args:
+            event_ids (list, optional): Only return these events
+            
         Returns:
-            list: List of dicts with ID and text for embedding
+            list: List of dicts with ID, text, content_hash of the text, and the
+                  stored EmbeddingHash / EmbeddingModel / has_embedding state
         """
         sql = """
             SELECT e.ID, e.Title, e.About, e.Activities, e.RequirementsProvided, e.RequirementsBring,
-                   e.ExpectedImpact, c.Name AS CauseName
+                   e.ExpectedImpact, c.Name AS CauseName, e.EmbeddingHash, e.EmbeddingModel,
+                   e.Embedding IS NOT NULL AS HasEmbedding
             FROM Event e
             JOIN Cause c ON e.CauseID = c.ID
         """
+        params = []
+        if event_ids is not None:
+            if not event_ids:
+                return []
+            sql += " WHERE e.ID IN ({})".format(','.join(['%s'] * len(event_ids)))
+            params.extend(event_ids)
+
         with self.get_connection(use_dict_cursor=True) as conn, conn.cursor() as cursor:
-            cursor.execute(sql)
+            cursor.execute(sql, params)
             events = cursor.fetchall()
             
             result = []
             for event in events:
-                text_parts = []
-                if event.get('Title'):
-                    text_parts.append(event['Title'])
-                if event.get('About'):
-                    text_parts.append(event['About'])
-                if event.get('Activities'):
-                    text_parts.append(event['Activities'])
-                if event.get('RequirementsProvided'):
-                    text_parts.append(event['RequirementsProvided'])
-                if event.get('RequirementsBring'):
-                    text_parts.append(event['RequirementsBring'])
-                if event.get('ExpectedImpact'):
-                    text_parts.append(event['ExpectedImpact'])
-                if event.get('CauseName'):
-                    text_parts.append(event['CauseName'])
-                
-                if text_parts:
+                text = self._event_embedding_text(event)
+                if text:
                     result.append({
                         'ID': event['ID'],
-                        'text': ' '.join(text_parts)
+                        'text': text,
+                        'content_hash': embedding_content_hash(text),
+                        'EmbeddingHash': event.get('EmbeddingHash'),
+                        'EmbeddingModel': event.get('EmbeddingModel'),
+                        'has_embedding': bool(event.get('HasEmbedding')),
                     })
             
             return result
 
+    def _attach_tags_and_embeddings(self, cursor, events, include_embedding=True):
+        """
+        Decode stored embeddings and attach tag names to event rows.
+        Tags are fetched in one separate query to avoid GROUP BY on large TEXT columns.
+        With include_embedding=False only the event details and tags are returned.
+        """
+        event_ids = [event['ID'] for event in events]
+        tags_dict = {}
+        if event_ids:
+            tags_sql = """
+                SELECT e.ID, GROUP_CONCAT(t.TagName SEPARATOR ',') AS TagName
+                FROM Event e
+                JOIN Cause c ON e.CauseID = c.ID
+                LEFT JOIN CauseTag ct ON c.ID = ct.CauseID
+                LEFT JOIN Tag t ON ct.TagID = t.ID
+                WHERE e.ID IN ({})
+                GROUP BY e.ID
+            """.format(','.join(['%s'] * len(event_ids)))
+
+            cursor.execute(tags_sql, event_ids)
+            tags_results = cursor.fetchall()
+            tags_dict = {row['ID']: row.get('TagName') for row in tags_results}
+
+        result = []
+        for event in events:
+            embedding = None
+            if include_embedding:
+                embedding_json = event.get('Embedding')
+                if embedding_json:
+                    try:
+                        embedding = json.loads(embedding_json)
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+                if not embedding:
+                    continue
+
+            row = {
+                'ID': event['ID'],
+                'Title': event['Title'],
+                'About': event.get('About'),
+                'Date': str(event['Date']),
+                'StartTime': str(event['StartTime']),
+                'EndTime': str(event['EndTime']),
+                'LocationCity': event['LocationCity'],
+                'Address': event['Address'],
+                'LocationPostcode': event.get('LocationPostcode'),
+                'Capacity': event.get('Capacity'),
+                'Image_path': event.get('Image_path'),
+                'CauseName': event.get('CauseName'),
+                'TagName': tags_dict.get(event['ID']),
+            }
+            if include_embedding:
+                row['embedding'] = embedding
+            result.append(row)
+
+        return result
+
     def get_events_with_embeddings(self, location=None, start_date=None, end_date=None):
         """
         Get all events with their embeddings, optionally filtered by location and date range.
         Optimized to avoid GROUP BY on large TEXT columns.
-        Only returns future events for better performance.
+        Only returns future events when no date range is given.
         
         Args:
             location (str, optional): Filter by location city
@@ -762,7 +961,6 @@ class DataAccess:
             list: List of dicts with event ID, embedding, and basic info
         """
         # Simplified query without GROUP BY to avoid sort memory issues
-        # Only get future events to reduce dataset size
         sql = """
             SELECT e.ID, e.Title, e.About, e.Date, e.StartTime, e.EndTime, 
                    e.LocationCity, e.Address, e.LocationPostcode, e.Capacity, 
@@ -791,64 +989,171 @@ class DataAccess:
             sql += " AND LOWER(TRIM(e.LocationCity)) = %s"
             params.append(location.lower().strip())
         
-        sql += " ORDER BY e.Date ASC LIMIT 50"
+        sql += " ORDER BY e.Date ASC"
         
         with self.get_connection(use_dict_cursor=True) as conn, conn.cursor() as cursor:
             cursor.execute(sql, params)
             events = cursor.fetchall()
+            return self._attach_tags_and_embeddings(cursor, events)
+
+    @staticmethod
+    def _embedding_version(event):
+        """Token that changes whenever an event's embedding is regenerated from new text or a new model."""
+        return f"{event.get('EmbeddingHash') or ''}:{event.get('EmbeddingModel') or ''}"
+
+    def get_event_embedding_rows(self, event_ids=None):
+        """
+        Get events with decoded embeddings for the in-memory embedding index.
+        Unlike get_events_with_embeddings, no date/location filters are applied;
+        the index applies those itself at query time.
+        
+        Args:
+            event_ids (list, optional): Only load these events (used for incremental refresh)
             
-            # Get tags separately for each event to avoid GROUP BY issues
-            event_ids = [event['ID'] for event in events]
-            tags_dict = {}
-            if event_ids:
-                tags_sql = """
-                    SELECT e.ID, GROUP_CONCAT(t.TagName SEPARATOR ',') AS TagName
-                    FROM Event e
-                    JOIN Cause c ON e.CauseID = c.ID
-                    LEFT JOIN CauseTag ct ON c.ID = ct.CauseID
-                    LEFT JOIN Tag t ON ct.TagID = t.ID
-                    WHERE e.ID IN ({})
-                    GROUP BY e.ID
-                """.format(','.join(['%s'] * len(event_ids)))
-                
-                cursor.execute(tags_sql, event_ids)
-                tags_results = cursor.fetchall()
-                tags_dict = {row['ID']: row.get('TagName') for row in tags_results}
-            
-            result = []
-            for event in events:
-                embedding_json = event.get('Embedding')
-                embedding = None
-                if embedding_json:
-                    try:
-                        embedding = json.loads(embedding_json)
-                    except (json.JSONDecodeError, TypeError):
-                        continue
-                
-                if embedding:
-                    result.append({
-                        'ID': event['ID'],
-                        'Title': event['Title'],
-                        'About': event.get('About'),
-                        'Date': str(event['Date']),
-                        'StartTime': str(event['StartTime']),
-                        'EndTime': str(event['EndTime']),
-                        'LocationCity': event['LocationCity'],
-                        'Address': event['Address'],
-                        'LocationPostcode': event.get('LocationPostcode'),
-                        'Capacity': event.get('Capacity'),
-                        'Image_path': event.get('Image_path'),
-                        'CauseName': event.get('CauseName'),
-                        'TagName': tags_dict.get(event['ID']),
-                        'embedding': embedding
-                    })
+        Returns:
+            list: List of dicts with event ID, embedding, EmbeddingVersion and basic info
+        """
+        sql = """
+            SELECT e.ID, e.Title, e.About, e.Date, e.StartTime, e.EndTime, 
+                   e.LocationCity, e.Address, e.LocationPostcode, e.Capacity, 
+                   e.Image_path, e.Embedding, e.EmbeddingHash, e.EmbeddingModel, c.Name AS CauseName
+            FROM Event e
+            JOIN Cause c ON e.CauseID = c.ID
+            WHERE e.Embedding IS NOT NULL
+        """
+        params = []
+        if event_ids is not None:
+            if not event_ids:
+                return []
+            sql += " AND e.ID IN ({})".format(','.join(['%s'] * len(event_ids)))
+            params.extend(event_ids)
+
+        with self.get_connection(use_dict_cursor=True) as conn, conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            events = cursor.fetchall()
+            versions = {event['ID']: self._embedding_version(event) for event in events}
+            rows = self._attach_tags_and_embeddings(cursor, events)
+        for row in rows:
+            row['EmbeddingVersion'] = versions.get(row['ID'])
+        return rows
+
+    def get_event_embedding_versions(self):
+        """
+        Get the embedding version of every event that has an embedding.
+        Cheap (no embedding or text columns), so indexes can poll it for changes.
+        
+        Returns:
+            dict: Event ID -> version token (see get_event_embedding_rows)
+        """
+        sql = """
+            SELECT ID, EmbeddingHash, EmbeddingModel
+            FROM Event
+            WHERE Embedding IS NOT NULL
+        """
+        with self.get_connection(use_dict_cursor=True) as conn, conn.cursor() as cursor:
+            cursor.execute(sql)
+            return {int(row['ID']): self._embedding_version(row) for row in cursor.fetchall()}
+
+    def sync_event_index(self):
+        """
+        Bring a database-loaded embedding index up to date with embeddings written by
+        other processes (e.g. the generator script). Runs at most once per the index's
+        refresh_interval and only re-fetches the events whose version changed.
+        """
+        index = get_event_index()
+        if not index.refresh_due():
+            return
+        try:
+            stale = index.stale_ids(self.get_event_embedding_versions())
+        except Exception as e:
+            print(f"Error checking embedding index for changes: {e}")
+            return
+        if stale:
+            self.refresh_event_index(stale)
+
+    def get_event_index_metadata(self, event_ids):
+        """
+        Get event details and tags (without embeddings) for the given IDs.
+        Used to fill in search results when the index is mapped from the shared store file.
+        
+        Args:
+            event_ids (list): Event IDs
             
-            return result
+        Returns:
+            list: List of event dicts
+        """
+        if not event_ids:
+            return []
+        sql = """
+            SELECT e.ID, e.Title, e.About, e.Date, e.StartTime, e.EndTime, 
+                   e.LocationCity, e.Address, e.LocationPostcode, e.Capacity, 
+                   e.Image_path, c.Name AS CauseName
+            FROM Event e
+            JOIN Cause c ON e.CauseID = c.ID
+            WHERE e.Embedding IS NOT NULL AND e.ID IN ({})
+        """.format(','.join(['%s'] * len(event_ids)))
+
+        with self.get_connection(use_dict_cursor=True) as conn, conn.cursor() as cursor:
+            cursor.execute(sql, list(event_ids))
+            events = cursor.fetchall()
+            return self._attach_tags_and_embeddings(cursor, events, include_embedding=False)
+
+    def refresh_event_index(self, event_ids):
+        """
+        Incrementally refresh the process-wide embedding index for the given events.
+        Events whose embedding was cleared (or that no longer exist) are removed.
+        Does nothing if the index has not been loaded yet; it will load everything lazily.
+        """
+        index = get_event_index()
+        if not index.loaded:
+            return
+        event_ids = [int(event_id) for event_id in event_ids]
+        try:
+            rows = self.get_event_embedding_rows(event_ids)
+        except Exception as e:
+            print(f"Error refreshing embedding index: {e}")
+            return
+        found = set()
+        for row in rows:
+            if index.upsert(row):
+                found.add(int(row['ID']))
+        for event_id in event_ids:
+            if event_id not in found:
+                index.remove(event_id)
+        index.save_ann()
+
+    def has_events_without_embedding(self):
+        """
+        Whether any event has no embedding yet. Asks the database at most once per the
+        embedding index's refresh interval (EMBEDDING_INDEX_REFRESH, 60 s by default)
+        and reuses the last answer in between.
+        """
+        interval = get_event_index().refresh_interval or 60.0
+        now = time.monotonic()
+        with _unembedded_lock:
+            checked_at = _unembedded_state["checked_at"]
+            if checked_at is not None and now - checked_at < interval:
+                return _unembedded_state["exists"]
+            # claim this check so concurrent searches reuse the previous answer
+            _unembedded_state["checked_at"] = now
+
+        exists = True
+        try:
+            with self.get_connection() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT EXISTS(SELECT 1 FROM Event WHERE Embedding IS NULL)")
+                exists = bool(cursor.fetchone()[0])
+        except pymysql.MySQLError as e:
+            print(f"Error checking for events without embeddings: {e}")
+        with _unembedded_lock:
+            _unembedded_state["exists"] = exists
+        return exists
 
     def search_events_with_embeddings(self, query_embedding, location=None, limit=10, similarity_threshold=0.3, start_date=None, end_date=None):
         """
         Search events using embedding similarity.
-        Optimized for performance with vectorized operations.
+        Scores every indexed event with one matrix-vector product against the
+        process-wide embedding index (mapped from the shared embedding store file
+        if one exists, otherwise loaded from the database on first use).
         
         Args:
             query_embedding (list): Embedding vector for user query
@@ -864,52 +1169,80 @@ class DataAccess:
         if not query_embedding:
             return []
         
-        # Get events with embeddings (filtered by date range if provided)
-        events = self.get_events_with_embeddings(location, start_date, end_date)
-        
-        if not events:
-            return []
-        
-        # Pre-calculate query norm once (optimization)
-        query_vec = np.array(query_embedding, dtype=np.float32)
-        norm_query = np.linalg.norm(query_vec)
-        
-        if norm_query == 0:
-            return []
-        
-        # Vectorized similarity calculation
-        results = []
+        index = get_event_index()
+        index.ensure_loaded(self.get_event_embedding_rows, metadata_loader=self.get_event_index_metadata)
+        self.sync_event_index()
+
+        return index.search(
+            query_embedding,
+            location=location,
+            limit=int(limit),
+            similarity_threshold=similarity_threshold,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+
+    def search_events_hybrid(self, query_text, query_embedding=None, location=None, limit=10,
+                             similarity_threshold=0.3, start_date=None, end_date=None, exclude_ids=None):
+        """
+        Search events in one pass, fusing keyword (BM25) and embedding similarity rankings.
+        Location, date and exclusion filters are applied inside the index, so up to
+        `limit` eligible events come back without a second query.
+        Falls back to the SQL keyword search while no events have embeddings, and tops
+        up a short result list with SQL keyword matches among events that have no
+        embedding yet, so a new event can be found by its title before it is embedded.
+        The top-up query only runs while such events exist (see
+        has_events_without_embedding), so usually a search makes no extra query.
         
-        for event in events:
-            event_embedding = event.get('embedding')
-            if not event_embedding:
-                continue
+        Args:
+            query_text (str): Free-text keywords
+            query_embedding (list, optional): Embedding vector for the query
+            location (str, optional): Filter by location city
+            limit (int): Maximum number of results
+            similarity_threshold (float): Minimum similarity for vector candidates
+            start_date (date, optional): Filter events from this date onwards
+            end_date (date, optional): Filter events up to this date
+            exclude_ids (set, optional): Event IDs to leave out (e.g. already registered)
             
-            try:
-                # Convert to float32 for faster computation
-                event_vec = np.array(event_embedding, dtype=np.float32)
-                norm_event = np.linalg.norm(event_vec)
-                
-                if norm_event == 0:
-                    continue
-                
-                # Fast cosine similarity calculation
-                dot_product = np.dot(query_vec, event_vec)
-                similarity = dot_product / (norm_query * norm_event)
-                
-                if similarity >= similarity_threshold:
-                    # Remove embedding from result (not needed in response)
-                    event_copy = {k: v for k, v in event.items() if k != 'embedding'}
-                    event_copy['similarity_score'] = float(similarity)
-                    results.append(event_copy)
-            except (ValueError, TypeError):
-                # Skip events with invalid embeddings
-                continue
-        
-        # Sort by similarity (highest first) and limit results
-        results.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return results[:limit]
+        Returns:
+            list: List of events, best match first
+        """
+        index = get_event_index()
+        index.ensure_loaded(self.get_event_embedding_rows, metadata_loader=self.get_event_index_metadata)
+        self.sync_event_index()
+
+        if len(index) == 0:
+            return self.get_filtered_events(
+                keyword=query_text or None,
+                location=location,
+                start_date=start_date,
+                end_date=end_date,
+                exclude_ids=exclude_ids,
+                limit=limit,
+            )
 
+        results = index.hybrid_search(
+            query_text,
+            query_embedding=query_embedding,
+            location=location,
+            limit=int(limit),
+            similarity_threshold=similarity_threshold,
+            start_date=start_date,
+            end_date=end_date,
+            exclude_ids=exclude_ids,
+        )
+        if query_text and len(results) < int(limit) and self.has_events_without_embedding():
+            results += self.get_filtered_events(
+                keyword=query_text,
+                location=location,
+                start_date=start_date,
+                end_date=end_date,
+                exclude_ids=exclude_ids,
+                limit=int(limit) - len(results),
+                without_embedding=True,
+            )
+        return results
 
     
     # -----------------------------
@@ -928,6 +1261,8 @@ class DataAccess:
                 (name, description, department, owner_user_id, join_code),
             )
             new_id = cursor.lastrowid
+        # a new team shows up in everyone's list_teams
+        get_tool_result_cache().invalidate_all()
         self.insert_user_in_team(owner_user_id, new_id)
         return self.get_team_by_id(new_id)
 
@@ -970,6 +1305,7 @@ class DataAccess:
             sql = "INSERT INTO TeamMembership (UserID, TeamID) VALUES (%s, %s)"
             with self.get_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(sql, (user_id, team_id))
+            get_tool_result_cache().invalidate_user(user_id=user_id)
         except Exception as e:
             print(f"Error in insert_user_in_team: {e}")
             raise
@@ -1023,6 +1359,8 @@ class DataAccess:
             with self.get_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(sql, (team_id,))
                 conn.commit()
+            # members' teams and team events change, and the team leaves everyone's list
+            get_tool_result_cache().invalidate_all()
         except Exception as e:
             print(f"Error in delete_team: {e}")
             raise
@@ -1033,6 +1371,7 @@ class DataAccess:
             sql = "DELETE FROM TeamMembership WHERE UserID = %s AND TeamID = %s"
             with self.get_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(sql, (user_id, team_id))
+            get_tool_result_cache().invalidate_user(user_id=user_id)
         except Exception as e:
             print(f"Error in leave_team: {e}")
             raise
@@ -1101,6 +1440,8 @@ class DataAccess:
         try:
             with self.get_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(sql, (team_id, event_id))
+            # every member's team events change
+            get_tool_result_cache().invalidate_all()
         except Exception as e:
             print(f"Error in insert_team_to_event_registration: {e}")
             raise
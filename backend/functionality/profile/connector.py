@@ -1,6 +1,6 @@
 from typing import List, Dict, Any
 from data_access import DataAccess
-import bcrypt
+from auth.password_hasher import get_password_hasher
 
 class ProfileConnector:
     """Handles profile-related database operations."""
@@ -26,6 +26,6 @@ class ProfileConnector:
         """Hashed and updates the user's password."""
         if self.dao.verify_user_by_password(user_email, old_password) is None:
                 return False
-        hashed_password = bcrypt.hashpw(new_password.encode("utf-8"), bcrypt.gensalt())
+        hashed_password = get_password_hasher().hash_password(new_password)
         self.dao.update_user_password(user_email, hashed_password)
         return True
\ No newline at end of file
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, g, request, send_from_directory, current_app
 from profile.connector import ProfileConnector
-from auth.routes import token_required
+from auth.password_hasher import PasswordHasherBusyError
+from auth.routes import BUSY_RETRY_AFTER, token_required
 import os
 import uuid
 
@@ -102,6 +103,8 @@ def update_password():
             return jsonify({"error": "Old password is incorrect"}), 400
         
         return jsonify({"message": "Password updated successfully"}), 200
+    except PasswordHasherBusyError:
+        return jsonify({"error": "The server is busy, please try again in a moment."}), 503, {"Retry-After": BUSY_RETRY_AFTER}
     except Exception as e:
         print(f"Error in update_password: {e}")
         return jsonify({"error": "Something went wrong"}), 500
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Unit tests for the IVF approximate nearest neighbour index and its use
+inside EventEmbeddingIndex.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.ann_index import IVFIndex, create_ann_index
+from chatbot.embedding_index import EventEmbeddingIndex
+
+
+def _clustered(n=2000, dim=32, topics=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim))
+    labels = rng.integers(0, topics, size=n)
+    return (centers[labels] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def _rows(vectors, start_id=0):
+    return [
+        {"ID": start_id + i, "Date": "2099-01-01", "StartTime": "10:00:00", "LocationCity": "London", "embedding": v}
+        for i, v in enumerate(vectors)
+    ]
+
+
+def _ids(results):
+    return [r["ID"] for r in results]
+
+
+def test_create_ann_index_by_name():
+    assert create_ann_index("exact") is None
+    assert isinstance(create_ann_index("IVF", n_probe=2), IVFIndex)
+    with pytest.raises(ValueError):
+        create_ann_index("hnsw")
+
+
+def test_ivf_recall_close_to_exact():
+    vectors = _clustered()
+    index = EventEmbeddingIndex(ann=IVFIndex(n_lists=20, n_probe=3), ann_min_size=100)
+    index.load(_rows(vectors))
+    assert index.ann.trained
+
+    hits = total = 0
+    for query in vectors[:50]:
+        exact = _ids(index.search(query, limit=10, similarity_threshold=-1, exact=True))
+        approx = _ids(index.search(query, limit=10, similarity_threshold=-1))
+        hits += len(set(exact) & set(approx))
+        total += len(exact)
+    assert hits / total >= 0.9
+
+
+def test_ann_not_trained_below_min_size():
+    index = EventEmbeddingIndex(ann=IVFIndex(n_lists=4), ann_min_size=100)
+    index.load(_rows(_clustered(n=50)))
+    assert not index.ann.trained
+    assert len(index.search(_clustered(n=1)[0], limit=5, similarity_threshold=-1)) == 5
+
+
+def test_incremental_insert_and_delete_with_ann():
+    vectors = _clustered(n=500)
+    index = EventEmbeddingIndex(ann=IVFIndex(n_lists=10, n_probe=2), ann_min_size=100)
+    index.load(_rows(vectors))
+
+    new_vec = vectors[7] * 1.01
+    index.upsert({"ID": 9999, "Date": "2099-01-01", "StartTime": "10:00:00",
+                  "LocationCity": "London", "embedding": new_vec})
+    assert 9999 in _ids(index.search(new_vec, limit=3, similarity_threshold=-1))
+
+    index.remove(9999)
+    assert 9999 not in _ids(index.search(new_vec, limit=3, similarity_threshold=-1))
+
+
+def test_ann_persistence_round_trip(tmp_path):
+    path = str(tmp_path / "ivf.npz")
+    vectors = _clustered(n=400)
+
+    first = EventEmbeddingIndex(ann=IVFIndex(n_lists=8, n_probe=2), ann_min_size=100, ann_path=path)
+    first.load(_rows(vectors))
+    assert os.path.exists(path)
+
+    second = EventEmbeddingIndex(ann=IVFIndex(n_lists=8, n_probe=2), ann_min_size=100, ann_path=path)
+    second.load(_rows(vectors))
+    np.testing.assert_allclose(second.ann.centroids, first.ann.centroids)
+
+    query = vectors[3]
+    assert _ids(first.search(query, limit=5, similarity_threshold=-1)) == \
+        _ids(second.search(query, limit=5, similarity_threshold=-1))
+
+
+
+def test_incremental_assignments_are_persisted(tmp_path):
+    path = str(tmp_path / "ivf.npz")
+    vectors = _clustered(n=400)
+    index = EventEmbeddingIndex(ann=IVFIndex(n_lists=8, n_probe=2), ann_min_size=100, ann_path=path)
+    index.load(_rows(vectors))
+
+    index.upsert(_rows(vectors[:1], start_id=9999)[0])
+    index.remove(5)
+    index.save_ann()
+
+    stored = IVFIndex().load(path)
+    assert 9999 in stored and 5 not in stored
+    assert stored[9999] == stored[0]
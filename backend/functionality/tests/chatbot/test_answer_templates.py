@@ -0,0 +1,94 @@
+"""
+Unit tests for locally templated chatbot answers.
+"""
+
+import sys
+import os
+from unittest.mock import Mock, patch
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.answer_templates import needs_reasoning, render_answer
+from chatbot.connector import ChatbotConnector
+
+
+def _render(tool_name, data, message="show me"):
+    return render_answer(message, [(tool_name, {"type": "x", "data": data})])
+
+
+def test_stats_template():
+    text = _render("get_my_stats", {"total_hours": 12.0, "completed_events": 3, "upcoming_events": 1, "badges_count": 1})
+    assert text == (
+        "So far you've volunteered 12 hours across 3 completed events. "
+        "You have 1 coming up and 1 badge earned."
+    )
+
+
+def test_upcoming_events_template():
+    events = [
+        {"title": "Beach Cleanup", "Date": "2025-11-10", "StartTime": "9:30:00", "location": "Brighton"},
+        {"title": "Food Bank", "Date": "2025-11-12"},
+    ]
+    assert _render("get_my_upcoming_events", events) == (
+        "You have 2 upcoming events. Next up: Beach Cleanup on Mon 10 Nov at 09:30 in Brighton."
+    )
+    assert "don't have any upcoming events" in _render("get_my_upcoming_events", [])
+
+
+def test_event_templates_use_the_real_total_when_the_list_was_cut():
+    events = [{"title": f"Event {i}", "Date": "2025-11-10"} for i in range(3)]
+    upcoming = render_answer("show me", [("get_my_upcoming_events", {"data": events, "total": 12})])
+    assert upcoming.startswith("You have 12 upcoming events. Next up: Event 0")
+    completed = render_answer("show me", [("get_my_completed_events", {"data": events, "total": 40})])
+    assert completed == "You've completed 40 events: Event 0, Event 1, Event 2 and 37 more."
+
+
+@patch("chatbot.connector.EmbeddingHelper")
+def test_event_tools_count_events_beyond_the_limit(mock_emb):
+    dao = Mock()
+    dao.get_upcoming_events.return_value = [{"ID": i, "Title": f"Event {i}"} for i in range(2)]
+    dao.get_upcoming_events_count.return_value = 9
+    with patch("chatbot.connector.DataAccess", return_value=dao), patch("chatbot.connector.OpenAI"):
+        bot = ChatbotConnector()
+
+    result = bot._run_tool_call("get_my_upcoming_events", {"limit": 2}, "test@example.com", 1)
+    assert result["total"] == 9
+    result = bot._run_tool_call("get_my_upcoming_events", {"limit": 5}, "test@example.com", 1)
+    assert "total" not in result
+
+
+def test_badge_templates_list_names():
+    badges = [{"Name": f"Badge {i}"} for i in range(7)]
+    assert _render("get_my_badges", badges[:2]) == "You've earned 2 badges: Badge 0 and Badge 1."
+    assert _render("get_available_badges", badges).endswith("Badge 4 and 2 more.")
+    assert _render("get_available_badges", []) == "You've earned every badge available. Great work!"
+
+
+def test_model_answers_when_reasoning_or_unsupported():
+    assert needs_reasoning("which of my events should I skip?")
+    assert _render("get_my_badges", [], message="why don't I have any badges?") is None
+    assert _render("search_events", []) is None
+    assert render_answer("show my badges", [("get_my_badges", {"data": []}), ("get_my_stats", {"data": {}})]) is None
+    assert render_answer("show my badges", [("get_my_badges", None)]) is None
+
+
+@patch("chatbot.connector.EmbeddingHelper")
+def test_routed_and_templated_stream_makes_no_model_call(mock_emb):
+    dao = Mock()
+    dao.get_user_by_email.return_value = {"FirstName": "John"}
+    dao.get_user_id_by_email.return_value = 1
+    dao.get_user_badges.return_value = [{"ID": 1, "Name": "Event Starter"}]
+
+    with patch("chatbot.connector.DataAccess", return_value=dao), patch("chatbot.connector.OpenAI"):
+        connector = ChatbotConnector()
+    connector.dao = dao
+    emitted = []
+    connector.process_message_stream(
+        "show my badges", "test@example.com", lambda name, payload, room=None: emitted.append(payload)
+    )
+
+    assert connector.openai_client.chat.completions.create.call_count == 0
+    assert emitted[1]["response"] == "You've earned 1 badge: Event Starter."
+    assert emitted[-1]["done"] and emitted[-1]["final_text"] == emitted[1]["response"]
@@ -0,0 +1,135 @@
+"""
+Unit tests for the socket chat worker pool and the non-blocking Socket.IO handler.
+"""
+
+import sys
+import os
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import chatbot.socket_chat as socket_chat
+from chatbot.chat_workers import ChatBusyError, ChatWorkerPool
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_per_user_limit_rejects_extra_turns():
+    pool = ChatWorkerPool(max_workers=4, per_user_limit=1, max_pending=10)
+    release = threading.Event()
+    future = pool.submit("a@example.com", release.wait)
+
+    with pytest.raises(ChatBusyError):
+        pool.submit("a@example.com", release.wait)
+    # other users are unaffected
+    other = pool.submit("b@example.com", lambda: "ok")
+    assert other.result(timeout=2) == "ok"
+
+    release.set()
+    future.result(timeout=2)
+    assert _wait_for(lambda: pool.stats()["in_flight"] == 0)
+    stats = pool.stats()
+    assert stats["rejected_user"] == 1
+    assert stats["completed"] == 2
+    assert stats["active_users"] == 0
+    pool.shutdown()
+
+
+def test_queue_bound_rejects_when_server_is_full():
+    pool = ChatWorkerPool(max_workers=1, per_user_limit=5, max_pending=1)
+    release = threading.Event()
+    pool.submit("a", release.wait)
+    pool.submit("b", release.wait)
+    assert pool.stats()["queued"] == 1
+
+    with pytest.raises(ChatBusyError):
+        pool.submit("c", release.wait)
+    assert pool.stats()["rejected_busy"] == 1
+
+    release.set()
+    assert _wait_for(lambda: pool.stats()["completed"] == 2)
+    pool.shutdown()
+
+
+def test_failing_turn_releases_its_slot():
+    pool = ChatWorkerPool(max_workers=2, per_user_limit=1)
+
+    def boom():
+        raise RuntimeError("llm down")
+
+    pool.submit("a", boom).result(timeout=2)
+    assert _wait_for(lambda: pool.stats()["failed"] == 1)
+    # the user can chat again straight away
+    assert pool.submit("a", lambda: 1).result(timeout=2) == 1
+    pool.shutdown()
+
+
+class _FakeConnector:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def process_message_stream(self, user_message, user_email, emit_fn, room, cancel_event=None):
+        time.sleep(self.delay)
+        emit_fn("chatbot_response", {"response": f"echo {user_message}", "done": False}, room=room)
+        emit_fn("chatbot_response", {"response": f"echo {user_message}", "done": True}, room=room)
+
+
+def _make_client(monkeypatch, connector, pool):
+    monkeypatch.setattr(socket_chat, "get_chatbot_connector", lambda: connector, raising=True)
+    monkeypatch.setattr(socket_chat, "get_chat_worker_pool", lambda: pool, raising=True)
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "x"
+    socket_chat.socketio.init_app(app, async_mode="threading")
+    return socket_chat.socketio.test_client(app)
+
+
+def _done_payloads(client):
+    return [
+        event["args"][0]
+        for event in client.get_received()
+        if event["name"] == "chatbot_response" and event["args"][0].get("done")
+    ]
+
+
+def test_handler_returns_before_the_reply_is_generated(monkeypatch):
+    pool = ChatWorkerPool(max_workers=2, per_user_limit=2)
+    client = _make_client(monkeypatch, _FakeConnector(delay=0.3), pool)
+
+    started = time.perf_counter()
+    client.emit("chatbot_message", {"message": "hello", "user_email": "a@example.com"})
+    assert time.perf_counter() - started < 0.2
+
+    done = []
+    assert _wait_for(lambda: done.extend(_done_payloads(client)) or done)
+    assert done[0]["response"] == "echo hello"
+    assert _wait_for(lambda: not socket_chat._active_streams)
+    client.disconnect()
+    pool.shutdown()
+
+
+def test_user_over_limit_gets_busy_reply(monkeypatch):
+    pool = ChatWorkerPool(max_workers=2, per_user_limit=1)
+    client = _make_client(monkeypatch, _FakeConnector(delay=0.3), pool)
+
+    client.emit("chatbot_message", {"message": "first", "user_email": "a@example.com"})
+    client.emit("chatbot_message", {"message": "second", "user_email": "a@example.com"})
+
+    done = []
+    assert _wait_for(lambda: done.extend(_done_payloads(client)) or len(done) >= 2)
+    assert done[0]["busy"] is True
+    assert done[1]["response"] == "echo first"
+    client.disconnect()
+    pool.shutdown()
@@ -95,6 +95,7 @@ def mock_data_access():
     # event search fallbacks (not always used)
     dao.get_filtered_events.return_value = []
     dao.search_events_with_embeddings.return_value = []
+    dao.search_events_hybrid.return_value = []
     dao.get_user_events.return_value = []
 
     # team events
@@ -161,6 +162,8 @@ class TestChatbotToolCalling:
 
                 connector = ChatbotConnector()
                 connector.dao = mock_data_access
+                connector.intent_router = None  # exercise the model's tool choice
+                connector.use_answer_templates = False  # and the model's answer
 
                 response, category, events, teams, badges, team_events = connector.process_message(
                     "show my events", "test@example.com"
@@ -194,6 +197,8 @@ class TestChatbotToolCalling:
 
                 connector = ChatbotConnector()
                 connector.dao = mock_data_access
+                connector.intent_router = None  # exercise the model's tool choice
+                connector.use_answer_templates = False  # and the model's answer
 
                 response, category, events, teams, badges, team_events = connector.process_message(
                     "what teams am i in", "test@example.com"
@@ -227,6 +232,8 @@ class TestChatbotToolCalling:
 
                 connector = ChatbotConnector()
                 connector.dao = mock_data_access
+                connector.intent_router = None  # exercise the model's tool choice
+                connector.use_answer_templates = False  # and the model's answer
 
                 response, category, events, teams, badges, team_events = connector.process_message(
                     "show my badges", "test@example.com"
@@ -260,6 +267,8 @@ class TestChatbotToolCalling:
 
                 connector = ChatbotConnector()
                 connector.dao = mock_data_access
+                connector.intent_router = None  # exercise the model's tool choice
+                connector.use_answer_templates = False  # and the model's answer
 
                 response, category, events, teams, badges, team_events = connector.process_message(
                     "show my impact", "test@example.com"
@@ -283,6 +292,8 @@ class TestChatbotToolCalling:
             with patch("chatbot.connector.OpenAI"):
                 connector = ChatbotConnector()
                 connector.dao = mock_data_access
+                connector.intent_router = None  # exercise the model's tool choice
+                connector.use_answer_templates = False  # and the model's answer
 
                 name1 = connector._get_user_first_name("test@example.com")
                 name2 = connector._get_user_first_name("test@example.com")
@@ -290,3 +301,59 @@ class TestChatbotToolCalling:
         assert name1 == "John"
         assert name2 == "John"
         # DataAccess.get_user_by
+
+    @patch("chatbot.connector.EmbeddingHelper")
+    def test_search_events_single_hybrid_pass(self, mock_emb, mock_data_access):
+        """
+        search_events runs one hybrid search with registered events excluded
+        inside the index, and never falls back to a second LIKE query.
+        """
+        mock_data_access.get_registered_event_ids.return_value = {7, 8}
+        mock_data_access.search_events_hybrid.return_value = [
+            {"ID": 3, "Title": "Beach Cleanup", "Date": "2099-01-01", "LocationCity": "Brighton"}
+        ]
+        mock_emb.return_value.generate_embedding.return_value = [0.1, 0.2]
+
+        with patch("chatbot.connector.DataAccess", return_value=mock_data_access):
+            with patch("chatbot.connector.OpenAI"):
+                connector = ChatbotConnector()
+                connector.dao = mock_data_access
+                connector.intent_router = None  # exercise the model's tool choice
+                connector.use_answer_templates = False  # and the model's answer
+
+                result = connector._execute_tool_call(
+                    "search_events", {"keyword": "beach cleanup", "limit": 5}, "test@example.com"
+                )
+
+        kwargs = mock_data_access.search_events_hybrid.call_args.kwargs
+        assert kwargs["query_text"] == "beach cleanup"
+        assert kwargs["query_embedding"] == [0.1, 0.2]
+        assert kwargs["exclude_ids"] == {7, 8}
+        mock_data_access.get_filtered_events.assert_not_called()
+        mock_data_access.get_user_events.assert_not_called()
+        mock_data_access.get_team_events.assert_not_called()
+        assert [e["id"] for e in result["data"]] == [3]
+
+    @patch("chatbot.connector.EmbeddingHelper")
+    def test_keyword_search_excludes_registered_in_query(self, mock_emb, mock_data_access):
+        """
+        Non-semantic search pushes the registration anti-join and limit into SQL.
+        """
+        mock_data_access.get_filtered_events.return_value = [{"ID": 4, "Title": "Park run"}]
+
+        with patch("chatbot.connector.DataAccess", return_value=mock_data_access):
+            with patch("chatbot.connector.OpenAI"):
+                connector = ChatbotConnector()
+                connector.dao = mock_data_access
+                connector.intent_router = None  # exercise the model's tool choice
+                connector.use_answer_templates = False  # and the model's answer
+
+                result = connector._execute_tool_call(
+                    "search_events", {"keyword": "park", "limit": 3, "use_semantic": False}, "test@example.com"
+                )
+
+        kwargs = mock_data_access.get_filtered_events.call_args.kwargs
+        assert kwargs["exclude_user_email"] == "test@example.com"
+        assert kwargs["limit"] == 3
+        mock_data_access.get_registered_event_ids.assert_not_called()
+        assert [e["id"] for e in result["data"]] == [4]
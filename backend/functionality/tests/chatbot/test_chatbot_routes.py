@@ -44,7 +44,7 @@ def fake_connector():
 
 def test_chat_success(monkeypatch, fake_connector):
     """Test successful chat request."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     app = make_test_app(chatbot_routes.bp)
     client = app.test_client()
@@ -59,7 +59,7 @@ def test_chat_success(monkeypatch, fake_connector):
 
 def test_chat_with_events(monkeypatch, fake_connector):
     """Test chat request that returns events."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     fake_connector.events_list = [{"ID": 1, "Title": "Event 1"}]
     fake_connector.category = "general"
@@ -76,7 +76,7 @@ def test_chat_with_events(monkeypatch, fake_connector):
 
 def test_chat_with_teams(monkeypatch, fake_connector):
     """Test chat request that returns teams."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     fake_connector.teams_list = [{"ID": 1, "Name": "Team 1"}]
     fake_connector.category = "general"
@@ -93,7 +93,7 @@ def test_chat_with_teams(monkeypatch, fake_connector):
 
 def test_chat_with_badges(monkeypatch, fake_connector):
     """Test chat request that returns badges."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     fake_connector.badges_list = [{"ID": 1, "Name": "Badge 1"}]
     fake_connector.category = "general"
@@ -110,7 +110,7 @@ def test_chat_with_badges(monkeypatch, fake_connector):
 
 def test_chat_with_team_events(monkeypatch, fake_connector):
     """Test chat request that returns team events."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     fake_connector.team_events_list = [{"ID": 1, "Title": "Team Event 1"}]
     
@@ -125,7 +125,7 @@ def test_chat_with_team_events(monkeypatch, fake_connector):
 
 def test_chat_no_message(monkeypatch, fake_connector):
     """Test chat request without message."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     app = make_test_app(chatbot_routes.bp)
     client = app.test_client()
@@ -138,7 +138,7 @@ def test_chat_no_message(monkeypatch, fake_connector):
 
 def test_chat_empty_message(monkeypatch, fake_connector):
     """Test chat request with empty/whitespace message."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     app = make_test_app(chatbot_routes.bp)
     client = app.test_client()
@@ -149,7 +149,7 @@ def test_chat_empty_message(monkeypatch, fake_connector):
 
 def test_chat_prompt_injection_error(monkeypatch, fake_connector):
     """Test chat request with prompt injection error."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     fake_connector.process_message = Mock(side_effect=PromptInjectionError("Suspicious input"))
     
@@ -164,7 +164,7 @@ def test_chat_prompt_injection_error(monkeypatch, fake_connector):
 
 def test_chat_value_error(monkeypatch, fake_connector):
     """Test chat request with ValueError."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     fake_connector.process_message = Mock(side_effect=ValueError("Configuration error"))
     
@@ -179,7 +179,7 @@ def test_chat_value_error(monkeypatch, fake_connector):
 
 def test_chat_general_exception(monkeypatch, fake_connector):
     """Test chat request with general exception."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     fake_connector.process_message = Mock(side_effect=Exception("Unexpected error"))
     
@@ -194,7 +194,7 @@ def test_chat_general_exception(monkeypatch, fake_connector):
 
 def test_chat_events_category_override(monkeypatch, fake_connector):
     """Test that events override category even if connector sets different category."""
-    monkeypatch.setattr(chatbot_routes, "ChatbotConnector", lambda: fake_connector, raising=True)
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
     
     fake_connector.events_list = [{"ID": 1, "Title": "Event 1"}]
     fake_connector.category = "badges"  # Connector says badges, but events should override
@@ -207,3 +207,38 @@ def test_chat_events_category_override(monkeypatch, fake_connector):
     data = response.get_json()
     assert data["category"] == "events"  # Should be overridden to events
 
+
+
+def test_stats_returns_pool_statistics(monkeypatch, fake_connector):
+    """Test the pool statistics endpoint."""
+    fake_connector.pool_stats = lambda: {"requests": 3, "connections_opened": 1}
+    fake_connector.prompt_stats = lambda: {"answer": {"calls": 1}}
+    fake_connector.stage_stats = lambda: {"llm_answer": {"count": 1, "p95_ms": 250}}
+    fake_connector.cache_stats = lambda: {"responses": {"hits": 4}}
+    fake_connector.resilience_stats = lambda: {"llm": {"breaker": {"state": "closed"}}}
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
+    monkeypatch.setenv("OPS_USER_EMAILS", "ops@example.com, Test@Example.com")
+
+    app = make_test_app(chatbot_routes.bp)
+    client = app.test_client()
+
+    response = client.get("/api/chatbot/stats")
+    assert response.status_code == 200
+    assert response.get_json()["http_pool"]["connections_opened"] == 1
+    assert response.get_json()["prompts"]["answer"]["calls"] == 1
+    assert response.get_json()["stages"]["llm_answer"]["p95_ms"] == 250
+    assert response.get_json()["caches"]["responses"]["hits"] == 4
+    assert response.get_json()["resilience"]["llm"]["breaker"]["state"] == "closed"
+
+
+def test_stats_are_forbidden_for_other_users(monkeypatch, fake_connector):
+    """Operational metrics are only served to operators."""
+    monkeypatch.setattr(chatbot_routes, "get_chatbot_connector", lambda: fake_connector, raising=True)
+    monkeypatch.setenv("OPS_USER_EMAILS", "ops@example.com")
+
+    app = make_test_app(chatbot_routes.bp)
+    response = app.test_client().get("/api/chatbot/stats")
+    assert response.status_code == 403
+
+    monkeypatch.delenv("OPS_USER_EMAILS")
+    assert app.test_client().get("/api/chatbot/stats").status_code == 403
@@ -0,0 +1,155 @@
+"""
+Unit tests for token streaming in ChatbotConnector.process_message_stream.
+"""
+
+import sys
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.connector import ChatbotConnector
+from chatbot.resilience import CircuitBreaker, ResilientCaller
+
+
+def _tool_call_response(tool_name):
+    message = SimpleNamespace(
+        tool_calls=[
+            SimpleNamespace(id="call_1", function=SimpleNamespace(name=tool_name, arguments="{}"))
+        ],
+        content=None,
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _delta(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class _FakeStream:
+    """Iterable of completion chunks that records how far it was consumed."""
+
+    def __init__(self, pieces, on_chunk=None, fail_after=None):
+        self.pieces = pieces
+        self.on_chunk = on_chunk
+        self.fail_after = fail_after
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        yield SimpleNamespace(choices=[])  # role-only / keep-alive chunk
+        for i, piece in enumerate(self.pieces):
+            if self.fail_after is not None and i == self.fail_after:
+                raise ConnectionError("stream dropped")
+            self.consumed += 1
+            if self.on_chunk:
+                self.on_chunk(i)
+            yield _delta(piece)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connector():
+    dao = Mock()
+    dao.get_user_by_email.return_value = {"FirstName": "John"}
+    dao.get_user_badges.return_value = [{"ID": 1, "Name": "Event Starter", "Description": "", "IconURL": None}]
+    with patch("chatbot.connector.EmbeddingHelper"), \
+            patch("chatbot.connector.DataAccess", return_value=dao), \
+            patch("chatbot.connector.OpenAI"):
+        bot = ChatbotConnector()
+    bot.dao = dao
+    bot.intent_router = None
+    bot.use_answer_templates = False
+    return bot
+
+
+def _run(connector, stream, cancel_event=None):
+    connector.openai_client.chat.completions.create.side_effect = [
+        _tool_call_response("get_my_badges"),
+        stream,
+    ]
+    emitted = []
+    connector.process_message_stream(
+        "show my badges",
+        "test@example.com",
+        lambda name, payload, room=None: emitted.append(payload),
+        room="sid-1",
+        cancel_event=cancel_event,
+    )
+    return emitted
+
+
+def test_second_call_is_streamed_and_coalesced(connector):
+    pieces = ["You", " have", " one", " badge", ":", " Event", " Starter", "."]
+    emitted = _run(connector, _FakeStream(pieces))
+
+    create_kwargs = connector.openai_client.chat.completions.create.call_args.kwargs
+    assert create_kwargs["stream"] is True
+
+    partial, *streamed, done = emitted
+    assert partial["partial"] and partial["badges"]
+    assert streamed[0]["response"] == "You"  # first token goes out immediately
+    assert len(streamed) < len(pieces)  # later tokens are coalesced
+    assert "".join(p["response"] for p in streamed) == "".join(pieces)
+    assert done["done"] and done["final_text"] == "You have one badge: Event Starter."
+    assert "cancelled" not in done
+    assert connector._get_conversation_history("test@example.com")[-1]["content"] == done["final_text"]
+
+
+def test_cancel_stops_reading_the_stream(connector):
+    cancel_event = threading.Event()
+    stream = _FakeStream(
+        ["a"] * 50,
+        on_chunk=lambda i: cancel_event.set() if i == 2 else None,
+    )
+    emitted = _run(connector, stream, cancel_event)
+
+    assert stream.closed
+    assert stream.consumed == 3
+    assert emitted[-1]["done"] and emitted[-1]["cancelled"]
+
+
+def test_stream_failure_before_any_text_falls_back(connector):
+    # the data-only template stands in for the model's answer
+    emitted = _run(connector, _FakeStream(["never"], fail_after=0))
+    assert emitted[-2]["response"] == "You've earned 1 badge: Event Starter."
+    assert emitted[-1]["final_text"] == "You've earned 1 badge: Event Starter."
+
+
+def test_stream_failure_midway_keeps_partial_text(connector):
+    emitted = _run(connector, _FakeStream(["Partial", " answer", " lost"], fail_after=2))
+    assert emitted[-1]["final_text"] == "Partial answer"
+
+
+def test_stream_failure_midway_trips_the_breaker_and_closes_the_stream(connector):
+    connector.llm_caller = ResilientCaller("llm", max_retries=0, breaker=CircuitBreaker("llm", failure_threshold=1))
+    stream = _FakeStream(["Partial", " answer"], fail_after=1)
+    _run(connector, stream)
+
+    assert stream.closed
+    assert connector.llm_caller.breaker.state == CircuitBreaker.OPEN
+    assert connector.llm_caller.stats()["failures"] == 1
+
+
+def test_stream_stops_at_the_call_deadline(connector):
+    clock = SimpleNamespace(now=0.0)
+    connector.llm_caller = ResilientCaller("llm", deadline=10, max_retries=0, clock=lambda: clock.now)
+
+    def advance(i):
+        clock.now += 4
+
+    stream = _FakeStream(["a", "b", "c", "d", "e"], on_chunk=advance)
+    emitted = _run(connector, stream)
+
+    assert stream.closed
+    assert stream.consumed == 3  # the third chunk arrived after the 10s deadline
+    assert emitted[-1]["final_text"] == "ab"
+    assert connector.llm_caller.stats()["deadline_exceeded"] == 1
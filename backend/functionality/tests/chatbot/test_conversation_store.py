@@ -0,0 +1,117 @@
+"""
+Unit tests for the bounded chatbot conversation stores.
+"""
+
+import sys
+import os
+import tracemalloc
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.conversation_store import (
+    InMemoryConversationStore,
+    SQLiteConversationStore,
+    create_conversation_store,
+)
+from chatbot.token_counter import count_tokens
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _stores(tmp_path, clock, **kwargs):
+    return [
+        InMemoryConversationStore(clock=clock, **kwargs),
+        SQLiteConversationStore(str(tmp_path / "memory.sqlite"), clock=clock, **kwargs),
+    ]
+
+
+def test_history_is_trimmed_by_token_budget(tmp_path):
+    message = "beach cleanup in brighton this weekend"
+    budget = count_tokens(message) * 3
+    for store in _stores(tmp_path, _Clock(), max_tokens=budget, max_messages=50):
+        for i in range(10):
+            store.append("a@x.com", "user", f"{message} {i}")
+        history = store.history("a@x.com")
+        assert [m["content"][-1] for m in history] == ["8", "9"]
+        assert sum(count_tokens(m["content"]) for m in history) <= budget
+
+
+def test_newest_message_is_kept_even_if_over_budget(tmp_path):
+    for store in _stores(tmp_path, _Clock(), max_tokens=5):
+        store.append("a@x.com", "user", "short")
+        store.append("a@x.com", "assistant", "a much longer reply " * 20)
+        assert [m["role"] for m in store.history("a@x.com")] == ["assistant"]
+
+
+def test_idle_conversations_expire(tmp_path):
+    clock = _Clock()
+    for store in _stores(tmp_path, clock, ttl_seconds=60):
+        store.append("a@x.com", "user", "hello")
+        store.set_value("a@x.com", "first_name", "Ada")
+        clock.now += 30
+        assert store.history("a@x.com") == [{"role": "user", "content": "hello"}]
+        clock.now += 120
+        assert store.history("a@x.com") == []
+        assert store.get_value("a@x.com", "first_name") is None
+        clock.now += 1
+
+
+def test_least_recently_active_users_are_evicted():
+    store = InMemoryConversationStore(max_users=2)
+    store.append("a", "user", "1")
+    store.append("b", "user", "2")
+    store.history("a")
+    store.append("c", "user", "3")
+    assert store.history("b") == []
+    assert store.history("a") and store.history("c")
+    assert store.stats()["evictions"] == 1
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    first = SQLiteConversationStore(path)
+    second = SQLiteConversationStore(path)
+    first.append("a@x.com", "user", "show my badges")
+    first.set_value("a@x.com", "first_name", "Ada")
+    assert second.history("a@x.com") == [{"role": "user", "content": "show my badges"}]
+    assert second.get_value("a@x.com", "first_name") == "Ada"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_conversation_store("redis")
+
+
+def test_memory_stays_flat_across_many_users():
+    """Load test: resident memory is bounded by max_users, not by how many users ever chatted."""
+    store = InMemoryConversationStore(max_users=500, max_tokens=200)
+    reply = "Here are three beach cleanup events near you next weekend. " * 3
+
+    def simulate(users, offset):
+        for user in range(offset, offset + users):
+            key = f"user{user}@example.com"
+            store.append(key, "user", f"show events for user {user}")
+            store.append(key, "assistant", reply)
+            store.set_value(key, "first_name", f"User{user}")
+
+    tracemalloc.start()
+    try:
+        simulate(1000, 0)
+        baseline = tracemalloc.get_traced_memory()[0]
+        simulate(5000, 1000)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    assert len(store) == 500
+    assert after < baseline * 1.2
@@ -0,0 +1,173 @@
+"""
+Unit tests for the in-memory event embedding index and the DataAccess
+semantic search that is built on top of it.
+"""
+
+import sys
+import os
+from datetime import date, datetime
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.embedding_index import EventEmbeddingIndex
+from data_access import DataAccess
+
+
+NOW = datetime(2025, 11, 1, 9, 0, 0)
+
+
+def _row(event_id, embedding, city="London", day="2025-11-10", start="10:00:00"):
+    return {
+        "ID": event_id,
+        "Title": f"Event {event_id}",
+        "Date": day,
+        "StartTime": start,
+        "EndTime": "12:00:00",
+        "LocationCity": city,
+        "embedding": embedding,
+    }
+
+
+@pytest.fixture
+def index():
+    idx = EventEmbeddingIndex()
+    idx.load([
+        _row(1, [1.0, 0.0, 0.0]),
+        _row(2, [0.9, 0.1, 0.0], city="Manchester"),
+        _row(3, [0.0, 1.0, 0.0], day="2025-12-01"),
+        _row(4, [0.7, 0.7, 0.0], day="2025-10-01"),  # already in the past
+    ])
+    return idx
+
+
+def test_search_ranks_by_similarity(index):
+    results = index.search([1.0, 0.0, 0.0], limit=10, similarity_threshold=0.0, now=NOW)
+    assert [r["ID"] for r in results] == [1, 2, 3]
+    assert results[0]["similarity_score"] == pytest.approx(1.0)
+    assert "embedding" not in results[0]
+
+
+def test_search_respects_limit_and_threshold(index):
+    results = index.search([1.0, 0.0, 0.0], limit=1, similarity_threshold=0.0, now=NOW)
+    assert [r["ID"] for r in results] == [1]
+
+    results = index.search([1.0, 0.0, 0.0], limit=10, similarity_threshold=0.5, now=NOW)
+    assert [r["ID"] for r in results] == [1, 2]
+
+
+def test_search_location_filter_is_case_insensitive(index):
+    results = index.search([1.0, 0.0, 0.0], location="  manchester ", similarity_threshold=0.0, now=NOW)
+    assert [r["ID"] for r in results] == [2]
+
+
+def test_search_date_range_includes_past_events(index):
+    results = index.search(
+        [1.0, 0.0, 0.0],
+        similarity_threshold=0.0,
+        start_date=date(2025, 10, 1),
+        end_date=date(2025, 11, 10),
+        now=NOW,
+    )
+    assert sorted(r["ID"] for r in results) == [1, 2, 4]
+
+    results = index.search([0.0, 1.0, 0.0], similarity_threshold=0.0, start_date="2025-11-15", now=NOW)
+    assert [r["ID"] for r in results] == [3]
+
+
+def test_upsert_and_remove_are_incremental(index):
+    index.upsert(_row(5, [0.0, 0.0, 1.0]))
+    index.upsert(_row(1, [0.0, 0.0, 1.0]))  # embedding changed
+    results = index.search([0.0, 0.0, 1.0], similarity_threshold=0.9, now=NOW)
+    assert sorted(r["ID"] for r in results) == [1, 5]
+
+    assert index.remove(1) is True
+    assert index.remove(1) is False
+    results = index.search([0.0, 0.0, 1.0], similarity_threshold=0.9, now=NOW)
+    assert [r["ID"] for r in results] == [5]
+    assert len(index) == 4
+
+
+def test_mismatched_dimension_is_ignored(index):
+    assert index.upsert(_row(9, [1.0, 0.0])) is False
+    assert index.search([1.0, 0.0], now=NOW) == []
+
+
+def test_index_grows_beyond_initial_capacity():
+    idx = EventEmbeddingIndex()
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 16))
+    idx.load([_row(i, vectors[i].tolist()) for i in range(500)])
+    results = idx.search(vectors[123].tolist(), limit=3, similarity_threshold=0.0, now=NOW)
+    assert results[0]["ID"] == 123
+    assert len(results) == 3
+
+
+def test_dao_search_uses_shared_index():
+    dao = DataAccess()
+    idx = EventEmbeddingIndex()
+    rows = [_row(1, [1.0, 0.0]), _row(2, [0.0, 1.0])]
+
+    with patch("data_access.get_event_index", return_value=idx), \
+            patch.object(DataAccess, "get_event_embedding_rows", return_value=rows) as loader:
+        first = dao.search_events_with_embeddings([1.0, 0.0], similarity_threshold=0.5,
+                                                  start_date=date(2025, 1, 1))
+        second = dao.search_events_with_embeddings([0.0, 1.0], similarity_threshold=0.5,
+                                                   start_date=date(2025, 1, 1))
+
+    assert [e["ID"] for e in first] == [1]
+    assert [e["ID"] for e in second] == [2]
+    loader.assert_called_once()
+
+
+def test_dao_refresh_event_index_upserts_and_removes():
+    dao = DataAccess()
+    idx = EventEmbeddingIndex()
+    idx.load([_row(1, [1.0, 0.0]), _row(2, [0.0, 1.0])])
+
+    with patch("data_access.get_event_index", return_value=idx), \
+            patch.object(DataAccess, "get_event_embedding_rows", return_value=[_row(1, [0.0, 1.0])]):
+        dao.refresh_event_index([1, 2])
+
+    results = idx.search([0.0, 1.0], similarity_threshold=0.9, start_date="2025-01-01")
+    assert [r["ID"] for r in results] == [1]
+
+
+def test_dao_sync_picks_up_embeddings_written_elsewhere():
+    dao = DataAccess()
+    idx = EventEmbeddingIndex(refresh_interval=0.001)
+    idx.load([dict(_row(1, [1.0, 0.0]), EmbeddingVersion="a:m"), dict(_row(2, [0.0, 1.0]), EmbeddingVersion="b:m")])
+    # another process re-embedded event 1, added event 3 and cleared event 2
+    versions = {1: "a2:m", 3: "c:m"}
+    fresh = [dict(_row(1, [0.0, 1.0]), EmbeddingVersion="a2:m"), dict(_row(3, [1.0, 0.0]), EmbeddingVersion="c:m")]
+
+    with patch("data_access.get_event_index", return_value=idx), \
+            patch.object(DataAccess, "get_event_embedding_versions", return_value=versions), \
+            patch.object(DataAccess, "get_event_embedding_rows", return_value=fresh) as loader:
+        idx._refreshed_at = 0.0
+        dao.sync_event_index()
+        assert sorted(loader.call_args.args[0]) == [1, 2, 3]
+        loader.reset_mock()
+        idx._refreshed_at = 0.0
+        dao.sync_event_index()  # nothing changed since
+        loader.assert_not_called()
+
+    results = idx.search([1.0, 0.0], similarity_threshold=0.9, start_date="2025-01-01")
+    assert [r["ID"] for r in results] == [3]
+    assert "EmbeddingVersion" not in results[0]
+    assert len(idx) == 2
+
+
+def test_refresh_is_skipped_until_the_interval_passes():
+    idx = EventEmbeddingIndex(refresh_interval=3600)
+    assert idx.refresh_due() is False  # not loaded yet
+    idx.load([_row(1, [1.0, 0.0])])
+    assert idx.refresh_due() is False
+    idx._refreshed_at -= 3600
+    assert idx.refresh_due() is True
+    assert idx.refresh_due() is False
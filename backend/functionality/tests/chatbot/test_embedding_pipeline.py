@@ -0,0 +1,213 @@
+"""
+Unit tests for batched, concurrent embedding generation, run against a local
+stub OpenAI embeddings server.
+"""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.embedding_helper import EmbeddingHelper
+from chatbot.embedding_pipeline import (
+    EmbeddingPipeline,
+    embedding_content_hash,
+    make_batches,
+    refresh_event_embeddings,
+)
+from data_access import DataAccess
+
+
+class _StubEmbeddingsServer:
+    """Minimal /v1/embeddings server: vector = [len(text), request number]."""
+
+    def __init__(self, fail_first=0, status=429):
+        self.requests = []
+        self.fail_first = fail_first
+        self.status = status
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.requests.append(body["input"])
+                    number = len(stub.requests)
+                if number <= stub.fail_first:
+                    payload = json.dumps({"error": {"message": "slow down", "type": "rate_limit"}}).encode()
+                    self.send_response(stub.status)
+                else:
+                    payload = json.dumps({
+                        "object": "list",
+                        "model": body["model"],
+                        "data": [
+                            {"object": "embedding", "index": i, "embedding": [float(len(text)), float(number)]}
+                            for i, text in reversed(list(enumerate(body["input"])))
+                        ],
+                        "usage": {"prompt_tokens": 1, "total_tokens": 1},
+                    }).encode()
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _events(n):
+    return [{"ID": i, "text": "x" * (i + 1)} for i in range(n)]
+
+
+def test_make_batches_respects_item_and_token_limits():
+    events = _events(10)
+    assert [len(b) for b in make_batches(events, batch_size=4)] == [4, 4, 2]
+    # Each text is ~ (i + 1) // 4 + 1 tokens; a budget of 3 forces small batches
+    batches = make_batches(events, batch_size=100, max_batch_tokens=3)
+    assert sum(len(b) for b in batches) == 10
+    assert all(len(b) <= 3 for b in batches)
+
+
+def test_pipeline_batches_requests_and_preserves_order():
+    written = {}
+    with _StubEmbeddingsServer() as server:
+        helper = EmbeddingHelper("sk-test", base_url=server.base_url)
+        pipeline = EmbeddingPipeline(helper, batch_size=10, max_concurrency=3)
+        report = pipeline.run(_events(25) + [{"ID": 99, "text": "  "}], writer=written.update)
+
+    assert len(server.requests) == 3
+    assert report["embedded"] == 25
+    assert report["skipped"] == 1
+    assert report["batches"] == 3
+    assert report["events_per_second"] > 0
+    # Embeddings are matched to the right event even though the stub returns them reversed
+    assert all(written[i][0] == i + 1 for i in range(25))
+
+
+def test_pipeline_retries_rate_limits_with_backoff():
+    delays = []
+    with _StubEmbeddingsServer(fail_first=2) as server:
+        helper = EmbeddingHelper("sk-test", base_url=server.base_url)
+        pipeline = EmbeddingPipeline(helper, batch_size=50, sleep=delays.append)
+        report = pipeline.run(_events(5))
+
+    assert report["embedded"] == 5
+    assert report["retries"] == 2
+    assert report["requests"] == 3
+    assert len(delays) == 2 and delays[1] > delays[0] * 0.5
+
+
+def test_pipeline_gives_up_after_max_retries():
+    with _StubEmbeddingsServer(fail_first=100, status=500) as server:
+        helper = EmbeddingHelper("sk-test", base_url=server.base_url)
+        pipeline = EmbeddingPipeline(helper, batch_size=2, max_retries=1, sleep=lambda _: None)
+        report = pipeline.run(_events(3))
+
+    assert report["embedded"] == 0
+    assert sorted(report["failed_ids"]) == [0, 1, 2]
+    assert report["requests"] == 4
+
+
+def test_store_event_embeddings_uses_multi_row_update(mock_db_connection):
+    cursor = mock_db_connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+    dao = DataAccess()
+
+    written = dao.store_event_embeddings(
+        {1: [0.1], 2: [0.2], 3: None, 4: [0.4]},
+        content_hashes={1: "h1", 2: "h2", 4: "h4"},
+        model="m",
+        chunk_size=2,
+    )
+
+    assert written == 3
+    assert cursor.execute.call_count == 2
+    sql, params = cursor.execute.call_args_list[0][0]
+    assert "CASE ID WHEN %s THEN %s WHEN %s THEN %s" in sql
+    assert params == [1, "[0.1]", 2, "[0.2]", 1, "h1", 2, "h2", "m", 1, 2]
+
+
+
+def test_ensure_embedding_columns_adds_only_missing_columns(mock_db_connection):
+    cursor = mock_db_connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [("ID",), ("Embedding",), ("EmbeddingHash",)]
+
+    assert DataAccess().ensure_embedding_columns() == ["EmbeddingModel"]
+    assert cursor.execute.call_args_list[-1][0][0] == "ALTER TABLE Event ADD COLUMN EmbeddingModel varchar(100)"
+
+    cursor.reset_mock()
+    cursor.fetchall.return_value = [("ID",), ("EmbeddingHash",), ("EmbeddingModel",)]
+    assert DataAccess().ensure_embedding_columns() == []
+    assert cursor.execute.call_count == 1
+
+
+class _FakeDao:
+    def __init__(self, events):
+        self.events = events
+        self.stored = []
+
+    def get_all_events_for_embedding(self, event_ids=None):
+        return [e for e in self.events if event_ids is None or e["ID"] in event_ids]
+
+    def store_event_embeddings(self, embeddings, content_hashes=None, model=None):
+        self.stored.append((dict(embeddings), dict(content_hashes), model))
+
+
+def _catalogue(model):
+    fresh = embedding_content_hash("unchanged text")
+    return [
+        {"ID": 1, "text": "new event", "content_hash": embedding_content_hash("new event"),
+         "EmbeddingHash": None, "EmbeddingModel": None, "has_embedding": False},
+        {"ID": 2, "text": "unchanged text", "content_hash": fresh,
+         "EmbeddingHash": fresh, "EmbeddingModel": model, "has_embedding": True},
+        {"ID": 3, "text": "edited text", "content_hash": embedding_content_hash("edited text"),
+         "EmbeddingHash": fresh, "EmbeddingModel": model, "has_embedding": True},
+        {"ID": 4, "text": "unchanged text", "content_hash": fresh,
+         "EmbeddingHash": fresh, "EmbeddingModel": "old-model", "has_embedding": True},
+    ]
+
+
+def test_refresh_only_embeds_new_changed_or_outdated_events():
+    with _StubEmbeddingsServer() as server:
+        helper = EmbeddingHelper("sk-test", base_url=server.base_url)
+        dao = _FakeDao(_catalogue(helper.model))
+        report = refresh_event_embeddings(dao, helper)
+
+    assert report["considered"] == 4
+    assert report["up_to_date"] == 1
+    embeddings, hashes, model = dao.stored[0]
+    assert sorted(embeddings) == [1, 3, 4]
+    assert hashes[3] == embedding_content_hash("edited text")
+    assert model == helper.model
+    assert server.requests == [["new event", "edited text", "unchanged text"]]
+
+
+def test_refresh_full_and_by_event_id():
+    with _StubEmbeddingsServer() as server:
+        helper = EmbeddingHelper("sk-test", base_url=server.base_url)
+        dao = _FakeDao(_catalogue(helper.model))
+        assert refresh_event_embeddings(dao, helper, full=True)["embedded"] == 4
+        assert refresh_event_embeddings(dao, helper, event_ids=[2])["embedded"] == 0
+        assert refresh_event_embeddings(dao, helper, event_ids=[3], full=True)["embedded"] == 1
+    assert sorted(dao.stored[-1][0]) == [3]
@@ -0,0 +1,67 @@
+"""
+Unit tests for the pluggable embedding providers.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.embedding_helper import EmbeddingHelper
+from chatbot.embedding_index import EventEmbeddingIndex
+from chatbot.embedding_providers import (
+    HashingEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    create_embedding_provider,
+)
+
+
+def test_provider_selected_by_env(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "local")
+    monkeypatch.setenv("EMBEDDING_DIM", "64")
+    provider = create_embedding_provider()
+    assert isinstance(provider, HashingEmbeddingProvider)
+    assert provider.model == "local-hashing-64"
+
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "openai")
+    assert isinstance(create_embedding_provider(api_key="sk-test"), OpenAIEmbeddingProvider)
+    with pytest.raises(ValueError):
+        create_embedding_provider(api_key=None)
+    with pytest.raises(ValueError):
+        create_embedding_provider("word2vec")
+
+
+def test_hashing_embeddings_are_deterministic_and_normalised():
+    provider = HashingEmbeddingProvider(dim=128)
+    first, second = provider.embed(["Beach cleanup in Brighton", "Beach cleanup in Brighton"])
+    assert first == second
+    assert len(first) == 128
+    assert np.linalg.norm(first) == pytest.approx(1.0, rel=1e-5)
+    assert provider.embed([""])[0] == [0.0] * 128
+
+
+def test_hashing_similarity_reflects_shared_words():
+    provider = HashingEmbeddingProvider(dim=512)
+    query, related, unrelated = provider.embed_array(
+        ["beach clean up", "Volunteer beach cleanup on the seafront", "Coding club for children"]
+    )
+    assert query @ related > query @ unrelated + 0.2
+
+
+def test_helper_and_index_run_offline():
+    helper = EmbeddingHelper(provider="local")
+    assert helper.client is None
+    texts = {1: "Beach cleanup", 2: "Food bank sorting", 3: "Park tree planting"}
+    index = EventEmbeddingIndex()
+    index.load([
+        {"ID": event_id, "Title": text, "Date": "2099-01-01", "StartTime": "10:00:00",
+         "embedding": embedding}
+        for (event_id, text), embedding in zip(texts.items(), helper.generate_embeddings(list(texts.values())))
+    ])
+    results = index.hybrid_search("tree planting", helper.generate_embedding("tree planting"), limit=1)
+    assert results[0]["ID"] == 3
@@ -0,0 +1,166 @@
+"""
+Unit tests for the memory-mapped embedding store file and the index's
+store-backed mode.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.embedding_index import EventEmbeddingIndex
+from chatbot.embedding_store import EmbeddingStore, write_embedding_store
+
+
+def _rows(n=50, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    cities = ["London", "Leeds", None]
+    return [
+        {
+            "ID": 100 + i,
+            "Title": f"Event {i}",
+            "Date": "2099-01-0{}".format(1 + i % 5),
+            "StartTime": "10:00:00",
+            "LocationCity": cities[i % 3],
+            "embedding": rng.normal(size=dim).tolist(),
+        }
+        for i in range(n)
+    ]
+
+
+def _loader(rows):
+    by_id = {row["ID"]: row for row in rows}
+    calls = []
+
+    def load(event_ids):
+        calls.append(list(event_ids))
+        return [by_id[i] for i in event_ids if i in by_id]
+
+    load.calls = calls
+    return load
+
+
+def _ids(results):
+    return [r["ID"] for r in results]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "events.idx")
+    rows = _rows()
+    assert write_embedding_store(path, rows, model="test-model") == 50
+
+    store = EmbeddingStore(path)
+    assert (store.count, store.dim, store.model) == (50, 16, "test-model")
+    assert isinstance(store.matrix, np.memmap)
+    assert store.ids.tolist() == [row["ID"] for row in rows]
+    np.testing.assert_allclose(np.linalg.norm(store.matrix, axis=1), 1.0, rtol=1e-5)
+    assert store.location_names()[:3].tolist() == ["london", "leeds", ""]
+    assert str(store.dates[1]) == "2099-01-02"
+
+
+def test_store_backed_search_matches_in_memory(tmp_path):
+    path = str(tmp_path / "events.idx")
+    rows = _rows()
+    write_embedding_store(path, rows)
+
+    memory = EventEmbeddingIndex()
+    memory.load(rows)
+    mapped = EventEmbeddingIndex(store_path=path)
+    loader = _loader(rows)
+    mapped.ensure_loaded(lambda: pytest.fail("store should be used"), metadata_loader=loader)
+
+    query = rows[7]["embedding"]
+    for location in (None, "london"):
+        expected = memory.search(query, location=location, limit=5, similarity_threshold=-1)
+        got = mapped.search(query, location=location, limit=5, similarity_threshold=-1)
+        assert _ids(got) == _ids(expected)
+        assert got[0]["Title"] == expected[0]["Title"]
+        assert "embedding" not in got[0]
+    # Nothing is read from the database at startup; only the hits are hydrated
+    assert loader.calls and all(len(call) <= 5 for call in loader.calls)
+
+
+def test_store_backed_keyword_search_uses_text_from_the_file(tmp_path):
+    path = str(tmp_path / "events.idx")
+    rows = _rows()
+    write_embedding_store(path, rows)
+
+    index = EventEmbeddingIndex(store_path=path)
+    index.ensure_loaded(list)
+    # A metadata loader supplied on a later call (e.g. the first search after a preload) is picked up
+    loader = _loader(rows)
+    index.ensure_loaded(list, metadata_loader=loader)
+    results = index.hybrid_search("Event 7", limit=1, similarity_threshold=-1, start_date="2099-01-01")
+    assert results[0]["Title"] == "Event 7"
+    assert loader.calls == [[107]]
+
+
+def test_replaced_store_is_picked_up(tmp_path):
+    path = str(tmp_path / "events.idx")
+    rows = _rows()
+    write_embedding_store(path, rows[:10])
+
+    index = EventEmbeddingIndex(store_path=path, store_check_interval=0)
+    index.ensure_loaded(list, metadata_loader=_loader(rows))
+    assert len(index) == 10
+
+    write_embedding_store(path, rows)
+    results = index.search(rows[40]["embedding"], limit=1, similarity_threshold=-1)
+    assert _ids(results) == [140]
+    assert len(index) == 50
+
+
+def test_local_changes_keep_the_store_attached(tmp_path):
+    path = str(tmp_path / "events.idx")
+    rows = _rows()
+    write_embedding_store(path, rows)
+
+    loader = _loader(rows)
+    index = EventEmbeddingIndex(store_path=path, quantization="int8", min_rerank=0)
+    index.ensure_loaded(list, metadata_loader=loader)
+    index.remove(100)
+    new_row = dict(rows[0], ID=999)
+    index.upsert(new_row)
+
+    results = index.search(new_row["embedding"], limit=2, similarity_threshold=-1)
+    assert _ids(results)[0] == 999
+    assert 100 not in _ids(results)
+    assert results[0]["Title"] == "Event 0"
+    # Details of other events are still fetched per hit, never all at once
+    assert all(len(call) <= 2 for call in loader.calls)
+    # The published file is never modified by a worker
+    assert 100 in EmbeddingStore(path).ids.tolist()
+
+
+def test_local_changes_survive_a_store_reload(tmp_path):
+    path = str(tmp_path / "events.idx")
+    rows = _rows()
+    write_embedding_store(path, rows[:10], snapshot_at=0)
+
+    index = EventEmbeddingIndex(store_path=path, store_check_interval=0)
+    index.ensure_loaded(list, metadata_loader=_loader(rows))
+    new_row = dict(rows[20], ID=999)
+    index.upsert(new_row)
+    index.remove(101)
+
+    # A snapshot taken before the local changes doesn't contain them yet
+    write_embedding_store(path, rows[:30], snapshot_at=0)
+    results = index.search(new_row["embedding"], limit=2, similarity_threshold=-1)
+    assert _ids(results)[:2] == [999, 120] or _ids(results)[:2] == [120, 999]
+    assert 101 not in index._row_by_id and len(index) == 30
+
+    # A later snapshot is trusted as is
+    write_embedding_store(path, rows[:30])
+    index.search(new_row["embedding"], limit=1, similarity_threshold=-1)
+    assert 999 not in index._row_by_id and 101 in index._row_by_id
+
+
+def test_missing_store_falls_back_to_loader(tmp_path):
+    index = EventEmbeddingIndex(store_path=str(tmp_path / "missing.idx"))
+    index.ensure_loaded(lambda: _rows(n=5))
+    assert len(index) == 5
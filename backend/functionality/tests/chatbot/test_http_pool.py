@@ -0,0 +1,104 @@
+"""
+Unit tests for the shared LLM HTTP pool and the process-wide connector.
+"""
+
+import sys
+import os
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot import connector as connector_module
+from chatbot.http_pool import LLMHttpPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_pool_reuses_keep_alive_connections(server):
+    pool = LLMHttpPool(max_connections=4, max_keepalive=2)
+    try:
+        for _ in range(5):
+            assert pool.client.get(server + "/v1/models").status_code == 200
+        stats = pool.stats()
+    finally:
+        pool.close()
+
+    assert stats["requests"] == 5 and stats["in_flight"] == 0
+    assert stats["connections_opened"] == 1
+    assert stats["reuse_ratio"] == 0.8
+    assert stats["idle_connections"] == 1
+
+
+def test_failed_requests_leave_in_flight():
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    closed_port = probe.getsockname()[1]
+    probe.close()
+    pool = LLMHttpPool(max_connections=4, max_keepalive=2)
+    try:
+        for _ in range(3):
+            with pytest.raises(httpx.ConnectError):
+                pool.client.get(f"http://127.0.0.1:{closed_port}/v1/models")
+        stats = pool.stats()
+    finally:
+        pool.close()
+
+    assert stats["requests"] == 3 and stats["failed"] == 3
+    assert stats["in_flight"] == 0 and stats["responses"] == 0
+
+
+@patch("chatbot.connector.EmbeddingHelper")
+@patch("chatbot.connector.DataAccess")
+def test_shared_connector_is_created_once(mock_dao, mock_emb, monkeypatch):
+    monkeypatch.setattr(connector_module, "_shared_connector", None)
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(connector_module.get_chatbot_connector()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(c) for c in seen}) == 1
+    assert mock_dao.call_count == 1
+    # chat and embedding clients share one pool
+    shared = seen[0]
+    assert mock_emb.call_args.kwargs["http_client"] is shared.http_pool.client
+    assert shared.openai_client._client is shared.http_pool.client
+
+    connector_module.close_chatbot_connector()
+    assert connector_module._shared_connector is None
+    assert shared.http_pool.client.is_closed
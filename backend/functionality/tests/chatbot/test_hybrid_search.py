@@ -0,0 +1,151 @@
+"""
+Unit tests for the BM25 keyword index and hybrid (keyword + vector) event search.
+"""
+
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.embedding_index import EventEmbeddingIndex
+from chatbot.lexical_index import BM25Index, tokenize
+import data_access
+from data_access import DataAccess
+
+
+NOW = datetime(2025, 11, 1, 9, 0, 0)
+
+
+def _row(event_id, embedding, title, city="London", day="2025-11-10", cause=None, tags=None):
+    return {
+        "ID": event_id,
+        "Title": title,
+        "About": "",
+        "Date": day,
+        "StartTime": "10:00:00",
+        "LocationCity": city,
+        "CauseName": cause,
+        "TagName": tags,
+        "embedding": embedding,
+    }
+
+
+@pytest.fixture
+def index():
+    idx = EventEmbeddingIndex()
+    idx.load([
+        _row(1, [1.0, 0.0, 0.0], "Beach cleanup", city="Brighton", tags="Environment,Outdoors"),
+        _row(2, [0.9, 0.1, 0.0], "Park litter pick", tags="Environment"),
+        _row(3, [0.0, 1.0, 0.0], "Food bank sorting", cause="Hunger", day="2025-12-01"),
+        _row(4, [0.0, 0.0, 1.0], "Coding club for kids", cause="Education", day="2025-11-05"),
+        _row(5, [0.95, 0.05, 0.0], "River cleanup", day="2025-10-01"),  # already in the past
+    ])
+    return idx
+
+
+def _ids(results):
+    return [r["ID"] for r in results]
+
+
+def test_tokenize_folds_case_plurals_and_stopwords():
+    assert tokenize("Find me Beach Cleanups in the Parks") == ["beach", "cleanup", "park"]
+    assert tokenize("charities") == ["charity"]
+
+
+def test_bm25_prefers_rarer_terms_and_supports_remove():
+    bm25 = BM25Index()
+    bm25.add(1, "beach cleanup")
+    bm25.add(2, "park cleanup")
+    bm25.add(3, "food bank")
+    scores = bm25.score("beach cleanup")
+    assert max(scores, key=scores.get) == 1
+    assert 3 not in scores
+    bm25.remove(1)
+    assert set(bm25.score("beach")) == set()
+    assert len(bm25) == 2
+
+
+def test_keyword_match_ranks_first_even_with_weak_vector(index):
+    # The vector points at "food" but the user typed "coding"
+    results = index.hybrid_search("coding club", [0.0, 1.0, 0.0], limit=3, similarity_threshold=0.0, now=NOW)
+    assert _ids(results)[:2] in ([4, 3], [3, 4])
+    assert results[0]["hybrid_score"] >= results[1]["hybrid_score"]
+    coding = next(r for r in results if r["ID"] == 4)
+    assert coding["lexical_score"] > 0
+
+
+def test_both_signals_agree(index):
+    results = index.hybrid_search("beach cleanup", [1.0, 0.0, 0.0], limit=2, similarity_threshold=0.0, now=NOW)
+    assert _ids(results)[0] == 1
+    assert results[0]["similarity_score"] == pytest.approx(1.0)
+    assert "embedding" not in results[0]
+
+
+def test_filters_and_exclusions_applied_inside_index(index):
+    results = index.hybrid_search(
+        "cleanup", [1.0, 0.0, 0.0], limit=2, similarity_threshold=0.0, exclude_ids={1}, now=NOW
+    )
+    # 1 is excluded, 5 is in the past, but the limit is still filled
+    assert len(results) == 2
+    assert 1 not in _ids(results) and 5 not in _ids(results)
+    assert _ids(results)[0] == 2
+
+    london = index.hybrid_search("cleanup", None, location="brighton", limit=5, now=NOW)
+    assert _ids(london) == [1]
+
+
+def test_lexical_only_and_browse_modes(index):
+    assert _ids(index.hybrid_search("food bank", None, limit=5, now=NOW)) == [3]
+    # No keywords and no embedding: upcoming events, soonest first
+    assert _ids(index.hybrid_search("", None, limit=2, now=NOW)) == [4, 1]
+
+
+def test_upsert_and_remove_update_keyword_index(index):
+    index.upsert(_row(6, [0.0, 1.0, 0.0], "Dog shelter walk"))
+    assert _ids(index.hybrid_search("dog", None, limit=5, now=NOW)) == [6]
+    index.remove(6)
+    assert index.hybrid_search("dog", None, limit=5, now=NOW) == []
+
+
+def test_dao_tops_up_with_events_that_have_no_embedding_yet(index):
+    dao = DataAccess()
+    new_event = {"ID": 9, "Title": "Canal clean up day"}
+    with patch("data_access.get_event_index", return_value=index), \
+            patch.object(DataAccess, "sync_event_index"), \
+            patch.object(DataAccess, "has_events_without_embedding", return_value=True), \
+            patch.object(DataAccess, "get_filtered_events", return_value=[new_event]) as sql_search:
+        results = dao.search_events_hybrid("Canal clean up day", None, limit=3, exclude_ids={2})
+
+    assert results[-1] == new_event
+    kwargs = sql_search.call_args.kwargs
+    assert kwargs["without_embedding"] is True and kwargs["exclude_ids"] == {2}
+    assert kwargs["limit"] == 3 - (len(results) - 1)
+
+
+def test_dao_skips_the_top_up_when_every_event_is_embedded(index):
+    with patch("data_access.get_event_index", return_value=index), \
+            patch.object(DataAccess, "sync_event_index"), \
+            patch.object(DataAccess, "has_events_without_embedding", return_value=False), \
+            patch.object(DataAccess, "get_filtered_events") as sql_search:
+        DataAccess().search_events_hybrid("Canal clean up day", None, limit=3)
+
+    sql_search.assert_not_called()
+
+
+def test_unembedded_check_is_reused_within_the_refresh_interval(index, monkeypatch):
+    monkeypatch.setattr(data_access, "_unembedded_state", {"checked_at": None, "exists": True})
+    dao = DataAccess()
+    with patch("data_access.get_event_index", return_value=index), \
+            patch.object(DataAccess, "get_connection") as get_connection:
+        cursor = get_connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (0,)
+        assert dao.has_events_without_embedding() is False
+        assert dao.has_events_without_embedding() is False
+
+    assert cursor.execute.call_count == 1
@@ -0,0 +1,123 @@
+"""
+Unit tests for the local intent router and the connector's fast path.
+"""
+
+import sys
+import os
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.connector import ChatbotConnector
+from chatbot.intent_router import IntentRouter
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter()
+
+
+@pytest.mark.parametrize("message, tool_name", [
+    ("show my badges", "get_my_badges"),
+    ("Which badges can I still earn?", "get_available_badges"),
+    ("what are my stats", "get_my_stats"),
+    ("My upcoming events", "get_my_upcoming_events"),
+    ("what have I signed up for", "get_my_upcoming_events"),
+    ("show my past events", "get_my_completed_events"),
+    ("What teams am I in?", "get_my_teams"),
+    ("what teams can I join", "list_teams"),
+    ("my team events", "get_my_team_events"),
+    ("achievements", "get_my_badges"),
+])
+def test_confident_messages_are_routed(router, message, tool_name):
+    match = router.route(message, "test@example.com")
+    assert match is not None
+    assert match.tool_name == tool_name
+
+
+@pytest.mark.parametrize("message", [
+    "find beach cleanups",
+    "events in London this weekend",
+    "my events and my badges",
+    "why didn't I get the Event Starter badge",
+    "should I join a team",
+    "what is OneSky",
+    "hello",
+    "",
+])
+def test_unsure_messages_fall_back_to_model(router, message):
+    assert router.route(message, "test@example.com") is None
+
+
+@pytest.mark.parametrize("message", [
+    "what impact does volunteering have on communities?",
+    "what are the statistics on volunteering",
+    "how many hours is a typical event",
+    "what is the impact of tree planting",
+    "i have a question about badges",
+    "what badges are there",
+    "which teams are the most active",
+    "what events happened in the past",
+])
+def test_general_questions_on_personal_topics_are_not_routed(router, message):
+    assert router.route(message, "test@example.com") is None
+
+
+@pytest.mark.parametrize("message", [
+    "cancel my event",
+    "unregister me from my next event",
+    "leave my team",
+    "how do i join my team",
+    "join my team",
+    "delete my badges",
+    "remove my upcoming events",
+    "sign me up for my team events",
+    "find events like my past events",
+    "search my completed events",
+])
+def test_actions_and_searches_are_not_routed(router, message):
+    assert router.route(message, "test@example.com") is None
+
+
+def test_personal_tools_need_a_user(router):
+    assert router.route("show my badges", None) is None
+    assert router.route("list all teams", None).tool_name == "list_teams"
+
+
+def test_limit_is_extracted(router):
+    assert router.route("show my next 3 events", "test@example.com").arguments == {"limit": 3}
+
+
+@patch("chatbot.connector.EmbeddingHelper")
+def test_routed_message_skips_first_model_call(mock_emb):
+    dao = Mock()
+    dao.get_user_by_email.return_value = {"FirstName": "John"}
+    dao.get_user_id_by_email.return_value = 1
+    dao.get_user_badges.return_value = [{"ID": 1, "Name": "Event Starter", "Description": "", "IconURL": None}]
+
+    with patch("chatbot.connector.DataAccess", return_value=dao), patch("chatbot.connector.OpenAI") as MockOpenAI:
+        MockOpenAI.return_value.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="You have one badge."))]
+        )
+        connector = ChatbotConnector()
+        connector.dao = dao
+        connector.intent_router = IntentRouter()
+        connector.use_answer_templates = False
+
+        response, category, _, _, badges, _ = connector.process_message("show my badges", "test@example.com")
+
+    create = MockOpenAI.return_value.chat.completions.create
+    assert create.call_count == 1
+    assert "tools" not in create.call_args.kwargs
+    assistant_msg, tool_msg = create.call_args.kwargs["messages"][-2:]
+    assert assistant_msg["tool_calls"][0]["function"]["name"] == "get_my_badges"
+    assert tool_msg["tool_call_id"] == assistant_msg["tool_calls"][0]["id"]
+    assert json.loads(tool_msg["content"])[0]["name"] == "Event Starter"
+    assert (response, category) == ("You have one badge.", "badges")
+    assert badges
@@ -0,0 +1,105 @@
+"""
+Unit tests for quantized (int8 / binary) embedding search.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.embedding_index import EventEmbeddingIndex
+from chatbot.quantization import binary_codes, hamming_distances, int8_scores, quantize_int8
+
+
+def _vectors(n=1000, dim=128, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(40, dim))
+    vectors = (centers[rng.integers(0, 40, size=n)] + 0.5 * rng.normal(size=(n, dim))).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _rows(vectors):
+    return [
+        {"ID": i, "Date": "2099-01-01", "StartTime": "10:00:00", "LocationCity": "London", "embedding": v}
+        for i, v in enumerate(vectors)
+    ]
+
+
+def _ids(results):
+    return [r["ID"] for r in results]
+
+
+def test_int8_scores_approximate_float_scores():
+    vectors = _vectors()
+    codes, scales = quantize_int8(vectors)
+    assert codes.dtype == np.int8
+    rows = np.arange(len(vectors))
+    approx = int8_scores(codes, scales, vectors[0], rows)
+    np.testing.assert_allclose(approx, vectors @ vectors[0], atol=0.02)
+
+
+def test_int8_scores_of_a_row_subset_match_dequantized_codes():
+    vectors = np.random.default_rng(1).normal(size=(700, 16)).astype(np.float32)
+    codes, scales = quantize_int8(vectors)
+    expected = (codes.astype(np.float32) * scales[:, np.newaxis]) @ vectors[0]
+    rows = np.arange(3, 700, 2)
+    np.testing.assert_allclose(int8_scores(codes, scales, vectors[0], rows), expected[rows], rtol=1e-5, atol=1e-5)
+    assert int8_scores(codes, scales, vectors[0], rows[:0]).size == 0
+
+
+def test_binary_hamming_distance():
+    vectors = np.array([[1.0, -1.0, 1.0], [-1.0, -1.0, -1.0]], dtype=np.float32)
+    codes = binary_codes(vectors)
+    assert codes.shape == (2, 1)
+    distances = hamming_distances(codes, binary_codes(vectors[:1])[0], np.arange(2))
+    assert distances.tolist() == [0, 2]
+
+
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+def test_quantized_search_reranks_with_full_precision(mode):
+    vectors = _vectors()
+    exact = EventEmbeddingIndex()
+    exact.load(_rows(vectors))
+    quantized = EventEmbeddingIndex(quantization=mode, rerank_factor=30, min_rerank=0)
+    quantized.load(_rows(vectors))
+
+    hits = 0
+    for query in vectors[:30]:
+        expected = exact.search(query, limit=5, similarity_threshold=-1)
+        got = quantized.search(query, limit=5, similarity_threshold=-1)
+        hits += len(set(_ids(expected)) & set(_ids(got)))
+        # Final scores are exact, not quantized
+        assert got[0]["similarity_score"] == pytest.approx(expected[0]["similarity_score"], abs=1e-5)
+    assert hits / (30 * 5) >= 0.9
+
+
+def test_quantized_memory_shrinks_and_spills_full_precision():
+    vectors = _vectors(n=200, dim=256)
+    int8_index = EventEmbeddingIndex(quantization="int8")
+    int8_index.load(_rows(vectors))
+    binary_index = EventEmbeddingIndex(quantization="binary")
+    binary_index.load(_rows(vectors))
+
+    full = int8_index.memory_usage()["full_precision"]
+    assert full / int8_index.memory_usage()["codes"] > 3.5
+    assert full / binary_index.memory_usage()["codes"] >= 32
+    assert isinstance(int8_index._matrix, np.memmap)
+
+
+def test_quantized_index_supports_remove():
+    vectors = _vectors(n=300)
+    index = EventEmbeddingIndex(quantization="binary", min_rerank=10)
+    index.load(_rows(vectors))
+    index.remove(5)
+    assert 5 not in _ids(index.search(vectors[5], limit=3, similarity_threshold=-1))
+    assert _ids(index.search(vectors[6], limit=1, similarity_threshold=-1)) == [6]
+
+
+def test_unknown_quantization_mode_rejected():
+    with pytest.raises(ValueError):
+        EventEmbeddingIndex(quantization="pq")
@@ -0,0 +1,120 @@
+"""
+Unit tests for the query embedding cache and its use by EmbeddingHelper.
+"""
+
+import sys
+import os
+import sqlite3
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.embedding_helper import EmbeddingHelper
+from chatbot.query_embedding_cache import QueryEmbeddingCache, normalize_query
+
+
+def _helper(cache):
+    helper = EmbeddingHelper("sk-test", cache=cache, provider="openai")
+    helper.provider.client = MagicMock()
+    helper.client.embeddings.create.return_value.data = [MagicMock(index=0, embedding=[0.25, 0.5, 0.75])]
+    return helper
+
+
+def test_normalize_query():
+    assert normalize_query("  Beach   Cleanup? ") == "beach cleanup"
+    assert normalize_query("BEACH\tcleanup") == normalize_query("beach cleanup")
+    assert normalize_query("ｂｅａｃｈ") == "beach"
+
+
+def test_hit_skips_network_call():
+    cache = QueryEmbeddingCache()
+    helper = _helper(cache)
+
+    assert helper.generate_embedding("Beach cleanup") == [0.25, 0.5, 0.75]
+    assert helper.generate_embedding("beach  cleanup!") == [0.25, 0.5, 0.75]
+    assert helper.client.embeddings.create.call_count == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_cache_is_keyed_by_model():
+    cache = QueryEmbeddingCache()
+    cache.put("parks", "model-a", [1.0])
+    assert cache.get("parks", "model-b") is None
+    assert cache.get("parks", "model-a") == [1.0]
+
+
+def test_lru_eviction():
+    cache = QueryEmbeddingCache(max_entries=2)
+    cache.put("a", "m", [1.0])
+    cache.put("b", "m", [2.0])
+    cache.get("a", "m")
+    cache.put("c", "m", [3.0])
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == [1.0]
+    assert cache.stats()["size"] == 2
+
+
+def test_sqlite_persistence_survives_restart(tmp_path):
+    path = str(tmp_path / "queries.sqlite")
+    first = QueryEmbeddingCache(sqlite_path=path)
+    first.put("food bank", "m", [0.5, -0.5])
+
+    second = QueryEmbeddingCache(sqlite_path=path)
+    assert second.get("Food Bank", "m") == [0.5, -0.5]
+    assert second.stats()["disk_hits"] == 1
+    assert second.stats()["persistent"]
+
+
+def test_disk_lookups_do_not_block_memory_hits(tmp_path):
+    cache = QueryEmbeddingCache(sqlite_path=str(tmp_path / "queries.sqlite"))
+    cache.put("beach cleanup", "m", [1.0])
+    reading, release = threading.Event(), threading.Event()
+    load_from_disk = cache._load_from_disk
+
+    def slow_load(key):
+        reading.set()
+        release.wait(5)
+        return load_from_disk(key)
+
+    cache._load_from_disk = slow_load
+    miss = threading.Thread(target=cache.get, args=("tree planting", "m"))
+    miss.start()
+    try:
+        assert reading.wait(5)
+        assert cache.get("beach cleanup", "m") == [1.0]
+    finally:
+        release.set()
+        miss.join()
+    assert cache.stats()["misses"] == 1
+
+
+def test_close_closes_every_threads_connection(tmp_path):
+    cache = QueryEmbeddingCache(sqlite_path=str(tmp_path / "queries.sqlite"))
+    cache.put("beach cleanup", "m", [1.0])
+    worker = threading.Thread(target=cache.put, args=("food bank", "m", [2.0]))
+    worker.start()
+    worker.join()
+    connections = list(cache._connections)
+    assert len(connections) == 2
+
+    cache.close()
+
+    for db in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
+    cache.clear()
+    assert cache.get("food bank", "m") == [2.0]  # reconnects after close
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_helper_without_cache_always_calls_api():
+    helper = _helper(None)
+    helper.generate_embedding("parks")
+    helper.generate_embedding("parks")
+    assert helper.client.embeddings.create.call_count == 2
@@ -0,0 +1,226 @@
+"""
+Unit tests for deadlines, retries, hedging and circuit breaking of LLM and embedding calls.
+"""
+
+import sys
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import httpx
+import openai
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.connector import ChatbotConnector
+from chatbot.embedding_helper import EmbeddingHelper
+from chatbot.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, ResilientCaller
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class _BadRequest(Exception):
+    status_code = 400
+
+
+def _timeout_error():
+    return openai.APITimeoutError(request=httpx.Request("POST", "http://llm/v1/chat/completions"))
+
+
+def _caller(clock, **kwargs):
+    kwargs.setdefault("breaker", CircuitBreaker("llm", failure_threshold=2, reset_timeout=30, clock=clock))
+    return ResilientCaller("llm", sleep=clock.sleep, clock=clock, **kwargs)
+
+
+def test_transient_errors_are_retried_within_the_deadline():
+    clock = _Clock()
+    caller = _caller(clock, timeout=5, deadline=30, max_retries=2)
+    attempts = []
+
+    def flaky(timeout):
+        attempts.append(timeout)
+        if len(attempts) < 3:
+            raise _timeout_error()
+        return "ok"
+
+    assert caller.call(flaky) == "ok"
+    assert attempts[0] == 5
+    assert caller.stats()["retries"] == 2
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_attempt_timeout_shrinks_to_the_remaining_deadline():
+    clock = _Clock()
+    caller = _caller(clock, timeout=5, deadline=7, max_retries=3, backoff_base=0.0)
+    attempts = []
+
+    def slow(timeout):
+        attempts.append(timeout)
+        clock.now += timeout
+        raise _timeout_error()
+
+    with pytest.raises(DeadlineExceeded):
+        caller.call(slow)
+    assert attempts == [5, 2]
+    assert caller.stats()["deadline_exceeded"] == 1
+
+
+def test_client_errors_are_not_retried_and_do_not_trip_the_breaker():
+    clock = _Clock()
+    caller = _caller(clock)
+    calls = []
+
+    def bad_request(timeout):
+        calls.append(timeout)
+        raise _BadRequest("invalid")
+
+    for _ in range(3):
+        with pytest.raises(_BadRequest):
+            caller.call(bad_request)
+    assert len(calls) == 3
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_one_probe():
+    clock = _Clock()
+    caller = _caller(clock, max_retries=0)
+    calls = []
+
+    def down(timeout):
+        calls.append(timeout)
+        raise ConnectionError("refused")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            caller.call(down)
+    assert caller.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        caller.call(down)
+    assert len(calls) == 2
+
+    clock.now += 30
+    assert caller.breaker.state == CircuitBreaker.HALF_OPEN
+    assert caller.breaker.allow() is True  # the probe
+    assert caller.breaker.allow() is False  # everyone else still fails fast
+    caller.breaker.record_success()
+    assert caller.call(lambda timeout: "back") == "back"
+    assert caller.stats()["breaker"]["times_opened"] == 1
+
+
+def test_failed_probe_reopens_the_circuit():
+    clock = _Clock()
+    breaker = CircuitBreaker("embedding", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is False
+
+
+def test_hedged_attempt_wins_when_the_first_stalls():
+    release = threading.Event()
+    calls = []
+    caller = ResilientCaller("llm", timeout=5, deadline=5, max_retries=0, hedge_after=0.05)
+
+    def sometimes_stalls(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    try:
+        assert caller.call(sometimes_stalls) == "fast"
+    finally:
+        release.set()
+    stats = caller.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+    assert caller.call(lambda timeout: "quick", hedge=False) == "quick"
+    assert caller.stats()["hedges"] == 1
+
+
+def test_embedding_helper_returns_none_when_the_circuit_is_open():
+    provider = Mock(model="m")
+    provider.embed.side_effect = ConnectionError("refused")
+    caller = ResilientCaller("embedding", max_retries=0, breaker=CircuitBreaker("embedding", failure_threshold=1))
+    helper = EmbeddingHelper(provider=provider, caller=caller)
+
+    assert helper.generate_embedding("beach cleanup") is None
+    assert helper.generate_embedding("tree planting") is None
+    assert provider.embed.call_count == 1  # second lookup failed fast
+    assert provider.embed.call_args.kwargs["max_retries"] == 0
+
+
+# ---------------------------------------------------------------------
+# Connector fallbacks
+# ---------------------------------------------------------------------
+def _tool_call_response(tool_name, arguments="{}"):
+    message = SimpleNamespace(
+        tool_calls=[SimpleNamespace(id="call_1", function=SimpleNamespace(name=tool_name, arguments=arguments))],
+        content=None,
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def connector():
+    dao = Mock()
+    dao.get_user_by_email.return_value = {"FirstName": "John"}
+    dao.get_user_badges.return_value = [{"ID": 1, "Name": "Event Starter", "Description": "", "IconURL": None}]
+    dao.get_filtered_events.return_value = []
+    with patch("chatbot.connector.EmbeddingHelper"), \
+            patch("chatbot.connector.DataAccess", return_value=dao), \
+            patch("chatbot.connector.OpenAI"):
+        bot = ChatbotConnector()
+    bot.intent_router = None
+    bot.use_answer_templates = False
+    bot.response_cache = None
+    bot.llm_caller = ResilientCaller("llm", max_retries=0, breaker=CircuitBreaker("llm", failure_threshold=1))
+    return bot
+
+
+def test_failed_answer_completion_uses_the_template(connector):
+    create = connector.openai_client.chat.completions.create
+    create.side_effect = [_tool_call_response("get_my_badges"), _timeout_error()]
+
+    response, category, *_ = connector.process_message("why do I have these badges?", "test@example.com")
+
+    assert category == "badges"
+    assert response == "You've earned 1 badge: Event Starter."
+    assert "timeout" in create.call_args.kwargs
+
+
+def test_open_circuit_skips_the_model_entirely(connector):
+    connector.llm_caller.breaker.record_failure()
+    create = connector.openai_client.chat.completions.create
+
+    response, category, *_ = connector.process_message("hello", "test@example.com")
+
+    assert category == "general" and "trouble" in response
+    create.assert_not_called()
+
+
+def test_search_uses_keyword_path_when_embeddings_are_unavailable(connector):
+    connector.embedding_helper.generate_embedding.return_value = None
+
+    result = connector._run_tool_call("search_events", {"keyword": "beach"}, "test@example.com", None)
+
+    assert result["type"] == "events"
+    connector.dao.get_filtered_events.assert_called_once()
+    assert connector.dao.get_filtered_events.call_args.kwargs["keyword"] == "beach"
+    connector.dao.search_events_hybrid.assert_not_called()
@@ -0,0 +1,147 @@
+"""
+Unit tests for the semantic cache of general chatbot answers.
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.connector import ChatbotConnector
+from chatbot.response_cache import SemanticResponseCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+TEAMS_ANSWER = "Teams let colleagues volunteer together: create one from the Teams page or join with a code."
+
+
+def test_similar_question_hits_and_different_one_misses():
+    cache = SemanticResponseCache()
+    assert cache.put("How do I earn badges?", "Complete events to earn badges.")
+
+    assert cache.get("how can I earn badges") == "Complete events to earn badges."
+    assert cache.get("How do I earn badges") == "Complete events to earn badges."
+    # same shape, different subject
+    assert cache.get("how do I earn points") is None
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+
+def test_content_words_must_match_not_just_shape():
+    cache = SemanticResponseCache()
+    cache.put("how do I join a team", "Use the join code your team owner shares.")
+    assert cache.get("how do I leave a team") is None
+    assert cache.get("how can I join a team") == "Use the join code your team owner shares."
+
+
+@pytest.mark.parametrize("question", [
+    "what are my badges",
+    "how many hours have I volunteered this year",
+    "what did you say before",
+    "can you explain that again",
+    "what events are on this weekend",
+])
+def test_personal_contextual_and_dated_questions_are_not_cached(question):
+    cache = SemanticResponseCache()
+    assert cache.put(question, "Some answer.") is False
+    assert cache.get(question) is None
+
+
+def test_answers_naming_the_user_are_not_stored():
+    cache = SemanticResponseCache()
+    assert cache.put("how do teams work", "Hi John! " + TEAMS_ANSWER, personal_terms=["John"]) is False
+    assert cache.put("how do teams work", TEAMS_ANSWER, personal_terms=["John"]) is True
+    assert cache.stats()["skipped"] == 1
+
+
+def test_ttl_and_lru_bounds():
+    clock = _Clock()
+    cache = SemanticResponseCache(ttl_seconds=60, max_entries=2, clock=clock)
+    cache.put("how do teams work", TEAMS_ANSWER)
+    cache.put("what is onesky", "Sky's volunteering platform.")
+    cache.get("how do teams work")  # now most recently used
+    cache.put("how do badges work", "Badges reward milestones.")
+
+    assert len(cache) == 2
+    assert cache.get("what is onesky") is None  # evicted
+    assert cache.get("how do teams work") == TEAMS_ANSWER
+
+    clock.now = 61
+    assert cache.get("how do teams work") is None
+    assert cache.get("how do badges work") is None
+
+
+def _text_response(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text, tool_calls=None))])
+
+
+@pytest.fixture
+def connector():
+    dao = Mock()
+    dao.get_user_by_email.return_value = {"FirstName": "Priya"}
+    with patch("chatbot.connector.EmbeddingHelper"), \
+            patch("chatbot.connector.DataAccess", return_value=dao), \
+            patch("chatbot.connector.OpenAI"):
+        bot = ChatbotConnector()
+    bot.intent_router = None
+    bot.response_cache = SemanticResponseCache()
+    return bot
+
+
+def test_repeated_faq_needs_no_llm_call(connector):
+    create = connector.openai_client.chat.completions.create
+    create.side_effect = [_text_response(TEAMS_ANSWER)]
+
+    first = connector.process_message("How do teams work?", "a@example.com")
+    second = connector.process_message("how do teams work", "b@example.com")
+    emitted = []
+    connector.process_message_stream("How do teams work?", "c@example.com",
+                                     emit_fn=lambda name, data, room=None: emitted.append(data))
+
+    assert first[0] == second[0] == TEAMS_ANSWER
+    assert emitted[-1]["response"] == TEAMS_ANSWER and emitted[-1]["done"] is True
+    assert create.call_count == 1
+    assert connector.cache_stats()["responses"]["hits"] == 2
+    assert "hit_rate" in connector.cache_stats()["query_embeddings"]
+    # the cached answer is still part of each user's conversation
+    assert connector.memory.history("b@example.com")[-1]["content"] == TEAMS_ANSWER
+
+
+def test_personalized_answer_is_not_reused(connector):
+    create = connector.openai_client.chat.completions.create
+    create.side_effect = [_text_response("Priya, " + TEAMS_ANSWER), _text_response(TEAMS_ANSWER)]
+
+    connector.process_message("How do teams work?", "priya@example.com")
+    response, *_ = connector.process_message("How do teams work?", "sam@example.com")
+
+    assert response == TEAMS_ANSWER
+    assert create.call_count == 2
+
+
+def test_answers_given_with_history_are_not_stored(connector):
+    create = connector.openai_client.chat.completions.create
+    create.side_effect = [
+        _text_response("Beach cleanups run every month."),
+        _text_response("Manchester has two beach cleanups coming up."),
+        _text_response(TEAMS_ANSWER),
+    ]
+
+    connector.process_message("Tell me about beach cleanups", "priya@example.com")
+    connector.process_message("what about Manchester", "priya@example.com")
+
+    assert connector.cache_stats()["responses"]["entries"] == 1
+    response, *_ = connector.process_message("what about Manchester", "sam@example.com")
+    assert response == TEAMS_ANSWER and create.call_count == 3
@@ -0,0 +1,153 @@
+"""
+Unit tests for per-stage latency spans and histograms in the chatbot pipeline.
+"""
+
+import sys
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.connector import ChatbotConnector
+from chatbot.stage_timer import StageHistograms, StageTimer, current_timer, timed_stage
+from chatbot.tool_executor import ToolExecutor
+
+
+def test_timer_records_spans_and_totals():
+    timer = StageTimer("http")
+    with timer.activate():
+        assert current_timer() is timer
+        with timed_stage("sanitize"):
+            time.sleep(0.01)
+        with timed_stage("tool.x"):
+            pass
+        with timed_stage("tool.x"):
+            pass
+    timer.accumulate("emit", 0.002)
+    timer.accumulate("emit", 0.003)
+    timer.finish()
+
+    assert current_timer() is None
+    report = timer.report()
+    assert report["flow"] == "http"
+    assert report["stages"]["sanitize"] >= 10
+    assert report["stages"]["emit"] == 5.0
+    assert [span["stage"] for span in report["spans"]] == ["sanitize", "tool.x", "tool.x"]
+    assert report["total_ms"] >= report["stages"]["sanitize"]
+
+
+def test_timed_stage_without_timer_is_noop():
+    with timed_stage("anything"):
+        value = 1
+    assert value == 1
+
+
+def test_histogram_buckets_and_percentiles():
+    histograms = StageHistograms(buckets_ms=(10, 100, 1000))
+    for ms in [5] * 90 + [50] * 9 + [5000]:
+        histograms.observe("llm_answer", ms / 1000)
+
+    stats = histograms.stats()["llm_answer"]
+    assert stats["count"] == 100
+    assert stats["buckets"] == {"le_10": 90, "le_100": 99, "le_1000": 99, "le_inf": 100}
+    assert stats["p50_ms"] == 10
+    assert stats["p95_ms"] == 100
+    assert stats["p99_ms"] == 100
+    assert stats["max_ms"] == 5000
+
+
+def test_tool_threads_record_into_callers_timer():
+    executor = ToolExecutor(max_workers=2)
+
+    def run(name, args):
+        with timed_stage(f"tool.{name}"):
+            return name
+
+    timer = StageTimer("http")
+    with timer.activate():
+        executor.run_all(run, [("a", {}), ("b", {})])
+    assert set(timer.stage_seconds()) == {"tool.a", "tool.b"}
+
+
+def _tool_call_response(tool_name, arguments="{}"):
+    message = SimpleNamespace(
+        tool_calls=[SimpleNamespace(id="call_1", function=SimpleNamespace(name=tool_name, arguments=arguments))],
+        content=None,
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _text_response(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text, tool_calls=None))])
+
+
+@pytest.fixture
+def connector():
+    dao = Mock()
+    dao.get_user_id_by_email.return_value = 7
+    dao.get_user_by_email.return_value = {"FirstName": "John"}
+    dao.get_registered_event_ids.return_value = set()
+    dao.search_events_hybrid.return_value = []
+    with patch("chatbot.connector.EmbeddingHelper"), \
+            patch("chatbot.connector.DataAccess", return_value=dao), \
+            patch("chatbot.connector.OpenAI"):
+        bot = ChatbotConnector()
+    bot.dao = dao
+    bot.intent_router = None
+    bot.use_answer_templates = False
+    bot.stage_metrics = StageHistograms()
+    return bot
+
+
+def test_process_message_reports_every_stage(connector):
+    connector.openai_client.chat.completions.create.side_effect = [
+        _tool_call_response("search_events", '{"keyword": "beach"}'),
+        _text_response("Nothing right now."),
+    ]
+    timings = {}
+    connector.process_message("find beach events", "john@example.com", timings=timings)
+
+    for stage in ("prepare_messages", "sanitize", "history", "user_profile", "prompt_build",
+                  "llm_tool_selection", "tools", "db.user_id", "tool.search_events",
+                  "embedding", "llm_answer"):
+        assert stage in timings["stages"], stage
+    stats = connector.stage_stats()
+    assert stats["turn.http"]["count"] == 1
+    assert stats["llm_answer"]["count"] == 1
+
+
+def test_stream_done_payload_carries_timings_in_debug_mode(connector):
+    connector.debug_timings = True
+    connector.openai_client.chat.completions.create.side_effect = [
+        _tool_call_response("get_my_badges"),
+        iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Two badges."))])]),
+    ]
+    connector.dao.get_user_badges.return_value = []
+    emitted = []
+    connector.process_message_stream(
+        "show my badges", "john@example.com", emit_fn=lambda name, data, room=None: emitted.append(data)
+    )
+
+    done = emitted[-1]
+    assert done["done"] is True
+    assert {"llm_tool_selection", "tool.get_my_badges", "llm_first_token", "llm_answer_stream", "emit"} <= set(
+        done["timings"]["stages"]
+    )
+    # emitted payloads without debug mode stay as they were
+    assert all("timings" not in payload for payload in emitted[:-1])
+    assert connector.stage_stats()["turn.stream"]["count"] == 1
+
+
+def test_no_timings_in_payload_without_debug(connector):
+    connector.openai_client.chat.completions.create.side_effect = [_text_response("Hi!")]
+    emitted = []
+    connector.process_message_stream("hello", "john@example.com",
+                                     emit_fn=lambda name, data, room=None: emitted.append(data))
+    assert emitted[-1]["done"] is True
+    assert "timings" not in emitted[-1]
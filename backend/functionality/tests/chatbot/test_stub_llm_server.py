@@ -0,0 +1,72 @@
+"""
+Unit tests for the OpenAI-compatible stub server used by the chatbot benchmarks,
+driven through the real connector via OPENAI_BASE_URL.
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from benchmarks.stub_llm_server import StubLLM, StubLLMServer
+from chatbot.connector import ChatbotConnector
+from chatbot.conversation_store import InMemoryConversationStore
+
+
+@pytest.fixture
+def stub_server():
+    server = StubLLMServer(StubLLM(latency=0, token_delay=0, answer="You have two badges so far.")).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def connector(stub_server, monkeypatch):
+    monkeypatch.setenv("OPENAI_BASE_URL", stub_server.base_url)
+    with patch("chatbot.connector.DataAccess") as mock_dao:
+        dao = mock_dao.return_value
+        dao.get_user_id_by_email.return_value = 7
+        dao.get_user_by_email.return_value = {"FirstName": "Sam"}
+        dao.get_user_badges.return_value = [{"BadgeID": 1, "Name": "Starter"}, {"BadgeID": 2, "Name": "Helper"}]
+        connector = ChatbotConnector(memory=InMemoryConversationStore())
+        connector.intent_router = None
+        connector.use_answer_templates = False
+        yield connector
+        connector.close()
+
+
+def test_http_flow_calls_stub_tool_then_answer(connector, stub_server):
+    response, category, events, teams, badges, team_events = connector.process_message(
+        "show my badges", "sam@example.com"
+    )
+
+    assert response == "You have two badges so far."
+    assert category == "badges"
+    assert [b["Name"] for b in badges] == ["Starter", "Helper"]
+    assert stub_server.stub.stats()["tool_calls"] == 1
+    # both model calls went over one pooled keep-alive connection
+    assert connector.pool_stats()["connections_opened"] == 1
+
+
+def test_stream_flow_receives_sse_chunks(connector, stub_server):
+    emitted = []
+    connector.process_message_stream(
+        "show my badges", "sam@example.com", emit_fn=lambda name, data, room=None: emitted.append(data)
+    )
+
+    pieces = [p["response"] for p in emitted if p.get("response") and not p.get("done")]
+    assert len(pieces) >= 1
+    assert "".join(pieces) == "You have two badges so far."
+    assert emitted[-1]["done"] is True
+    assert stub_server.stub.stats()["chat_stream"] == 1
+
+
+def test_plain_chat_without_tools(connector):
+    response, category, *_ = connector.process_message("what is OneSky?", "sam@example.com")
+    assert "OneSky" in response
+    assert category == "general"
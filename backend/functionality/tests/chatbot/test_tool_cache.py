@@ -0,0 +1,92 @@
+"""
+Unit tests for the per-user chatbot tool result cache.
+"""
+
+import sys
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.connector import ChatbotConnector
+from chatbot.tool_cache import ToolResultCache, get_tool_result_cache
+from data_access import DataAccess
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def connector():
+    dao = Mock()
+    dao.get_user_id_by_email.return_value = 7
+    dao.get_user_badges.return_value = [{"ID": 1, "Name": "Event Starter"}]
+    dao.get_upcoming_events.return_value = []
+    dao.get_all_teams.return_value = []
+    dao.get_all_joined_teams.return_value = []
+    with patch("chatbot.connector.EmbeddingHelper"), \
+            patch("chatbot.connector.DataAccess", return_value=dao), \
+            patch("chatbot.connector.OpenAI"):
+        bot = ChatbotConnector()
+    bot.dao = dao
+    return bot
+
+
+def test_repeated_tool_call_skips_dao(connector):
+    first = connector._execute_tool_call("get_my_badges", {}, "a@x.com")
+    second = connector._execute_tool_call("get_my_badges", {}, "a@x.com")
+    assert first == second
+    assert connector.dao.get_user_badges.call_count == 1
+    assert connector.dao.get_user_id_by_email.call_count == 1
+
+    # other users and other arguments are separate entries
+    connector._execute_tool_call("get_my_badges", {}, "b@x.com")
+    connector._execute_tool_call("get_my_upcoming_events", {"limit": 3}, "a@x.com")
+    connector._execute_tool_call("get_my_upcoming_events", {"limit": 5}, "a@x.com")
+    assert connector.dao.get_user_badges.call_count == 2
+    assert connector.dao.get_upcoming_events.call_count == 2
+
+
+def test_search_and_anonymous_calls_are_not_cached(connector):
+    connector._execute_tool_call("list_teams", {}, None)
+    connector._execute_tool_call("list_teams", {}, None)
+    assert connector.dao.get_all_teams.call_count == 2
+
+
+def test_entries_expire():
+    clock = _Clock()
+    cache = ToolResultCache(ttl_seconds=30, clock=clock)
+    cache.put("a@x.com", "get_my_stats", {}, {"type": "impact", "data": {}})
+    clock.now = 29
+    assert cache.get("a@x.com", "get_my_stats", {}) is not None
+    clock.now = 31
+    assert cache.get("a@x.com", "get_my_stats", {}) is None
+
+
+def test_dao_writes_invalidate(connector, mock_db_connection):
+    cache = get_tool_result_cache()
+    cursor = mock_db_connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (7,)
+    dao = DataAccess()
+
+    connector._execute_tool_call("get_my_badges", {}, "a@x.com")
+    dao.award_badge_to_user(7, 2)  # known only by user ID
+    assert cache.get("a@x.com", "get_my_badges", {}) is None
+
+    connector._execute_tool_call("get_my_upcoming_events", {}, "a@x.com")
+    dao.store_user_event_id("a@x.com", 101)
+    assert cache.get("a@x.com", "get_my_upcoming_events", {}) is None
+
+    connector._execute_tool_call("list_teams", {}, "a@x.com")
+    connector._execute_tool_call("list_teams", {}, "b@x.com")
+    dao.delete_team(3)
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,113 @@
+"""
+Unit tests for concurrent tool execution.
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from chatbot.connector import ChatbotConnector
+from chatbot.tool_executor import ToolExecutor
+
+
+def _sleepy(delays):
+    def run(tool_name, arguments):
+        time.sleep(delays[tool_name])
+        if tool_name == "broken":
+            raise RuntimeError("db down")
+        return {"tool": tool_name, "args": arguments}
+    return run
+
+
+def test_calls_run_concurrently_and_merge_in_order():
+    executor = ToolExecutor(max_workers=4, timeout=5)
+    delays = {"slow": 0.3, "fast": 0.0, "medium": 0.15}
+    started = time.perf_counter()
+    outcomes = executor.run_all(_sleepy(delays), [("slow", {"n": 1}), ("fast", {}), ("medium", {})])
+    elapsed = time.perf_counter() - started
+
+    assert [o["tool"] for o in outcomes] == ["slow", "fast", "medium"]
+    assert outcomes[0]["result"] == {"tool": "slow", "args": {"n": 1}}
+    assert elapsed < 0.45  # the slowest call, not the 0.45s sum
+
+
+def test_timeout_and_error_are_reported_per_call():
+    executor = ToolExecutor(max_workers=4, timeout=0.1)
+    outcomes = executor.run_all(
+        _sleepy({"stuck": 1.0, "ok": 0.0, "broken": 0.0}), [("stuck", {}), ("ok", {}), ("broken", {})]
+    )
+    assert [o["error"] for o in outcomes] == ["timeout", None, "db down"]
+    assert outcomes[1]["result"]["tool"] == "ok"
+
+    stats = executor.stats()
+    assert stats["stuck"]["timeouts"] == 1
+    assert stats["broken"]["errors"] == 1
+    assert stats["ok"]["calls"] == 1 and stats["ok"]["p95_ms"] >= 0
+
+
+def test_queue_wait_does_not_count_against_the_call_timeout():
+    executor = ToolExecutor(max_workers=1, timeout=0.25)
+    outcomes = executor.run_all(_sleepy({"a": 0.15, "b": 0.15}), [("a", {}), ("b", {})])
+
+    assert [o["error"] for o in outcomes] == [None, None]
+    assert outcomes[1]["queue_wait"] >= 0.1 and outcomes[1]["elapsed"] < 0.25
+    assert executor.stats()["b"]["avg_queue_ms"] >= 100
+
+
+def test_call_that_cannot_start_in_time_is_reported_busy():
+    executor = ToolExecutor(max_workers=1, timeout=5, queue_timeout=0.05)
+    outcomes = executor.run_all(_sleepy({"hog": 0.3, "waiting": 0.0}), [("hog", {}), ("waiting", {})])
+
+    assert [o["error"] for o in outcomes] == [None, "busy"]
+    assert executor.stats()["waiting"]["busy"] == 1
+
+
+def test_pool_is_bounded():
+    executor = ToolExecutor(max_workers=2, timeout=5)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def run(tool_name, arguments):
+        with lock:
+            running.append(tool_name)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(tool_name)
+
+    executor.run_all(run, [(f"t{i}", {}) for i in range(6)])
+    assert max(peak) == 2
+
+
+@patch("chatbot.connector.EmbeddingHelper")
+def test_connector_answers_every_tool_call_when_one_fails(mock_emb):
+    dao = Mock()
+    dao.get_user_by_email.return_value = {"FirstName": "John"}
+    dao.get_user_id_by_email.return_value = 1
+    dao.get_user_badges.return_value = [{"ID": 1, "Name": "Event Starter", "Description": "", "IconURL": None}]
+    dao.get_all_joined_teams.side_effect = RuntimeError("db down")
+
+    with patch("chatbot.connector.DataAccess", return_value=dao), patch("chatbot.connector.OpenAI"):
+        connector = ChatbotConnector()
+    connector.dao = dao
+    connector.tool_executor = ToolExecutor(max_workers=4, timeout=5)
+
+    tool_calls = [
+        SimpleNamespace(id="a", function=SimpleNamespace(name="get_my_teams", arguments="{}")),
+        SimpleNamespace(id="b", function=SimpleNamespace(name="get_my_badges", arguments="{}")),
+    ]
+    outputs, results = connector._execute_and_categorize_tools(tool_calls, "test@example.com")
+
+    assert [o["tool_call_id"] for o in outputs] == ["a", "b"]
+    assert "error" in json.loads(outputs[0]["content"])
+    assert results["category"] == "badges"
+    assert results["badges"][0]["Name"] == "Event Starter"
@@ -8,6 +8,9 @@ import os
 from unittest.mock import Mock, MagicMock, patch
 from flask import Flask, g
 
+# Hash passwords inline: no worker processes in unit tests
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
 # Add the parent directory to sys.path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -77,6 +80,41 @@ def mock_db_connection():
         yield mock_connect
 
 
+@pytest.fixture(autouse=True)
+def clear_tool_result_cache():
+    """Auto-use fixture so cached chatbot tool results never leak between tests."""
+    from chatbot.tool_cache import get_tool_result_cache
+
+    get_tool_result_cache().invalidate_all()
+    yield
+    get_tool_result_cache().invalidate_all()
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Auto-use fixture so cached general chatbot answers never leak between tests."""
+    from chatbot.response_cache import get_response_cache
+
+    cache = get_response_cache()
+    if cache is not None:
+        cache.clear()
+    yield
+    if cache is not None:
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Auto-use fixture so failures simulated in one test never open a breaker for the next."""
+    from chatbot.resilience import get_embedding_caller, get_llm_caller
+
+    get_llm_caller().reset()
+    get_embedding_caller().reset()
+    yield
+    get_llm_caller().reset()
+    get_embedding_caller().reset()
+
+
 @pytest.fixture
 def client():
     """Create a test client for Flask app."""
@@ -238,3 +238,34 @@ def test_get_event_schedule_db_error(mock_connect):
     dao = DataAccess()
     result = dao.get_event_schedule(1)
     assert result == []
+
+
+# ---------------- REGISTRATION EXCLUSION ---------------- #
+
+def _cursor(mock_db_connection):
+    conn = mock_db_connection.return_value.__enter__.return_value
+    return conn.cursor.return_value.__enter__.return_value
+
+
+def test_get_filtered_events_excludes_registered_in_sql(mock_db_connection):
+    cursor = _cursor(mock_db_connection)
+    cursor.fetchall.return_value = []
+    dao = DataAccess()
+
+    dao.get_filtered_events(keyword="park", exclude_user_email="a@b.com", exclude_ids=[5], limit=3)
+
+    sql, params = cursor.execute.call_args[0]
+    assert "NOT EXISTS" in sql and "TeamEventRegistration" in sql
+    assert "e.ID NOT IN (%s)" in sql
+    assert sql.rstrip().endswith("LIMIT %s")
+    assert params[-4:] == ["a@b.com", "a@b.com", 5, 3]
+
+
+def test_get_registered_event_ids_single_query(mock_db_connection):
+    cursor = _cursor(mock_db_connection)
+    cursor.fetchall.return_value = [(1,), (4,), (4,)]
+    dao = DataAccess()
+
+    assert dao.get_registered_event_ids("a@b.com") == {1, 4}
+    assert cursor.execute.call_count == 1
+    assert "UNION" in cursor.execute.call_args[0][0]
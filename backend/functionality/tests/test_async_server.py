@@ -0,0 +1,82 @@
+"""
+Smoke test for the production Socket.IO server: app.py started the way the
+container starts it (SOCKETIO_ASYNC_MODE=gevent) must serve the Engine.IO
+handshake over polling and accept a WebSocket upgrade.
+"""
+
+import sys
+import os
+import json
+import socket
+import subprocess
+import time
+import urllib.request
+
+import pytest
+
+pytest.importorskip("gevent")
+simple_websocket = pytest.importorskip("simple_websocket")
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@pytest.fixture
+def server():
+    port = _free_port()
+    env = dict(
+        os.environ,
+        SOCKETIO_ASYNC_MODE="gevent",
+        PORT=str(port),
+        SECRET_KEY=os.getenv("SECRET_KEY", "test-secret-key-for-testing-only"),  # NOSONAR - test-only fallback
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "sk-test"),
+        # nothing listens here, so the startup DB checks fail fast and are skipped
+        MYSQL_HOST="127.0.0.1",
+        MYSQL_PORT=str(_free_port()),
+        PASSWORD_HASH_WORKERS="0",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "app.py"], cwd=APP_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    try:
+        yield f"127.0.0.1:{port}", process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _handshake(address, process, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            pytest.fail(f"server exited early:\n{process.stdout.read()}")
+        try:
+            with urllib.request.urlopen(f"http://{address}/socket.io/?EIO=4&transport=polling", timeout=2) as response:
+                return response.read().decode("utf-8")
+        except OSError:
+            time.sleep(0.2)
+    pytest.fail("server did not answer the Engine.IO handshake")
+
+
+def test_gevent_server_serves_polling_and_websocket(server):
+    address, process = server
+
+    body = _handshake(address, process)
+    assert body.startswith("0")
+    assert "websocket" in json.loads(body[1:])["upgrades"]
+
+    ws = simple_websocket.Client(f"ws://{address}/socket.io/?EIO=4&transport=websocket")
+    try:
+        opened = ws.receive(timeout=5)
+    finally:
+        ws.close()
+    assert opened.startswith("0") and "sid" in json.loads(opened[1:])
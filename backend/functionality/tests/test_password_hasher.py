@@ -0,0 +1,113 @@
+"""
+Unit tests for bcrypt hashing on the bounded password hashing pool.
+"""
+
+import sys
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import bcrypt
+import jwt
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import routes as auth_routes
+from auth.password_hasher import PasswordHasher, PasswordHasherBusyError, get_password_hasher
+from tests.conftest import make_test_app
+
+TEST_PASSWORD = "TestPassword123!"  # NOSONAR: test-only password constant
+
+
+def test_inline_hash_and_check_round_trip():
+    hasher = PasswordHasher(rounds=4, inline=True)
+    hashed = hasher.hash_password(TEST_PASSWORD)
+
+    assert bcrypt.checkpw(TEST_PASSWORD.encode("utf-8"), hashed)
+    assert hasher.check_password(TEST_PASSWORD, hashed.decode("utf-8")) is True
+    assert hasher.check_password("wrong", hashed) is False
+    stats = hasher.stats()
+    assert stats["mode"] == "inline" and stats["completed"] == 3 and stats["in_flight"] == 0
+
+
+def test_unit_tests_hash_inline():
+    assert get_password_hasher().inline
+
+
+def test_worker_processes_hash_and_check():
+    hasher = PasswordHasher(max_workers=1, rounds=4)
+    try:
+        hashed = hasher.hash_password(TEST_PASSWORD)
+        assert hasher.check_password(TEST_PASSWORD, hashed) is True
+        assert hasher.check_password("wrong", hashed) is False
+    finally:
+        hasher.shutdown()
+    stats = hasher.stats()
+    assert stats["mode"] == "processes" and stats["completed"] == 3 and stats["failed"] == 0
+
+
+def test_calls_beyond_workers_and_queue_are_rejected():
+    hasher = PasswordHasher(max_workers=1, max_pending=1, inline=True)
+    started, release = threading.Barrier(3), threading.Event()
+
+    def slow_hash(password):
+        started.wait()
+        release.wait(5)
+        return b"hash", 0.0
+
+    threads = [threading.Thread(target=hasher._run, args=(slow_hash, b"pw")) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    try:
+        assert hasher.stats()["in_flight"] == 2 and hasher.stats()["queued"] == 1
+        with pytest.raises(PasswordHasherBusyError):
+            hasher.hash_password(TEST_PASSWORD)
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+    stats = hasher.stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 2 and stats["peak_in_flight"] == 2
+
+
+def test_failed_checks_free_their_slot():
+    hasher = PasswordHasher(max_workers=1, max_pending=0, inline=True)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            hasher.check_password(TEST_PASSWORD, b"not-a-bcrypt-hash")
+    assert hasher.stats()["failed"] == 2 and hasher.stats()["in_flight"] == 0
+
+
+def test_login_returns_503_when_hashing_is_at_capacity():
+    connector = Mock()
+    connector.verify_user_by_password.side_effect = PasswordHasherBusyError("full")
+    app = make_test_app(auth_routes.bp, register_auth=False)
+
+    with patch.object(auth_routes, "Connector", return_value=connector):
+        response = app.test_client().post("/login", json={"email": "a@sky.uk", "password": TEST_PASSWORD})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == auth_routes.BUSY_RETRY_AFTER
+    assert "busy" in response.get_json()["error"]
+
+
+def _get_stats(email):
+    app = make_test_app(auth_routes.bp, register_auth=False)
+    token = jwt.encode(
+        {"sub": email, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        app.config["SECRET_KEY"],
+        algorithm="HS256",
+    )
+    return app.test_client().get("/api/auth/stats", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_stats_are_limited_to_operators(monkeypatch):
+    monkeypatch.setenv("OPS_USER_EMAILS", "ops@sky.uk")
+
+    assert _get_stats("volunteer@sky.uk").status_code == 403
+    response = _get_stats("Ops@sky.uk")
+    assert response.status_code == 200
+    assert response.get_json()["password_hasher"]["mode"] == "inline"